@@ -1,18 +1,20 @@
 import streamlit as st
 import re
 import pandas as pd
+import numpy as np
 import math
 import sys
 import os
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Tuple, Dict
-from sqlalchemy import or_, func, inspect, event
+from sqlalchemy import or_, and_, func, event, select, delete, tuple_, case, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import calendar
 from io import BytesIO
 import html
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode, JsCode
-import threading
 import time
+from collections import deque
 import smtplib
 from email.message import EmailMessage
 import random
@@ -23,11 +25,23 @@ from mailer import send_verification_email
 import ssl
 import logging
 from database import (
-    Base,
     Notice,
+    NoticeOffice,
+    NoticeDailyStat,
+    ALL_OFFICES,
     MailRecipient,
     MailHistory,
-    get_db_session
+    get_db_session,
+    is_unknown_office,
+    bulk_update_from_values,
+    init_db,
+    pool_metrics,
+    enqueue_sync_job,
+    recent_sync_jobs,
+    read_sync_events,
+    SYNC_JOB_ACTIVE,
+    last_sync_at,
+    mark_stages_success,
 )
 from database import engine
 
@@ -35,17 +49,20 @@ from database import (
      Notice, 
      MailRecipient, 
      MailHistory, 
-     Base, 
      engine as db_module_engine, # database.py의 초기 None 엔진
      SessionLocal as db_module_session_local # database.py의 초기 None 세션
 )
 # collect_data, mailer 임포트는 유지합니다.
 from collect_data import (
-    fetch_data_for_stage, STAGES_CONFIG, is_relevant_text,
+    STAGES_CONFIG, is_relevant_text,
+    rebuild_daily_stats,
     resolve_address_from_bjd, fetch_kapt_basic_info, fetch_kapt_maintenance_history,
     _as_text, _to_int as _to_int_collect, _extract_school_name, _assign_office_by_school_name
     )
 from mailer import send_mail_sendgrid, build_subject, build_body_html, build_attachment_html
+from query_cache import QueryCache
+from worker import start_in_thread as start_sync_worker_thread
+from scheduler import start_in_thread as start_scheduler_thread
 
 
 # =========================================================
@@ -114,9 +131,17 @@ SIX_MONTHS = timedelta(days=180)
 # 0-A. 대체 유틸리티
 # =========================================================
 def _get_last_sync_datetime_from_meta():
-    return datetime.now() - timedelta(hours=2)
+    """수집 단계 중 가장 최근 성공 시각 (sync_state, KST)"""
+    try:
+        with engine.connect() as conn:
+            return last_sync_at(conn)
+    except Exception as e:
+        logger.error(f"sync_state 조회 실패: {e}")
+        return None
 def _set_last_sync_datetime_to_meta(dt: datetime):
-    pass
+    """전체 단계를 dt 시점까지 수집한 것으로 기록"""
+    with engine.begin() as conn:
+        mark_stages_success(conn, STAGES_CONFIG.keys(), dt)
 def is_weekend(d: date) -> bool:
     return d.weekday() >= 5
 def prev_business_day(d: date) -> date:
@@ -180,6 +205,48 @@ def _normalize_cert(val: str) -> str:
     if s in {"X", "N", "NO", "미인증"}: return "X"
     return val
 
+# ---- 컬럼 단위(벡터화) 변환: 목록/메일 조회에서 행 루프 없이 DataFrame 생성 ----
+def _fmt_phone_series(s: pd.Series) -> pd.Series:
+    """fmt_phone()과 같은 규칙을 컬럼 전체에 적용"""
+    raw = s.fillna("").astype(str)
+    v = raw.str.replace(r"\D", "", regex=True)
+    n = v.str.len()
+    conds = [
+        n.eq(0),
+        n.eq(8),
+        n.eq(9),
+        n.eq(10) & v.str.startswith("02"),
+        n.eq(10),
+        n.eq(11),
+    ]
+    choices = [
+        "정보 없음",
+        v.str[:4] + "-" + v.str[4:],
+        v.str[:2] + "-" + v.str[2:5] + "-" + v.str[5:],
+        v.str[:2] + "-" + v.str[2:6] + "-" + v.str[6:],
+        v.str[:3] + "-" + v.str[3:6] + "-" + v.str[6:],
+        v.str[:3] + "-" + v.str[3:7] + "-" + v.str[7:],
+    ]
+    return pd.Series(np.select(conds, choices, default=raw), index=s.index, dtype=object)
+
+def _normalize_cert_series(s: pd.Series) -> pd.Series:
+    """_normalize_cert()과 같은 규칙을 컬럼 전체에 적용"""
+    out = s.astype(object).where(s.notna(), "")
+    key = out.astype(str).str.strip().str.upper()
+    out = out.mask(key.eq(""), "")
+    out = out.mask(key.isin(CERT_TRUE_VALUES), "O")
+    out = out.mask(key.isin({"X", "N", "NO", "미인증"}), "X")
+    return out
+
+def _iso_day_series(s: pd.Series) -> pd.Series:
+    """date 컬럼 → 'YYYY-MM-DD' (없으면 빈 문자열)"""
+    return pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m-%d").fillna("")
+
+def _fetch_frame(session, stmt) -> pd.DataFrame:
+    """Core select 결과를 ORM 객체 없이 바로 DataFrame으로"""
+    result = session.execute(stmt)
+    return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
 def _fmt_int_commas(val):
     try:
         s = str(val or "").replace(",", "").strip()
@@ -494,41 +561,27 @@ def render_auth_ui():
 
 @st.cache_resource
 def start_auto_update_scheduler():
-    def scheduler_loop():
-        last_run_hour = -1
-        while True:
-            now = datetime.now()
-            
-            if now.hour in [8, 12, 19]:
-                if now.minute == 0 and now.hour != last_run_hour:
-                    try:
-                        # 💥 변경: print 대신 logger.info 사용
-                        logger.info(f"[Auto-Sync] {now} - 자동 업데이트 시작")
-                        
-                        target_date_str = now.strftime("%Y%m%d")
-                        
-                        for stage in STAGES_CONFIG.values():
-                            fetch_data_for_stage(target_date_str, stage)
-                            
-                        _set_last_sync_datetime_to_meta(now)
-                        
-                        # 캐시 클리어
-                        _get_new_item_counts_by_source_and_office.clear()
-                        load_data_from_db.clear()
-                        
-                        # 💥 변경: print 대신 logger.info 사용
-                        logger.info(f"[Auto-Sync] {now} - 자동 업데이트 완료")
-                        last_run_hour = now.hour
-                        
-                    except Exception as e:
-                        # 💥 변경: print 대신 logger.error 사용
-                        logger.error(f"[Auto-Sync] 오류 발생: {e}")
-            
-            time.sleep(30)
+    """
+    정기 자동 업데이트 (scheduler.py)
+    - advisory lock을 잡은 인스턴스만 리더로 동작 → 여러 프로세스에서 불러도 작업은 1번만 등록
+    - 놓친 실행 시각은 재시작 후 sync_state 기준으로 감지해 증분 수집 작업 1건으로 따라잡음
+    """
+    t = start_scheduler_thread()
+    logger.info(">>> 자동 업데이트 스케줄러 스레드가 시작되었습니다.")
+    return t
+
+
+# 별도 워커 프로세스 없이 배포할 때만 앱 프로세스 안에서 큐 워커 실행
+@st.cache_resource
+def _start_inprocess_sync_worker():
+    init_db()      # 워커가 큐 테이블을 바로 조회하므로 스키마 먼저 (중복 호출 안전)
+    logger.info(">>> 앱 내장 수집 워커 스레드를 시작합니다.")
+    return start_sync_worker_thread()
+
 
-    t = threading.Thread(target=scheduler_loop, daemon=True)
-    t.start()
-    logger.info(">>> 자동 업데이트 스케줄러 스레드가 시작되었습니다.") # 💥 변경
+if str(_cfg("SYNC_WORKER_IN_APP", "false")).lower() in ("1", "true", "yes"):
+    _start_inprocess_sync_worker()
+    start_auto_update_scheduler()
 
 
 
@@ -546,6 +599,8 @@ def init_session_state():
     ss.setdefault("only_cert", False)
     ss.setdefault("include_unknown", False)
     ss.setdefault("page", 1)
+    ss.setdefault("page_cursors", [None])   # 페이지별 시작 cursor (키셋 페이징)
+    ss.setdefault("next_cursor", None)
     ss.setdefault("admin_auth", False) # 관리자 인증
     ss.setdefault("logged_in_success", False) # 일반 로그인
     ss.setdefault("df_data", pd.DataFrame())
@@ -567,45 +622,69 @@ def init_session_state():
 
 
 
+# =========================================================
+# 스키마 생성/보강 (프로세스당 1회)
+# =========================================================
+@st.cache_resource
+def _init_db_once() -> bool:
+    init_db()
+    return True
+
+
+_init_db_once()
+
+
+# =========================================================
+# 공용 조회 캐시 (모든 세션/사용자 공통)
+# =========================================================
+@st.cache_resource
+def _get_query_cache() -> QueryCache:
+    # 무효화는 cache_events로 다른 프로세스(워커/인스턴스)와 공유
+    return QueryCache(
+        ttl=float(_cfg("QUERY_CACHE_TTL_SEC", 600) or 600),
+        max_entries=int(_cfg("QUERY_CACHE_MAX_ENTRIES", 512) or 512),
+        poll_interval=float(_cfg("QUERY_CACHE_POLL_SEC", 5) or 5),
+    )
+
+
+QUERY_CACHE = _get_query_cache()
+
+
 # 신규 건수 집계
-@st.cache_data(ttl=300)
 def _get_new_item_counts_by_source_and_office() -> dict:
+    today = date.today()
+    biz_today = today if not is_weekend(today) else prev_business_day(today)
+    biz_prev = prev_business_day(biz_today)
+    return QUERY_CACHE.get_or_load(
+        "new_item_counts", {"biz_today": biz_today},
+        lambda: _query_new_item_counts(biz_today, biz_prev),
+        days=(biz_prev, biz_today),
+    )
+
+
+def _query_new_item_counts(biz_today: date, biz_prev: date) -> dict:
     session = get_db_session()
     if not session: return {}
     try:
-        today = date.today()
-        biz_today = today if not is_weekend(today) else prev_business_day(today)
-        biz_prev = prev_business_day(biz_today)
 
+        # notice_daily_stats: 사업소별 행은 복수관할 공고도 사업소마다 1건, '전체' 행은 공고 기준
         results = (
             session.query(
-                Notice.assigned_office,
-                Notice.source_system,
-                func.count(Notice.id),
+                NoticeDailyStat.office,
+                NoticeDailyStat.source_system,
+                func.sum(NoticeDailyStat.count),
             )
-            .filter(Notice.notice_date.in_([biz_today.isoformat(), biz_prev.isoformat()]))
-            .group_by(Notice.assigned_office, Notice.source_system)
+            .filter(NoticeDailyStat.notice_day.in_([biz_today, biz_prev]))
+            .group_by(NoticeDailyStat.office, NoticeDailyStat.source_system)
             .all()
         )
 
         counts = {}
         for office, source, count in results:
-            office_name = office or ""
-            # 복수관할 처리 로직 유지
-            if "/" in office_name:
-                parts = [p.strip() for p in office_name.split("/") if p.strip()]
-                for part in parts:
-                    counts.setdefault(part, {"G2B": 0, "K-APT": 0})
-                    source_key = "K-APT" if source == "K-APT" else "G2B"
-                    counts[part][source_key] += count // len(parts)
-            else:
-                counts.setdefault(office_name, {"G2B": 0, "K-APT": 0})
-                source_key = "K-APT" if source == "K-APT" else "G2B"
-                counts[office_name][source_key] += count
-
-        total_g2b = sum(v.get("G2B", 0) for v in counts.values())
-        total_kapt = sum(v.get("K-APT", 0) for v in counts.values())
-        counts["전체"] = {"G2B": total_g2b, "K-APT": total_kapt}
+            counts.setdefault(office or "", {"G2B": 0, "K-APT": 0})
+            source_key = "K-APT" if source == "K-APT" else "G2B"
+            counts[office or ""][source_key] += int(count or 0)
+        counts.setdefault(ALL_OFFICES, {"G2B": 0, "K-APT": 0})
         return counts
     except Exception as e:
         print(f"신규 건수(소스별) 집계 오류: {e}")
@@ -617,32 +696,152 @@ def _get_new_item_counts_by_source_and_office() -> dict:
 # 2. 데이터 로딩 (공고 조회)
 # =========================================================
 
-@st.cache_data(ttl=600, show_spinner="데이터를 조회 중...")
+def _office_filter(query, office, start: Optional[date] = None, end: Optional[date] = None):
+    """
+    사업소 필터: notice_offices (office, notice_day) 인덱스로 공고 id를 좁힘
+    - 복수관할('A/B')도 사업소별 행으로 저장되어 있어 LIKE 불필요
+    - start/end를 주면 하위 조회도 같은 기간으로 제한
+    """
+    if not office or office == "전체":
+        return query
+    sub = select(NoticeOffice.notice_id).where(NoticeOffice.office == office)
+    if start:
+        sub = sub.where(NoticeOffice.notice_day >= start)
+    if end:
+        sub = sub.where(NoticeOffice.notice_day <= end)
+    return query.filter(Notice.id.in_(sub))
+
+def _parse_search_terms(keyword_text: str):
+    """
+    키워드 → (any_terms, all_terms, not_terms)
+    - 공백 구분 단어는 OR, '+단어'는 반드시 포함(AND), '-단어'는 제외(NOT)
+    """
+    any_terms, all_terms, not_terms = [], [], []
+    for tok in (keyword_text or "").lower().split():
+        if tok[0] in "+-":
+            if len(tok) > 1:
+                (all_terms if tok[0] == "+" else not_terms).append(tok[1:])
+        else:
+            any_terms.append(tok)
+    return any_terms, all_terms, not_terms
+
+
+def _like_pattern(term: str) -> str:
+    term = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{term}%"
+
+
+def _keyword_filter(query, keyword_text: str):
+    """
+    search_text(pg_trgm GIN 인덱스) 기반 키워드 조건
+    반환: (query, 관련도 식 또는 None) — 관련도 = 포함된 검색어 수
+    """
+    any_terms, all_terms, not_terms = _parse_search_terms(keyword_text)
+
+    def _has(term):
+        return Notice.search_text.like(_like_pattern(term), escape="\\")
+
+    conds = []
+    if any_terms:
+        conds.append(or_(*[_has(t) for t in any_terms]))
+    conds += [_has(t) for t in all_terms]
+    conds += [~_has(t) for t in not_terms]
+    if conds:
+        query = query.filter(and_(*conds))
+
+    positive = any_terms + all_terms
+    if not positive:
+        return query, None
+    rank = sum((case((_has(t), 1), else_=0) for t in positive), literal(0))
+    return query, rank
+
+
 def load_data_from_db(
-    office, source, start_date, end_date, keyword, only_cert, include_unknown, page,
+    office, source, start_date, end_date, keyword, only_cert, include_unknown, cursor=None,
 ):
-    session = get_db_session()
-    if not session: return pd.DataFrame(), 0 # 더미 반환
+    """
+    공용 캐시 경유 조회 (키: 정규화된 검색 조건 + cursor)
+    - 결과에 포함된 공고가 바뀌거나 조회 기간과 겹치는 일자가 수집되면 해당 항목만 무효화
+    """
+    params = {
+        "office": office or "전체", "source": source,
+        "start": start_date, "end": end_date,
+        "keyword": keyword or "", "only_cert": bool(only_cert),
+        "include_unknown": bool(include_unknown),
+        "cursor": tuple(cursor) if cursor else None,
+    }
+
+    def _load():
+        with st.spinner("데이터를 조회 중..."):
+            return _query_notices_page(
+                params["office"], source, start_date, end_date, params["keyword"],
+                params["only_cert"], params["include_unknown"], params["cursor"],
+            )
+
+    df, total_items, next_cursor = QUERY_CACHE.get_or_load(
+        "notices_page", params, _load,
+        days=(start_date, end_date),
+        ids_of=lambda v: v[0]["id"].tolist() if not v[0].empty else (),
+    )
+    # 공유 결과이므로 세션별 가공(순번 등)에 대비해 복사본 반환
+    return df.copy(), total_items, next_cursor
+
 
-    start_date_str = start_date.isoformat()
-    end_date_str = end_date.isoformat()
+NOTICE_LIST_COLUMNS = (
+    Notice.id, Notice.is_favorite, Notice.source_system, Notice.assigned_office, Notice.stage,
+    Notice.project_name, Notice.client, Notice.address, Notice.phone_number, Notice.model_name,
+    Notice.quantity, Notice.is_certified, Notice.notice_day, Notice.detail_link, Notice.kapt_code,
+)
+
+
+def _notice_list_frame(raw: pd.DataFrame, new_days) -> pd.DataFrame:
+    """조회 결과(컬럼 단위) → 검색 화면 DataFrame"""
+    if raw.empty:
+        return pd.DataFrame()
+    fav = raw["is_favorite"].fillna(False).astype(bool)
+    return pd.DataFrame({
+        "id": raw["id"].astype(int),
+        "⭐": np.where(fav, "★", "☆"),
+        "구분": np.where(raw["source_system"].eq("K-APT"), "K-APT", "나라장터"),
+        "사업소": raw["assigned_office"].fillna("").str.replace("/", "\n", regex=False),
+        "단계": raw["stage"].fillna(""),
+        "사업명": raw["project_name"].fillna(""),
+        "기관명": raw["client"].fillna(""),
+        "소재지": raw["address"].fillna(""),
+        "연락처": _fmt_phone_series(raw["phone_number"]),
+        "모델명": raw["model_name"].fillna(""),
+        "수량": raw["quantity"].fillna(0).astype(int).astype(str),
+        "고효율 인증 여부": _normalize_cert_series(raw["is_certified"]),
+        "공고일자": _iso_day_series(raw["notice_day"]),
+        "DETAIL_LINK": raw["detail_link"].fillna(""),
+        "KAPT_CODE": raw["kapt_code"].fillna(""),
+        "IS_FAVORITE": fav,
+        "IS_NEW": raw["notice_day"].isin(new_days),
+    })
+
+
+def _query_notices_page(
+    office, source, start_date, end_date, keyword, only_cert, include_unknown, cursor=None,
+):
+    """
+    키셋 페이징: (notice_day DESC, id DESC) 순으로 cursor 다음 ITEMS_PER_PAGE건
+    - 키워드 검색 시에는 관련도(포함된 검색어 수)가 정렬 맨 앞: (rank DESC, notice_day DESC, id DESC)
+    - cursor: 직전 페이지 마지막 행의 정렬키 튜플, None이면 첫 페이지
+    - 전체 건수는 첫 페이지에서만 같은 쿼리의 count() OVER ()로 계산 (이후 페이지는 None)
+    반환: (df, total_items 또는 None, 다음 페이지 cursor 또는 None)
+    """
+    session = get_db_session()
+    if not session: return pd.DataFrame(), 0, None # 더미 반환
 
-    query = session.query(Notice).filter(
-        Notice.notice_date.between(start_date_str, end_date_str)
+    # 화면에 쓰는 컬럼만 조회 (ORM 객체/identity map 생성 없음)
+    query = select(*NOTICE_LIST_COLUMNS).where(
+        Notice.notice_day.between(start_date, end_date)
     )
 
     if source == "나라장터": query = query.filter(Notice.source_system == "G2B")
     elif source == "K-APT": query = query.filter(Notice.source_system == "K-APT")
 
-    if office and office != "전체":
-        query = query.filter(
-            or_(
-                Notice.assigned_office == office,
-                Notice.assigned_office.like(f"{office}/%"),
-                Notice.assigned_office.like(f"%/{office}"),
-                Notice.assigned_office.like(f"%/{office}/%"),
-            )
-        )
+    query = _office_filter(query, office, start_date, end_date)
 
     if only_cert:
         query = query.filter(
@@ -654,100 +853,108 @@ def load_data_from_db(
         )
 
     if not include_unknown:
-        query = query.filter(
-            ~Notice.assigned_office.like("%/%"),
-            ~Notice.assigned_office.ilike("%불명%"),
-            ~Notice.assigned_office.ilike("%미확인%"),
-            ~Notice.assigned_office.ilike("%확인%"),
-            ~Notice.assigned_office.ilike("%미정%"),
-            ~Notice.assigned_office.ilike("%UNKNOWN%")
-        )
+        # 복수관할/관할불명 여부는 저장 시 계산된 플래그 사용
+        query = query.filter(Notice.is_unknown_office.is_(False))
 
+    rank = None
     keyword_text = (keyword or "").strip()
     if keyword_text:
-        cols = [Notice.project_name, Notice.client, Notice.model_name]
         is_dlvr_no_format = bool(re.match(r"^[A-Z0-9]{10,}$", keyword_text.replace("-", "").upper()))
         
         if is_dlvr_no_format:
             normalized = keyword_text.replace("-", "").upper()
             query = query.filter(Notice.detail_link.like(f"%dlvrreq:{normalized}%"))
         else:
-            terms = [t.strip() for t in keyword_text.split() if t.strip() and not t.startswith("-")]
-            if terms:
-                query = query.filter(or_(*[or_(*[c.ilike(f"%{term}%") for c in cols]) for term in terms]))
+            query, rank = _keyword_filter(query, keyword_text)
+
+    sort_keys = [Notice.notice_day, Notice.id] if rank is None else [rank, Notice.notice_day, Notice.id]
+    if cursor:
+        # OFFSET 대신 직전 위치부터 인덱스 탐색 → 깊은 페이지도 첫 페이지와 같은 비용
+        query = query.filter(tuple_(*sort_keys) < tuple_(*cursor))
+
+    # 관련도 값(cursor용)과 첫 페이지 전체 건수를 같은 쿼리에서 함께 조회
+    query = query.add_columns(
+        (rank if rank is not None else literal(0)).label("rank"),
+        (literal(None) if cursor else func.count().over()).label("total_items"),
+    )
+
+    # 1건 더 읽어서 다음 페이지 존재 여부 판단
+    try:
+        raw = _fetch_frame(session, query.order_by(*[k.desc() for k in sort_keys]).limit(ITEMS_PER_PAGE + 1))
+    finally:
+        session.close()
+    total_items = None if cursor else (int(raw["total_items"].iloc[0]) if len(raw) else 0)
+
+    next_cursor = None
+    if len(raw) > ITEMS_PER_PAGE:
+        raw = raw.iloc[:ITEMS_PER_PAGE]
+        last = raw.iloc[-1]
+        next_cursor = (last["notice_day"], int(last["id"]))
+        if rank is not None:
+            next_cursor = (int(last["rank"]),) + next_cursor
 
-    total_items = query.count()
-    offset = (page - 1) * ITEMS_PER_PAGE
-    rows = query.order_by(Notice.notice_date.desc(), Notice.id.desc()).offset(offset).limit(ITEMS_PER_PAGE).all()
-    
-    # 데이터 프레임 변환 로직 유지
-    data = []
     today = date.today()
     biz_today = today if not is_weekend(today) else prev_business_day(today)
     biz_prev = prev_business_day(biz_today)
-    new_days = {biz_today.isoformat(), biz_prev.isoformat()}
-
-    for n in rows:
-        is_new = n.notice_date in new_days
-        phone_disp = fmt_phone(n.phone_number or "")
-        cert_val = _normalize_cert(n.is_certified)
-
-        data.append({
-            "id": n.id,
-            "⭐": "★" if n.is_favorite else "☆",
-            "구분": "K-APT" if n.source_system == "K-APT" else "나라장터",
-            "사업소": (n.assigned_office or "").replace("/", "\n"),
-            "단계": n.stage or "",
-            "사업명": n.project_name or "",
-            "기관명": n.client or "",
-            "소재지": n.address or "",
-            "연락처": phone_disp,
-            "모델명": n.model_name or "",
-            "수량": str(n.quantity or 0),
-            "고효율 인증 여부": cert_val,
-            "공고일자": _as_date(n.notice_date).isoformat() if n.notice_date else "",
-            "DETAIL_LINK": n.detail_link or "",
-            "KAPT_CODE": n.kapt_code or "",
-            "IS_FAVORITE": bool(n.is_favorite),
-            "IS_NEW": is_new,
-        })
 
-    df = pd.DataFrame(data)
-    session.close()
-    return df, total_items
-def search_data():
+    return _notice_list_frame(raw, {biz_today, biz_prev}), total_items, next_cursor
 
-    # 안전한 엔진 체크
-    if 'engine' in globals() and engine is not None:
-        try:
-            insp = inspect(engine)
-            if not insp.has_table("notices"):
-                Base.metadata.create_all(engine)
-        except Exception:
-            pass
+
+def _load_current_page():
+    """session_state의 검색 조건 + 현재 페이지 cursor로 조회"""
+    ss = st.session_state
+    cursors = ss.setdefault("page_cursors", [None])
+    df, total_items, next_cursor = load_data_from_db(
+        ss["office"], ss["source"],
+        ss["start_date"], ss["end_date"],
+        ss["keyword"], ss["only_cert"],
+        ss["include_unknown"], cursors[ss["page"] - 1],
+    )
+    ss.df_data = df
+    ss.next_cursor = next_cursor
+    if total_items is not None:
+        ss.total_items = total_items
+    ss.total_pages = max(1, math.ceil(ss.total_items / ITEMS_PER_PAGE))
+
+
+def go_next_page():
+    ss = st.session_state
+    if not ss.get("next_cursor"):
+        return
+    # 현재 페이지까지의 cursor만 유지하고 다음 페이지 시작점 추가
+    ss.page_cursors = ss.page_cursors[:ss["page"]] + [ss.next_cursor]
+    ss["page"] += 1
+    try:
+        _load_current_page()
+    except Exception as e:
+        st.error(f"데이터 조회 중 오류가 발생했습니다: {e}")
+
+
+def go_prev_page():
+    ss = st.session_state
+    if ss["page"] <= 1:
+        return
+    ss["page"] -= 1
+    try:
+        _load_current_page()
+    except Exception as e:
+        st.error(f"데이터 조회 중 오류가 발생했습니다: {e}")
+
+
+def search_data():
 
     st.session_state["page"] = 1
+    st.session_state["page_cursors"] = [None]
 
     try:
-        df, total_items = load_data_from_db(
-            st.session_state["office"], st.session_state["source"],
-            st.session_state["start_date"], st.session_state["end_date"],
-            st.session_state["keyword"], st.session_state["only_cert"],
-            st.session_state["include_unknown"], st.session_state["page"],
-        )
-        st.session_state.df_data = df
-        st.session_state.total_items = total_items
+        _load_current_page()
     except Exception as e:
         st.error(f"데이터 조회 중 오류가 발생했습니다: {e}")
         st.session_state.df_data = pd.DataFrame()
         st.session_state.total_items = 0
+        st.session_state.total_pages = 1
+        st.session_state.next_cursor = None
 
-    total_pages = (
-        max(1, math.ceil(st.session_state.total_items / ITEMS_PER_PAGE))
-        if st.session_state.total_items > 0
-        else 1
-    )
-    st.session_state.total_pages = total_pages
     st.session_state["data_initialized"] = True
 
 # =========================================================
@@ -773,9 +980,8 @@ def toggle_favorite(notice_id: int):
             session.commit()
             st.toast("즐겨찾기 상태가 변경되었습니다.")
 
-            # 즐겨찾기 변경 후 데이터 다시 로드
-            load_data_from_db.clear()
-            _get_new_item_counts_by_source_and_office.clear()
+            # 즐겨찾기 변경 후 이 공고가 포함된 조회 결과만 무효화
+            QUERY_CACHE.invalidate_notices([notice_id])
 
             # 현재 페이지의 데이터를 다시 조회
             search_data_no_rerun() 
@@ -789,25 +995,9 @@ def toggle_favorite(notice_id: int):
 
 def search_data_no_rerun():
 
-    # 안전한 엔진 체크
-    if 'engine' in globals() and engine is not None:
-        try:
-            insp = inspect(engine)
-            if not insp.has_table("notices"):
-                Base.metadata.create_all(engine)
-        except Exception:
-            pass
-
     try:
-        df, total_items = load_data_from_db(
-            st.session_state["office"], st.session_state["source"],
-            st.session_state["start_date"], st.session_state["end_date"],
-            st.session_state["keyword"], st.session_state["only_cert"],
-            st.session_state["include_unknown"], st.session_state["page"],
-        )
-        st.session_state.df_data = df
-        st.session_state.total_items = total_items
-        st.session_state.total_pages = max(1, math.ceil(total_items / ITEMS_PER_PAGE))
+        # 현재 페이지 cursor 그대로 재조회 (페이지 위치 유지)
+        _load_current_page()
     except Exception as e:
         print(f"데이터 조회 중 오류 (no rerun): {e}")
 
@@ -841,8 +1031,7 @@ def _ensure_phone_inline(notice_id: int):
         session.add(n)
         session.commit()
 
-        load_data_from_db.clear()
-        _get_new_item_counts_by_source_and_office.clear()
+        QUERY_CACHE.invalidate_notices([notice_id])
     except Exception as e:
         session.rollback()
         print(f"전화번호 보정 실패: {e}")
@@ -1113,66 +1302,31 @@ def _get_recipients_from_db(offices: list[str]) -> list[dict]:
 def _filter_unknown(items: list[dict], include_unknown: bool):
     if include_unknown:
         return items
-
-    filtered_items = []
-    UNKNOWN_STR = {
-        "관할불명",
-        "미확인",
-        "미정",
-        "불명",
-        "unknown",
-        "UNKNOWN",
-        "확인필요",
-        "확인 필요",
-        "관할지사확인요망",
-    }
-
-    for item in items:
-        office_val = item.get("assigned_office", "").strip()
-        if "/" in office_val:
-            continue
-        if any(u.lower() in office_val.lower() for u in UNKNOWN_STR):
-            continue
-        filtered_items.append(item)
-    return filtered_items
+    # 저장 시 is_unknown_office 계산과 같은 기준
+    return [it for it in items if not is_unknown_office(it.get("assigned_office"))]
 
 
 def _query_items_for_period(session, start: date, end: date, office: str):
-    q = session.query(Notice).filter(
-        Notice.notice_date >= start.isoformat(),
-        Notice.notice_date <= end.isoformat(),
-    )
-    if office and office != "전체":
-        q = q.filter(
-            or_(
-                Notice.assigned_office == office,
-                Notice.assigned_office.like(f"{office}/%"),
-                Notice.assigned_office.like(f"%/{office}"),
-                Notice.assigned_office.like(f"%/{office}/%"),
-            )
-        )
-
-    q = q.order_by(Notice.notice_date.desc())
-    rows = q.all()
-    items = []
-    for r in rows:
-        items.append(
-            {
-                "source_system": r.source_system or "",
-                "assigned_office": r.assigned_office or "",
-                "stage": r.stage or "",
-                "project_name": r.project_name or "",
-                "client": r.client or "",
-                "address": (r.address or ""),
-                "phone_number": r.phone_number or "",
-                "model_name": r.model_name or "",
-                "quantity": r.quantity or 0,
-                "is_certified": r.is_certified or "",
-                "notice_date": r.notice_date or "",
-                "detail_link": r.detail_link or "",
-            }
-        )
-    return items
+    """메일 본문/첨부용 항목 (필요한 컬럼만 조회, 빈 값 처리는 SQL에서)"""
+    q = select(
+        func.coalesce(Notice.source_system, "").label("source_system"),
+        func.coalesce(Notice.assigned_office, "").label("assigned_office"),
+        func.coalesce(Notice.stage, "").label("stage"),
+        func.coalesce(Notice.project_name, "").label("project_name"),
+        func.coalesce(Notice.client, "").label("client"),
+        func.coalesce(Notice.address, "").label("address"),
+        func.coalesce(Notice.phone_number, "").label("phone_number"),
+        func.coalesce(Notice.model_name, "").label("model_name"),
+        func.coalesce(Notice.quantity, 0).label("quantity"),
+        func.coalesce(Notice.is_certified, "").label("is_certified"),
+        func.coalesce(func.to_char(Notice.notice_day, "YYYY-MM-DD"), Notice.notice_date, "").label("notice_date"),
+        Notice.notice_day,
+        func.coalesce(Notice.detail_link, "").label("detail_link"),
+    ).where(Notice.notice_day.between(start, end))
+    q = _office_filter(q, office, start, end)
+
+    q = q.order_by(Notice.notice_day.desc())
+    return [dict(r) for r in session.execute(q).mappings()]
 
 
 def _save_history(
@@ -1553,7 +1707,7 @@ def main_page():
 
             st.text_input(
                 "키워드 검색",
-                placeholder="예: led, 변압기...",
+                placeholder="예: led 변압기 (+단어: 반드시 포함, -단어: 제외)",
                 key="keyword",
                 value=default_kw
             )
@@ -1585,7 +1739,7 @@ def main_page():
         return
 
     df = df.reset_index(drop=True)
-    df["순번"] = df.index + 1
+    df["순번"] = df.index + 1 + (st.session_state["page"] - 1) * ITEMS_PER_PAGE
 
     # --------------------------------
     # 카드형 / 목록형 UI 선택
@@ -1611,7 +1765,23 @@ def main_page():
     if selected_rec:
         popup_detail_panel(selected_rec)
 
-    # 페이징 생략
+    # --------------------------------
+    # 페이지 이동 (키셋 페이징: 이전/다음)
+    # --------------------------------
+    page = st.session_state["page"]
+    col_prev, col_page, col_next = st.columns([1, 4, 1])
+    with col_prev:
+        st.button("◀ 이전", key="page_prev", on_click=go_prev_page,
+                  disabled=page <= 1, use_container_width=True)
+    with col_page:
+        st.markdown(
+            f"<div style='text-align:center; margin-top:6px'>{page} / {st.session_state.total_pages} 페이지 "
+            f"(총 {st.session_state.total_items:,}건)</div>",
+            unsafe_allow_html=True
+        )
+    with col_next:
+        st.button("다음 ▶", key="page_next", on_click=go_next_page,
+                  disabled=not st.session_state.get("next_cursor"), use_container_width=True)
 
 
 # =========================================================
@@ -1632,40 +1802,33 @@ def favorites_page():
         st.error("데이터베이스 연결 오류.")
         return
 
-    query = session.query(Notice).filter(Notice.is_favorite == True)
+    query = select(
+        Notice.id, Notice.assigned_office, Notice.project_name, Notice.client, Notice.notice_day,
+        Notice.status, Notice.memo, Notice.detail_link, Notice.kapt_code, Notice.source_system,
+    ).where(Notice.is_favorite == True)
 
-    if selected_office != "전체":
-        query = query.filter(
-            or_(
-                Notice.assigned_office == selected_office,
-                Notice.assigned_office.like(f"{selected_office}/%"),
-                Notice.assigned_office.like(f"%/{selected_office}"),
-                Notice.assigned_office.like(f"%/{selected_office}/%"),
-            )
-        )
+    query = _office_filter(query, selected_office)
 
-    favs = query.order_by(Notice.notice_date.desc()).all()
-    session.close()
+    try:
+        favs = _fetch_frame(session, query.order_by(Notice.notice_day.desc().nullslast()))
+    finally:
+        session.close()
 
-    if not favs:
+    if favs.empty:
         st.warning(f"'{selected_office}' 사업소에 관심 고객으로 등록된 공고가 없습니다.")
         return
 
-    data = []
     STATUSES = ["", "미접촉", "전화", "메일안내", "접수", "지급", "보류", "취소"]
 
-    for n in favs:
-        data.append({
-            "id": n.id, "⭐": True,
-            "사업소": (n.assigned_office or "").replace("/", "\n"),
-            "사업명": n.project_name or "", "기관명": n.client or "",
-            "공고일자": _as_date(n.notice_date).isoformat() if n.notice_date else "",
-            "상태": n.status or "", "메모": n.memo or "",
-            "DETAIL_LINK": n.detail_link or "", "KAPT_CODE": n.kapt_code or "",
-            "SOURCE": n.source_system,
-        })
-
-    df_favs = pd.DataFrame(data)
+    df_favs = pd.DataFrame({
+        "id": favs["id"].astype(int), "⭐": True,
+        "사업소": favs["assigned_office"].fillna("").str.replace("/", "\n", regex=False),
+        "사업명": favs["project_name"].fillna(""), "기관명": favs["client"].fillna(""),
+        "공고일자": _iso_day_series(favs["notice_day"]),
+        "상태": favs["status"].fillna(""), "메모": favs["memo"].fillna(""),
+        "DETAIL_LINK": favs["detail_link"].fillna(""), "KAPT_CODE": favs["kapt_code"].fillna(""),
+        "SOURCE": favs["source_system"],
+    })
 
     edited_df = st.data_editor(
         df_favs.drop(columns=["DETAIL_LINK", "KAPT_CODE", "SOURCE"]),
@@ -1687,29 +1850,34 @@ def favorites_page():
             if not session:
                 st.error("DB 연결 오류")
                 return
-            updates = 0
-            favorites_set = 0
-            unfavorites = 0
+            # 처음 불러온 값과 편집 결과를 컬럼 단위로 비교 → 바뀐 행만 일괄 UPDATE
+            orig = df_favs.set_index("id")
+            edit = edited_df.set_index("id").reindex(orig.index)
+            new_fav = edit["⭐"].fillna(False).astype(bool)
+            new_status = edit["상태"].fillna("").astype(str)
+            new_memo = edit["메모"].fillna("").astype(str)
+
+            sm_mask = new_status.ne(orig["상태"]) | new_memo.ne(orig["메모"])
+            fav_mask = new_fav.ne(orig["⭐"].astype(bool))
+
+            updates = int(sm_mask.sum())
+            favorites_set = int((fav_mask & new_fav).sum())
+            unfavorites = int((fav_mask & ~new_fav).sum())
+            changed_ids = [int(i) for i in orig.index[sm_mask | fav_mask]]
             try:
-                for _, row in edited_df.iterrows():
-                    n = session.query(Notice).filter(Notice.id == row["id"]).one()
-                    
-                    is_status_memo_changed = (n.status != row["상태"] or n.memo != row["메모"])
-                    is_favorite_changed = (n.is_favorite != row["⭐"])
-                    
-                    if is_status_memo_changed:
-                        n.status = row["상태"]
-                        n.memo = row["메모"]
-                        updates += 1
-                    
-                    if is_favorite_changed:
-                        n.is_favorite = row["⭐"]
-                        if row["⭐"]: favorites_set += 1
-                        else: unfavorites += 1
-
-                    if is_status_memo_changed or is_favorite_changed:
-                        session.add(n)
-
+                sm_rows = [
+                    {"id": int(i), "status": st_, "memo": m}
+                    for i, st_, m in zip(orig.index[sm_mask], new_status[sm_mask].tolist(), new_memo[sm_mask].tolist())
+                ]
+                fav_rows = [
+                    {"id": int(i), "is_favorite": f}
+                    for i, f in zip(orig.index[fav_mask], new_fav[fav_mask].tolist())
+                ]
+                bulk_update_from_values(session, Notice.__tablename__, "id", ["status", "memo"], sm_rows)
+                bulk_update_from_values(
+                    session, Notice.__tablename__, "id", ["is_favorite"], fav_rows,
+                    casts={"is_favorite": "BOOLEAN"},
+                )
                 session.commit()
                 
                 msg = []
@@ -1720,7 +1888,7 @@ def favorites_page():
                 if msg: st.success(" ".join(msg))
                 else: st.info("변경된 내용이 없습니다.")
                     
-                load_data_from_db.clear()
+                QUERY_CACHE.invalidate_notices(changed_ids)
                 st.rerun()
 
             except Exception as e:
@@ -2061,84 +2229,102 @@ def load_rows_by_office_from_db():
 # 수신자 관리 저장 헬퍼
 # =========================================================
 
+RECIPIENT_DOMAIN = "kepco.co.kr"
+_EMAIL_LOCAL_RE = r"[A-Za-z0-9._%+\-]+"
+
+
+def _editor_text_col(s: pd.Series) -> pd.Series:
+    """편집기 컬럼 → 문자열 (None/NaN → "", 리스트 값은 첫 항목)"""
+    s = s.map(lambda v: (v[0] if v else None) if isinstance(v, list) else v)
+    return s.where(s.notna(), "").astype(str)
+
+
+def _validate_recipient_frame(df_editor: pd.DataFrame):
+    """
+    편집기 전체를 컬럼 단위로 한 번에 검사
+    반환: (저장할 행 DataFrame[office, email, name, is_active], 오류 메시지 목록)
+    """
+    office = _editor_text_col(df_editor["사업소명"])
+    name = _editor_text_col(df_editor["담당자명"])
+    local = _editor_text_col(df_editor["이메일 ID"])
+    is_active = df_editor["발송대상"].astype(str).str.lower().isin(["1", "true", "yes"])
+    email = (local + "@" + RECIPIENT_DOMAIN).str.lower()
+
+    # 뒤에 적용한 조건이 우선 (사업소명 → 빈 ID → 공백 → 형식 순)
+    err = pd.Series(None, index=df_editor.index, dtype=object)
+    err = err.mask(~local.str.fullmatch(_EMAIL_LOCAL_RE), "이메일 ID 형식이 올바르지 않습니다.")
+    err = err.mask(local.str.contains(" ", regex=False), "이메일 ID에 공백이 들어있습니다.")
+    err = err.mask(local.eq(""), "이메일 ID가 비어 있습니다.")
+    err = err.mask(office.eq(""), "사업소명이 비어 있습니다.")
+
+    # 같은 사업소에 같은 주소가 두 번 있으면 첫 행만 저장 (uq_mail_recipient)
+    dup = err.isna() & pd.DataFrame({"o": office, "e": email}).where(err.isna()).duplicated(keep="first")
+    err = err.mask(dup, "같은 사업소에 중복된 이메일입니다.")
+
+    ok = err.isna()
+    valid = pd.DataFrame({
+        "office": office[ok], "email": email[ok], "name": name[ok], "is_active": is_active[ok],
+    })
+    pos = pd.Series(range(1, len(df_editor) + 1), index=df_editor.index)
+    errors = [f"{p}번째 행 오류: {m}" for p, m in zip(pos[~ok].tolist(), err[~ok].tolist())]
+    return valid, errors
+
+
 def save_rows_by_office_to_db(df_editor):
+    """
+    편집기 내용 → mail_recipients 차이만 반영 (한 트랜잭션)
+    - (office, email) 기준 upsert: 새 행은 추가, 이름/발송대상이 바뀐 행만 갱신
+    - 편집기에서 지운 행은 삭제
+    - 전체 삭제 후 재입력하지 않으므로 저장 중에도 메일 발송이 빈 수신자 목록을 보지 않음
+    """
+    valid, failed_rows = _validate_recipient_frame(df_editor)
 
-    def _normalize(val, default=""):
-        if val is None:
-            return default
-        if isinstance(val, list):
-            if not val:
-                return default
-            val = val[0]
-        if pd.isna(val):
-            return default
-        return str(val)
+    if valid.empty:
+        st.error("❌ 저장된 수신자가 없습니다. 아래 오류를 확인하세요.")
+        for err in failed_rows:
+            st.warning(err)
+        return
 
     session = get_db_session()
     if not session:
         st.error("DB 오류: 세션 생성 실패")
         return
 
-    failed_rows = []
-    saved_count = 0
+    records = [
+        {"office": o, "email": e, "name": n, "is_active": bool(a)}
+        for o, e, n, a in zip(
+            valid["office"].tolist(), valid["email"].tolist(),
+            valid["name"].tolist(), valid["is_active"].tolist(),
+        )
+    ]
 
     try:
-        # 기존 데이터 삭제
-        session.query(MailRecipient).delete()
-        session.flush()
-
-        for idx, row in df_editor.iterrows():
-
-            office = _normalize(row["사업소명"])
-            name = _normalize(row["담당자명"])
-            local = _normalize(row["이메일 ID"])
-            domain = "@kepco.co.kr"
-
-            # -----------------------------
-            # ⚠ 유효성 검사
-            # -----------------------------
-            error_msg = None
-
-            if office == "":
-                error_msg = "사업소명이 비어 있습니다."
-            elif local == "":
-                error_msg = "이메일 ID가 비어 있습니다."
-            elif " " in local:
-                error_msg = "이메일 ID에 공백이 들어있습니다."
-
-            if error_msg:
-                failed_rows.append(f"{idx+1}번째 행 오류: {error_msg}")
-                continue
-
-            email = f"{local}@kepco.co.kr"
-
-            use_val = row["발송대상"]
-            is_active = (
-                use_val if isinstance(use_val, bool)
-                else str(use_val).lower() in ["1", "true", "yes"]
-            )
-
-            # DB 저장
-            session.add(
-                MailRecipient(
-                    office=office,
-                    email=email.lower(),
-                    name=name,
-                    is_active=is_active,
-                )
+        stmt = pg_insert(MailRecipient).values(records)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_mail_recipient",
+            set_={"name": stmt.excluded.name, "is_active": stmt.excluded.is_active},
+            where=or_(
+                MailRecipient.name.is_distinct_from(stmt.excluded.name),
+                MailRecipient.is_active.is_distinct_from(stmt.excluded.is_active),
+            ),
+        ).returning(literal_column("xmax = 0").label("inserted"))
+        upserted = [bool(r.inserted) for r in session.execute(stmt)]
+        inserted = sum(upserted)
+        updated = len(upserted) - inserted
+
+        keep = [(r["office"], r["email"]) for r in records]
+        deleted = session.execute(
+            delete(MailRecipient).where(
+                tuple_(MailRecipient.office, MailRecipient.email).not_in(keep)
             )
-            saved_count += 1
-
-        # 저장 개수 확인
-        if saved_count == 0:
-            session.rollback()
-            st.error("❌ 저장된 수신자가 없습니다. 아래 오류를 확인하세요.")
-            return
+        ).rowcount or 0
 
         session.commit()
 
         # 성공 메시지
-        st.success(f"✅ 총 {saved_count}명 저장 완료!")
+        st.success(
+            f"✅ 총 {len(records)}명 저장 완료! (추가 {inserted} · 변경 {updated} · 삭제 {deleted})"
+        )
 
         # 실패한 행도 알려주기
         if failed_rows:
@@ -2245,6 +2431,137 @@ def mail_manage_page():
 
 
 
+SYNC_PROGRESS_POLL_SEC = float(_cfg("SYNC_PROGRESS_POLL_SEC", 3) or 3)
+SYNC_JOB_LABELS = {"queued": "⏳ 대기 중", "running": "🔄 실행 중", "done": "🎉 완료", "failed": "⚠️ 실패"}
+
+
+SYNC_EVENT_TAIL = 200      # 화면에 남길 최근 수집 로그 줄 수
+
+
+def _tail_sync_events(job_id: int) -> deque:
+    """
+    작업의 수집 로그(sync_events) 중 마지막으로 본 id 이후만 읽어 세션의 최근 줄 목록에 이어 붙임
+    → 갱신마다 전체 로그를 다시 읽거나 그리지 않음 (최근 SYNC_EVENT_TAIL줄만 표시)
+    """
+    tail = st.session_state.get("sync_event_tail")
+    if not tail or tail["job"] != job_id:
+        tail = st.session_state["sync_event_tail"] = {
+            "job": job_id, "after": 0, "lines": deque(maxlen=SYNC_EVENT_TAIL),
+        }
+    try:
+        with engine.connect() as conn:
+            while True:
+                rows = read_sync_events(conn, job_id, tail["after"])
+                for ev in rows:
+                    ts = (ev["created_at"] + timedelta(hours=9)).strftime("%H:%M:%S")   # UTC → KST
+                    tail["lines"].append(f"{ts} {(ev['message'] or ev['kind']).strip()}")
+                    tail["after"] = ev["id"]
+                if len(rows) < 500:
+                    break
+    except Exception as e:
+        logger.error(f"sync_events 조회 실패: {e}")
+    return tail["lines"]
+
+
+def _sync_live_frame(live: dict) -> pd.DataFrame:
+    """progress['live'] (단계별 누적 건수/속도) → 표"""
+    return pd.DataFrame([
+        {
+            "단계": STAGES_CONFIG.get(key, {}).get("name", key),
+            "상태": "🔄 실행 중" if v["running"] else "✔",
+            "페이지": v["pages"],
+            "조회 건수": v["items"],
+            "선별": v["kept"],
+            "저장": v["saved"],
+            "오류": v["errors"],
+            "조회 속도(건/초)": v["items_per_sec"],
+            "저장 속도(건/초)": v.get("saved_per_sec", 0),
+            "경과(초)": v["elapsed"],
+        }
+        for key, v in live.items()
+    ])
+
+
+def _load_sync_jobs(limit: int = 5) -> list:
+    try:
+        with engine.connect() as conn:
+            return recent_sync_jobs(conn, limit)
+    except Exception as e:
+        logger.error(f"sync_jobs 조회 실패: {e}")
+        return []
+
+
+def _sync_jobs_panel(jobs: Optional[list] = None):
+    """최근 수집 작업 진행 상황 (작업이 진행 중이면 fragment로 주기적 재조회)"""
+    jobs = jobs if jobs is not None else _load_sync_jobs()
+    if not jobs:
+        st.caption("등록된 업데이트 작업이 없습니다.")
+        return
+
+    job = next((j for j in jobs if j["status"] in SYNC_JOB_ACTIVE), jobs[0])
+    params = job["params"] or {}
+    progress = job["progress"] or {}
+    total, done = job["total_steps"] or 0, job["done_steps"] or 0
+    finished = job["status"] not in SYNC_JOB_ACTIVE
+
+    st.markdown(
+        f"**작업 #{job['id']}** ({params.get('start', '')} ~ {params.get('end', '')}) · "
+        f"{SYNC_JOB_LABELS.get(job['status'], job['status'])}"
+    )
+    pct = int(done / total * 100) if total else (100 if finished else 0)
+    st.progress(pct / 100)
+    st.markdown(f"**진행률:** {pct}% ({done}/{total})")
+    if job["status"] == "queued":
+        st.caption("워커 프로세스가 작업을 가져가면 시작됩니다.")
+    if progress.get("by_day"):
+        st.bar_chart(pd.Series(progress["by_day"], name="수집 건수").sort_index())
+    if progress.get("live"):
+        st.dataframe(_sync_live_frame(progress["live"]), hide_index=True, use_container_width=True)
+    lines = _tail_sync_events(job["id"])
+    if lines:
+        st.code("\n".join(lines), language=None)
+    elif progress.get("logs"):
+        # 이벤트 기록 이전에 실행된 작업
+        st.info("\n".join(progress["logs"]))
+    if progress.get("stage_report"):
+        with st.expander("단계별 소요 시간", expanded=False):
+            st.dataframe(
+                pd.DataFrame(progress["stage_report"]).rename(columns={
+                    "name": "단계", "chunks": "구간", "failed": "오류", "saved": "저장",
+                    "start_sec": "시작(초)", "wall_sec": "소요(초)", "busy_sec": "실행 합(초)",
+                    "api_calls": "API 호출", "api_sec": "API 대기(초)",
+                })[["단계", "구간", "오류", "저장", "시작(초)", "소요(초)", "실행 합(초)", "API 호출", "API 대기(초)"]],
+                hide_index=True, use_container_width=True,
+            )
+    if job["error"]:
+        (st.error if job["status"] == "failed" else st.warning)(job["error"])
+
+    # 이 화면에서 지켜보던 작업이 끝나면 조회 캐시 반영 후 전체 화면 갱신 (주기 조회 종료)
+    if finished and st.session_state.get("sync_job_id") == job["id"]:
+        st.session_state["sync_job_id"] = None
+        QUERY_CACHE.poll(force=True)
+        if job["status"] == "done":
+            st.success("데이터 수집이 완료되었습니다. 상단 '공고 조회 및 검색'에서 다시 조회해 주세요.")
+        st.rerun()
+
+    with st.expander("최근 작업", expanded=False):
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "작업": j["id"],
+                    "상태": SYNC_JOB_LABELS.get(j["status"], j["status"]),
+                    "기간": f"{(j['params'] or {}).get('start', '')}~{(j['params'] or {}).get('end', '')}",
+                    "진행": f"{j['done_steps']}/{j['total_steps']}",
+                    "등록": j["created_at"],
+                    "종료": j["finished_at"],
+                    "오류": j["error"] or "",
+                }
+                for j in jobs
+            ]),
+            hide_index=True, use_container_width=True,
+        )
+
+
 def data_sync_page():
     st.title("🔄 데이터 업데이트")
     if not st.session_state.admin_auth:
@@ -2254,7 +2571,7 @@ def data_sync_page():
     # ... (기존 데이터 업데이트 로직 유지)
     last_dt = _get_last_sync_datetime_from_meta()
     last_txt = last_dt.strftime("%Y-%m-%d %H:%M") if last_dt else "기록 없음"
-    st.info(f"마지막 API 호출 일시: **{last_txt}**")
+    st.info(f"마지막 수집 성공 일시: **{last_txt}** (KST)")
     st.markdown("---")
 
     st.subheader("기간 설정")
@@ -2289,6 +2606,26 @@ def data_sync_page():
         end_date = st.date_input("종료일", max_value=DEFAULT_END_DATE, key="sync_end")
 
     st.caption("권장: 하루 단위로 업데이트하거나, 최근 1주/1개월 단위로 진행해 주세요. (API 한도 유의)")
+
+    # 일별 집계(신규 배지/현황 달력)는 수집 시 자동 갱신 — 불일치가 의심될 때만 전체 재생성
+    if st.button("일별 집계 재생성", key="rebuild_stats_btn"):
+        with st.spinner("notice_daily_stats 재생성 중..."):
+            rebuild_daily_stats()
+        QUERY_CACHE.invalidate_all()
+        st.success("일별 집계를 다시 만들었습니다.")
+
+    with st.expander("DB 연결 풀 현황", expanded=False):
+        # ui: 화면 조회용 풀 / collector: 수집기·스케줄러용 풀 (DB_<ROLE>_POOL_SIZE 등으로 조정)
+        st.dataframe(pd.DataFrame(pool_metrics()).T, use_container_width=True)
+        st.caption(f"조회 캐시: {QUERY_CACHE.stats()}")
+
+    # 1주 초과 기간은 COPY 기반 대량 적재 모드 선택 가능 (저장 속도 향상)
+    bulk_load = False
+    if (end_date - start_date).days >= 7:
+        bulk_load = st.checkbox(
+            "대량 적재 모드 (장기간 백필용, COPY 사용)", value=True, key="sync_bulk_load",
+            help="수집 결과를 임시 테이블에 COPY로 적재한 뒤 한 번에 반영합니다. 즐겨찾기/상태/메모는 유지됩니다."
+        )
     st.markdown("---")
 
     if st.button("선택 기간 업데이트 시작", type="primary", key="start_sync_btn"):
@@ -2298,68 +2635,24 @@ def data_sync_page():
         if (end_date - start_date).days >= 92:
             st.error("조회 기간은 최대 92일(3개월)까지만 가능합니다.")
             st.stop()
-        
-        st.session_state["is_updating"] = True
-
-
-
-        st.subheader("📊 데이터 수집 진행률")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        # 💡 로그 메시지를 Streamlit UI에 표시할 컨테이너 (st.info 사용)
-        log_placeholder = st.container()
-
-
-
-        dates = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
-        stages_to_run = list(STAGES_CONFIG.values())
-        total_steps = len(dates) * len(stages_to_run)
-        current_step = 0
-
-        # 로그 메시지 저장용 리스트
-        sync_logs = []
-
-        try:
-            for d in dates:
-                disp_date = d.strftime("%Y-%m-%d")
-                for stage in stages_to_run:
-                    name = stage.get("name", "Unknown Stage")
-                    status_text.markdown(f"**현재:** `{disp_date} / {name}`")
-
-                    try:
-                        fetch_data_for_stage(d.strftime("%Y%m%d"), stage)
-                        sync_logs.append(f"✔ [{disp_date}] {name} 완료")
-                    except Exception as e:
-                        error_msg = f"❌ [{disp_date}] {name} 오류 : {e}"
-                        sync_logs.append(error_msg)
-                        logger.error(error_msg) # 💡 콘솔 로그에 오류 기록
-
-                    current_step += 1
-                    pct = int(current_step / total_steps * 100)
-                    progress_bar.progress(pct / 100)
-                    status_text.markdown(f"**진행률:** {pct}% ({current_step}/{total_steps})")
-
-                    # 로그 업데이트: 매 단계마다 컨테이너를 비우고 다시 씁니다.
-                    with log_placeholder:
-                        st.info("\n".join(sync_logs))
-
-            status_text.success("🎉 전체 작업 완료!") #
-
-            progress_bar.progress(1.0)
-        
-            _set_last_sync_datetime_to_meta(datetime.now())
-            load_data_from_db.clear()
-            _get_new_item_counts_by_source_and_office.clear()
-            st.success("데이터 수집이 완료되었습니다. 상단 '공고 조회 및 검색'에서 다시 조회해 주세요.")
-            st.session_state["is_updating"] = False
-            st.rerun()
 
-        except Exception as global_e:
-            status_text.error(f"⚠️ 동기화 작업 중 치명적인 오류 발생: {global_e}")
-            logger.error(f"Global Sync Error: {global_e}", exc_info=True) # 추가 로깅
-        finally:
-            st.session_state["is_updating"] = False
+        # 수집은 워커 프로세스가 실행 → 이 화면은 등록 후 진행 상황만 조회 (새로고침해도 계속 진행)
+        params = {
+            "start": start_date.strftime("%Y%m%d"),
+            "end": end_date.strftime("%Y%m%d"),
+            "bulk_load": bool(bulk_load),
+        }
+        with engine.begin() as conn:
+            job_id = enqueue_sync_job(conn, "range", params, requested_by=st.session_state.get("target_email"))
+        st.session_state["sync_job_id"] = job_id
+        st.toast(f"업데이트 작업 #{job_id} 등록 완료 — 워커가 순서대로 실행합니다.")
+
+    st.subheader("📊 데이터 수집 진행률")
+    jobs = _load_sync_jobs()
+    if any(j["status"] in SYNC_JOB_ACTIVE for j in jobs):
+        st.fragment(_sync_jobs_panel, run_every=SYNC_PROGRESS_POLL_SEC)()
+    else:
+        _sync_jobs_panel(jobs)
 
 
 def data_status_page():
@@ -2369,28 +2662,24 @@ def data_status_page():
     with col_office:
         selected_office = st.selectbox("사업소 필터", OFFICES, key="status_office_select")
 
-    @st.cache_data(ttl=300)
     def get_all_db_notice_dates(target_office):
+        # 공용 캐시: 어느 일자든 수집되면 무효화 (days=None)
+        return QUERY_CACHE.get_or_load(
+            "notice_dates", {"office": target_office or ALL_OFFICES},
+            lambda: _query_notice_dates(target_office),
+        )
+
+    def _query_notice_dates(target_office):
         session = get_db_session()
         if not session: return set()
         try:
-            query = session.query(Notice.notice_date)
-            
-            if target_office and target_office != "전체":
-                query = query.filter(
-                    or_(
-                        Notice.assigned_office == target_office,
-                        Notice.assigned_office.like(f"{target_office}/%"),
-                        Notice.assigned_office.like(f"%/{target_office}"),
-                        Notice.assigned_office.like(f"%/{target_office}/%"),
-                    )
-                )
+            # 일별 집계 테이블에서 일자 목록 산출 (사업소 미지정 시 '전체' 행)
+            query = session.query(NoticeDailyStat.notice_day).filter(
+                NoticeDailyStat.office == (target_office or ALL_OFFICES),
+                NoticeDailyStat.notice_day <= date.today(),
+            )
                 
-            dates_raw = query.distinct().all()
-            dates = [_as_date(d[0]) for d in dates_raw]
-            
-            today = date.today()
-            return {d for d in dates if d and d <= today}
+            return {d for (d,) in query.distinct().all() if d}
         except Exception:
             return set()
         finally:
@@ -2458,17 +2747,9 @@ def data_status_page():
                 return
             date_str = sel_date.isoformat()
             
-            query = session.query(Notice).filter(Notice.notice_date == date_str)
+            query = session.query(Notice).filter(Notice.notice_day == sel_date)
             
-            if selected_office != "전체":
-                query = query.filter(
-                    or_(
-                        Notice.assigned_office == selected_office,
-                        Notice.assigned_office.like(f"{selected_office}/%"),
-                        Notice.assigned_office.like(f"%/{selected_office}"),
-                        Notice.assigned_office.like(f"%/{selected_office}/%"),
-                    )
-                )
+            query = _office_filter(query, selected_office, sel_date, sel_date)
             
             rows = query.order_by(Notice.id.desc()).all()
             session.close()
@@ -2570,8 +2851,6 @@ def eers_app():
         # 💡 [수정] 로그인 성공 시 auth_stage 초기화
         st.session_state["auth_stage"] = "complete"
 
-    #start_auto_update_scheduler()
-
     # [사이드바 구성]
     with st.sidebar:
         st.header("EERS 업무 지원 시스템")
@@ -2686,6 +2965,4 @@ def eers_app():
             pass
 
 if __name__ == "__main__":
-    if engine and not inspect(engine).has_table("notices"):
-        Base.metadata.create_all(engine)
     eers_app()
@@ -9,13 +9,24 @@ import re
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from sqlalchemy.dialects.postgresql import insert as pg_insert # <--- 함수 맨 위(import 영역)에 추가
-from database import Base, Notice, engine  # noqa
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import IntegrityError
+from database import (  # noqa
+    Base, Notice, collector_engine as engine, CollectorSession, init_db, _api_cache_get, _api_cache_set,
+    _kea_cache_get_many, _kea_cache_set_many, _instt_addr_get_many, _instt_addr_set_many,
+    bulk_update_from_values, _checkpoint_get, _checkpoint_set, _checkpoint_clear,
+    is_unknown_office, sync_notice_offices, refresh_daily_stats, refresh_days, parse_notice_day, build_search_text, SEARCH_TEXT_COLS,
+    publish_cache_event,
+)
+from sqlalchemy.orm import scoped_session
+from sqlalchemy import text as sa_text
 import re, time
 from typing import Optional, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
 
 try:
     from bjd_mapper import get_bjd_name
@@ -25,6 +36,8 @@ except ImportError:
     HAS_BJD_MAPPER = False
 import re
 from difflib import SequenceMatcher
+from keyword_matcher import AhoCorasick, ContainmentIndex
+import pandas as pd
 
 # -------------------------------------------------------
 # CONFIG LOADER (로컬 config.py + Streamlit secrets 자동 지원)
@@ -243,50 +256,181 @@ def process_kapt_item(it: dict, page_stage: str = "입찰공고") -> dict | None
 
 
 def fetch_pages_parallel(url, params_list):
+    # 공용 풀 + 호스트 제한기(_limited_get)로 병렬 조회, 실패(None) 페이지는 제외
+    futures = [_IO_POOL.submit(_in_stage_ctx(http_get_json), url, p) for p in params_list]
     results = []
-    with ThreadPoolExecutor(max_workers=5) as executor:  # 동시 5스레드
-        futures = [executor.submit(http_get_json, url, p) for p in params_list]
-        for f in as_completed(futures):
-            results.append(f.result())
+    for f in as_completed(futures):
+        data = f.result()
+        if data is not None:
+            results.append(data)
+            emit_event("page", _page_item_count(data))
     return results
 
 
+def _page_item_count(data) -> int:
+    """목록 API 응답 1페이지의 항목 수 (진행 이벤트용)"""
+    try:
+        return len(_as_items_list(_as_dict(_as_dict(data).get("response")).get("body")))
+    except Exception:
+        return 0
+
+
+
+# 공고 저장은 모든 수집기가 이 경로(다중 VALUES upsert + 청크당 1회 커밋)를 사용합니다.
+UPSERT_CHUNK_SIZE = int(_cfg("UPSERT_CHUNK_SIZE", 500) or 500)
+NOTICE_CONFLICT_COLS = ["source_system", "detail_link", "model_name", "assigned_office"]
+
 
-def bulk_upsert_notices(notices):
+def _with_derived_cols(rows) -> List[dict]:
+    """저장 직전에 파생 컬럼 계산: 관할불명 여부, 공고일자 DATE(notice_day), 검색 문자열(search_text)"""
+    return [
+        dict(r,
+             is_unknown_office=is_unknown_office(r.get("assigned_office")),
+             notice_day=parse_notice_day(r.get("notice_date")),
+             search_text=build_search_text(*(r.get(c) for c in SEARCH_TEXT_COLS)))
+        for r in rows
+    ]
+
+
+def _notice_upsert_stmt(rows: List[dict]):
+    """다중 VALUES upsert 1문장 (RETURNING id → notice_offices 동기화용)"""
+    stmt = pg_insert(Notice).values(_with_derived_cols(rows))
+    # 사용자가 직접 관리하는 is_favorite, status, memo는 업데이트에서 제외
+    update_cols = {
+        col.name: col
+        for col in stmt.excluded
+        if col.name not in ['id', 'is_favorite', 'status', 'memo']
+    }
+    return stmt.on_conflict_do_update(
+        # Notice 모델의 __table_args__에 정의된 UniqueConstraint(uq_notice_unique)와 일치해야 함
+        index_elements=NOTICE_CONFLICT_COLS,
+        set_=update_cols
+    ).returning(Notice.id)
+
+
+def bulk_upsert_notices(notices, chunk_size: Optional[int] = None) -> int:
+    """
+    공고 일괄 upsert. 반환: 저장(삽입/갱신)된 건수
+    - 충돌키 기준 중복 제거 (같은 문장에서 같은 행을 두 번 갱신하면 Postgres 오류)
+    - chunk_size(기본 UPSERT_CHUNK_SIZE)건씩 다중 VALUES 1문장 + 커밋 1회
+    - 청크 단위로 실패를 격리 (실패 청크만 롤백)
+    - 같은 트랜잭션에서 notice_offices도 함께 갱신
+    """
     if not notices:
-        return
-    
-    session.begin()
+        return 0
+
+    dedup = {}
+    for n in notices:
+        dedup[tuple(n.get(c) for c in NOTICE_CONFLICT_COLS)] = n
+    rows = list(dedup.values())
+
+    if BULK_LOAD_MODE.get():
+        return copy_upsert_notices(rows)
+
+    size = max(int(chunk_size or UPSERT_CHUNK_SIZE), 1)
+    saved = 0
+    for i in range(0, len(rows), size):
+        chunk = rows[i:i + size]
+        try:
+            ids = session.execute(_notice_upsert_stmt(chunk)).scalars().all()
+            sync_notice_offices(session, ids, defer_days=_STAT_DAYS.get())
+            session.commit()
+            saved += len(chunk)
+        except Exception as e:
+            session.rollback()
+            emit_event("error", message=f"  [Error] Bulk upsert 실패 ({len(chunk)}건): {e}")
+    return saved
+
+
+# =========================
+# 대량 적재(COPY) 모드 — 장기간 백필용
+# =========================
+# run_range(..., bulk_load=True) 실행 중에는 bulk_upsert_notices가 COPY 경로를 사용합니다.
+# (asyncio 태스크/to_thread로 컨텍스트가 전달되므로 해당 실행에만 적용)
+BULK_LOAD_MODE = contextvars.ContextVar("BULK_LOAD_MODE", default=False)
+
+# 실행기(_run_tasks_async) 안에서는 저장된 공고의 일자만 모으고, 실행이 끝날 때 notice_daily_stats를 한 번 재계산
+# (구간/청크마다 재계산하면 동시에 도는 단계들이 같은 일자 집계 행 잠금을 기다리거나 교착)
+_STAT_DAYS = contextvars.ContextVar("_STAT_DAYS", default=None)
+
+_NOTICE_COPY_COLS = [c.name for c in Notice.__table__.columns if c.name != "id"]
+_NOTICE_KEEP_COLS = ("is_favorite", "status", "memo")   # 사용자 관리 컬럼은 갱신 제외
+
+
+def _plain_upsert_notices(notices) -> int:
+    """COPY 경로를 끄고 일반 다중 VALUES upsert로 저장"""
+    token = BULK_LOAD_MODE.set(False)
     try:
-        from sqlalchemy.dialects.postgresql import insert # collect_data.py 상단에 추가
-
-        stmt = insert(Notice).values(notices)
-        # 사용자가 직접 관리하는 is_favorite, status, memo는 업데이트에서 제외
-        update_cols = {
-            col.name: col
-            for col in stmt.excluded
-            if col.name not in ['id', 'is_favorite', 'status', 'memo']
-        }
+        return bulk_upsert_notices(notices)
+    finally:
+        BULK_LOAD_MODE.reset(token)
+
+
+def _copy_csv_field(v) -> str:
+    """
+    COPY (FORMAT csv) 필드: None → 따옴표 없는 빈 칸(NULL), 그 외는 항상 따옴표
+    → 빈 문자열("")은 빈 문자열로, NULL은 NULL로 적재 (csv 모듈은 None도 ""로 써서 구분 불가)
+    """
+    if v is None:
+        return ""
+    return '"' + str(v).replace('"', '""') + '"'
 
-        stmt = stmt.on_conflict_do_update(
-            # Notice 모델의 __table_args__에 정의된 UniqueConstraint 이름과 일치해야 함
-            index_elements=["source_system", "detail_link", "model_name", "assigned_office"],
-            set_=update_cols
-        )
 
-        session.execute(stmt)
-        session.commit()
+def copy_upsert_notices(notices) -> int:
+    """
+    COPY FROM STDIN → 임시 스테이징 테이블 → INSERT ... SELECT ... ON CONFLICT 1문장.
+    - psycopg2 드라이버가 아니면 일반 다중 VALUES 경로로 대체
+    - COPY 실패 시에도 같은 묶음을 일반 경로로 다시 저장 (백필에서 누락 방지)
+    - is_favorite/status/memo는 기존 값 유지
+    - 반환: 반영(삽입/갱신) 건수, 처리 속도(건/초)는 throughput 이벤트로 보고
+    """
+    if not notices:
+        return 0
+    if engine.dialect.driver != "psycopg2":
+        _debug(f"· [COPY] 드라이버({engine.dialect.driver}) 미지원 → 일반 upsert")
+        return _plain_upsert_notices(notices)
+
+    import io
+
+    t0 = time.perf_counter()
+    buf = io.StringIO()
+    for n in _with_derived_cols(notices):
+        buf.write(",".join(_copy_csv_field(n.get(c)) for c in _NOTICE_COPY_COLS))
+        buf.write("\n")
+    buf.seek(0)
+
+    cols = ", ".join(_NOTICE_COPY_COLS)
+    key = ", ".join(NOTICE_CONFLICT_COLS)
+    set_sql = ", ".join(f"{c} = EXCLUDED.{c}" for c in _NOTICE_COPY_COLS if c not in _NOTICE_KEEP_COLS)
+
+    try:
+        # COPY는 DBAPI 커서로, 이후 문장은 같은 연결/트랜잭션에서 실행
+        with engine.begin() as conn:
+            cur = conn.connection.cursor()
+            cur.execute("CREATE TEMP TABLE _notice_stage (LIKE notices INCLUDING DEFAULTS) ON COMMIT DROP")
+            cur.copy_expert(f"COPY _notice_stage ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+            ids = conn.execute(sa_text(f"""
+                INSERT INTO notices ({cols})
+                SELECT DISTINCT ON ({key}) {cols} FROM _notice_stage
+                ORDER BY {key}
+                ON CONFLICT ON CONSTRAINT uq_notice_unique DO UPDATE SET {set_sql}
+                RETURNING id
+            """)).scalars().all()
+            sync_notice_offices(conn, ids, defer_days=_STAT_DAYS.get())
+        affected = len(ids)
     except Exception as e:
-        session.rollback()
-        print(f"  [Error] Bulk upsert 실패: {e}")
+        emit_event("error", message=f"  [Error] COPY 적재 실패 ({len(notices)}건) → 일반 upsert로 재시도: {e}")
+        return _plain_upsert_notices(notices)
 
+    elapsed = time.perf_counter() - t0
+    # 저장 건수는 호출측 saved 이벤트로 집계되므로 여기서는 처리 속도만 (sync_events/화면 로그로 전달)
+    emit_event("throughput", affected,
+               f"  [COPY 적재] {affected}건 / {elapsed:.2f}초 ({affected / elapsed if elapsed else 0:.0f}건/초)")
+    return affected
 
 
 
 
-@lru_cache(maxsize=5000)
-def get_usr_info_cached(dminstt_code):
-    return get_full_address_from_usr_info(dminstt_code)
 
 import random
 def safe_get(url, params):
@@ -318,13 +462,13 @@ def log_kapt_excluded(name: str, addr: str = ""):
     print(f"[❌ 제외 (타 지역)] {_as_text(name)}{_fmt_tail(addr)}")
 
 def log_kapt_pending(office: str, name: str, addr: str = ""):
-    print(f"[🧺 저장 대기] {office} / {name}" + (f" - {addr}" if addr else ""))
+    _debug(f"[🧺 저장 대기] {office} / {name}" + (f" - {addr}" if addr else ""))
 
 def log_kapt_saved(office: str, name: str, addr: str = ""):
-    print(f"[✅ 저장 완료] {_as_text(office)} / {_as_text(name)}{_fmt_tail(addr)}")
+    _debug(f"[✅ 저장 완료] {_as_text(office)} / {_as_text(name)}{_fmt_tail(addr)}")
 
 def log_kapt_bulk_saved(n: int):
-    print(f"[✅ 일괄 저장] {int(n)}건")
+    emit_event("saved", n, f"[✅ 일괄 저장] {int(n)}건")
 
 
 # =========================
@@ -443,6 +587,127 @@ SESSION.mount("http://", _adapter)
 SESSION.mount("https://", _adapter)
 DEFAULT_TIMEOUT = (5, 20)  # (connect, read)
 
+
+# =========================
+# 공용 HTTP 속도/동시성 제한 (모든 수집 단계가 공유)
+# =========================
+# 단계들을 동시에 돌려도 apis.data.go.kr 쿼터를 넘지 않도록
+# 호스트별 동시 요청 상한(세마포어) + 토큰버킷(초당 요청 수)을 한 곳에서 관리합니다.
+API_MAX_CONCURRENCY = int(_cfg("API_MAX_CONCURRENCY", 8) or 8)      # 호스트당 동시 요청 수
+API_RATE_PER_SEC    = float(_cfg("API_RATE_PER_SEC", 10) or 10)     # 호스트당 초당 요청 수
+API_RATE_BURST      = int(_cfg("API_RATE_BURST", 20) or 20)         # 순간 허용 요청 수
+STAGE_MAX_PARALLEL  = int(_cfg("STAGE_MAX_PARALLEL", 4) or 4)       # 동시에 실행할 수집 단계 수
+
+
+class _TokenBucket:
+    """스레드 안전 토큰버킷: rate(초당 보충) / burst(최대 적립)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(float(rate), 0.1)
+        self.capacity = max(int(burst), 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _HostLimiter:
+    """호스트 1개에 대한 동시 요청 상한 + 토큰버킷"""
+
+    def __init__(self, max_concurrency: int, rate: float, burst: int):
+        self.slots = threading.BoundedSemaphore(max(int(max_concurrency), 1))
+        self.bucket = _TokenBucket(rate, burst)
+
+    @contextmanager
+    def slot(self):
+        with self.slots:
+            self.bucket.acquire()
+            yield
+
+
+_HOST_LIMITERS: Dict[str, _HostLimiter] = {}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+
+def _limiter_for(url: str) -> _HostLimiter:
+    host = urlsplit(url).netloc or API_HOST
+    with _HOST_LIMITERS_LOCK:
+        lim = _HOST_LIMITERS.get(host)
+        if lim is None:
+            lim = _HOST_LIMITERS[host] = _HostLimiter(API_MAX_CONCURRENCY, API_RATE_PER_SEC, API_RATE_BURST)
+        return lim
+
+
+class _StageMeter:
+    """수집 구간 1개의 API 호출 수/누적 응답 시간 (페이지·상세 스레드에서 함께 갱신)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.api_sec = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, sec: float):
+        with self.lock:
+            self.calls += 1
+            self.api_sec += sec
+
+
+# 단계 실행 중에만 설정됨 (STAGE_PLAN의 api_budget 세마포어 / 호출 계측)
+_STAGE_BUDGET = contextvars.ContextVar("_STAGE_BUDGET", default=None)
+_STAGE_METER = contextvars.ContextVar("_STAGE_METER", default=None)
+
+
+# 수집 이벤트 채널: 실행기가 구간마다 sink(stage, kind, count, message)를 설정 → 워커가 모아 DB/화면으로
+#  - kind: stage_start / page(페이지 항목 수) / filtered(선별 수) / saved(저장 수) / error
+#          / stage_done(구간 완료, 저장 수) / stage_error(구간 실패) / throughput(COPY 적재 속도)
+#  - sink가 없으면(CLI 단독 실행) message만 출력, 오류는 sink가 있어도 출력 (서버 로그용)
+_EVENT_SINK = contextvars.ContextVar("_EVENT_SINK", default=None)
+_EVENT_STAGE = contextvars.ContextVar("_EVENT_STAGE", default=None)
+
+
+def emit_event(kind: str, count: int = 0, message: Optional[str] = None):
+    sink = _EVENT_SINK.get()
+    if message and (sink is None or kind in ("error", "stage_error")):
+        print(message)
+    if sink is not None:
+        try:
+            sink(_EVENT_STAGE.get(), kind, int(count or 0), message)
+        except Exception as e:
+            _debug(f"[이벤트] 전달 실패: {e}")
+
+
+def _in_stage_ctx(fn):
+    """다른 스레드풀로 넘기는 함수에 현재 단계의 예산/계측을 함께 전달 (contextvars는 스레드풀로 전파되지 않음)"""
+    ctx = contextvars.copy_context()
+    return lambda *a, **kw: ctx.copy().run(fn, *a, **kw)
+
+
+def _limited_get(url: str, params: dict | None = None, timeout=DEFAULT_TIMEOUT):
+    """공용 SESSION GET (단계별 API 예산 → 호스트별 속도/동시성 제한 순으로 적용)"""
+    budget, meter = _STAGE_BUDGET.get(), _STAGE_METER.get()
+    with (budget or nullcontext()), _limiter_for(url).slot():
+        t0 = time.perf_counter()
+        try:
+            return SESSION.get(url, params=params, timeout=timeout)
+        finally:
+            if meter is not None:
+                meter.add(time.perf_counter() - t0)
+
+
+# 페이지/상세 병렬 조회용 공용 스레드풀 (단계별 임시 풀 대신 하나만 사용)
+_IO_POOL = ThreadPoolExecutor(max_workers=API_MAX_CONCURRENCY * 2, thread_name_prefix="eers-io")
+
 # =========================
 # 유틸
 # =========================
@@ -469,12 +734,9 @@ def _print_total_summary(total: int, *, tag: str | None = None):
 def _print_data_none():
     print("  - 데이터 없음")
 
-def _print_bulk_saved(n: int, prefix: str = ""):
-    # prefix가 비어있지 않으면 "  [✅ prefix 일괄 저장] N건"
-    if prefix:
-        print(f"  [✅ {prefix} 일괄 저장] {int(n)}건")
-    else:
-        print(f"  [✅ 일괄 저장] {int(n)}건")
+def _log_bulk_saved(n: int, prefix: str = ""):
+    # prefix가 비어있지 않으면 "  [✅ prefix 일괄 저장] N건" (워커 실행 중에는 saved 이벤트로만 전달)
+    emit_event("saved", n, f"  [✅ {prefix} 일괄 저장] {int(n)}건" if prefix else f"  [✅ 일괄 저장] {int(n)}건")
 
 def _debug(msg: str):
     if VERBOSE:
@@ -521,31 +783,62 @@ def _assign_office_by_school_name(client_name: str, project_name: str) -> str |
     s_norm = _norm(school)
 
     # 1순위: 별도 학교 사전 (client_hints_schools.py)
-    try:
-        from client_hints_schools import CLIENT_HINTS_SCHOOLS as _S
-        # 키/값 모두 정규화, 값은 "A/B"면 첫 지사만
-        S = {_norm(k): _norm(v.split("/")[0]) for k, v in _S.items()}
-        for k in sorted(S.keys(), key=len, reverse=True):
-            # 양방향 부분일치 허용 (교육청+학교 형태 등 긴/짧은 양쪽 커버)
-            if s_norm == k or s_norm in k or k in s_norm:
-                return S[k]
-    except Exception:
-        pass
+    hit = _school_hint_index().lookup(s_norm)
+    if hit:
+        return hit
 
     # 2순위: 통합 힌트 사전(CLASSIC) - '학교' 키만 대상
+    return _client_school_hint_index().lookup(s_norm)
+
+
+class _BidirectionalHintIndex:
+    """
+    힌트 사전 1회 컴파일본 — 양방향 부분일치(키 ⊂ 질의 또는 질의 ⊂ 키) 중 우선순위 1위 값.
+    우선순위: 원본 키가 긴 순 → 같은 길이면 사전 순서 앞쪽 (기존 sorted(..., key=len, reverse=True)와 동일)
+    """
+
+    def __init__(self, keys: List[str], values: List[str], ranks: List[tuple]):
+        self.values = values
+        self.ranks = ranks
+        self.ac = AhoCorasick(keys)            # 키 ⊂ 질의
+        self.contains = ContainmentIndex(keys)  # 질의 ⊂ 키
+
+    def lookup(self, q: str) -> Optional[str]:
+        if not q:
+            return None
+        hits = self.ac.search(q) | self.contains.containing(q)
+        if not hits:
+            return None
+        return self.values[min(hits, key=self.ranks.__getitem__)]
+
+
+@lru_cache(maxsize=1)
+def _school_hint_index() -> _BidirectionalHintIndex:
     try:
-        C = CLIENT_HINTS  # collect_data.py 등에서 선언/병합되어 있다고 가정
-        for k in sorted(C.keys(), key=len, reverse=True):
-            if "학교" not in k:
-                continue
-            k_norm = _norm(k)
-            if s_norm == k_norm or s_norm in k_norm or k_norm in s_norm:
-                # 값도 "A/B"면 첫 지사만
-                return _norm((C[k] or "").split("/")[0])
+        from client_hints_schools import CLIENT_HINTS_SCHOOLS as _S
     except Exception:
-        pass
-
-    return None
+        _S = {}
+    # 키/값 모두 정규화, 값은 "A/B"면 첫 지사만
+    S = {_norm(k): _norm(v.split("/")[0]) for k, v in _S.items()}
+    keys = list(S)
+    return _BidirectionalHintIndex(keys, [S[k] for k in keys], [(-len(k), i) for i, k in enumerate(keys)])
+
+
+_CLIENT_SCHOOL_INDEX: tuple | None = None   # (CLIENT_HINTS 크기, 인덱스)
+
+def _client_school_hint_index() -> _BidirectionalHintIndex:
+    """CLIENT_HINTS 중 '학교' 키만 (사전이 바뀌면 다시 컴파일)"""
+    global _CLIENT_SCHOOL_INDEX
+    if _CLIENT_SCHOOL_INDEX is None or _CLIENT_SCHOOL_INDEX[0] != len(CLIENT_HINTS):
+        items = [(k, v) for k, v in CLIENT_HINTS.items() if "학교" in k]
+        idx = _BidirectionalHintIndex(
+            [_norm(k) for k, _ in items],
+            # 값도 "A/B"면 첫 지사만
+            [_norm((v or "").split("/")[0]) for _, v in items],
+            [(-len(k), i) for i, (k, _) in enumerate(items)],
+        )
+        _CLIENT_SCHOOL_INDEX = (len(CLIENT_HINTS), idx)
+    return _CLIENT_SCHOOL_INDEX[1]
 
 def _as_text(x) -> str:
     """리스트/숫자/None 등도 안전하게 문자열로 변환."""
@@ -709,56 +1002,13 @@ def cleanup_session():
     global session
     if session:
         try:
-            session.close()
+            session.remove()
             print("[DB] Worker session closed.")
         except Exception as e:
             print(f"[DB] Worker session close error: {e}")
 
 
 
-def _handle_broad_keyword_case(client_name: Optional[str], addr: Optional[str], base_notice: dict) -> bool:
-    name = client_name or ""
-    if not name:
-        return False
-
-    # ✅ 부산/해운대구 등 타권역이 명시돼 있으면 즉시 제외
-    other_hits = any(kw in name for kw in ["부산", "해운대구", "해운대"])  # 필요한 경우 더 추가
-    target_hits = any(kw in name for kw in ["대구", "경상북도", "경북", "포항", "경주", "경산", "김천", "영천", "칠곡", "성주", "청도", "고령", "영덕"])
-    if other_hits and not target_hits:
-        return False
-
-    offices_to_assign = None
-    # 🔁 이전: if "대구" in name: ...
-    # ✅ 변경: '대구', '대구시', '대구광역시'를 '단어'로만 인식
-    if _contains_token(name, ["대구", "대구시", "대구광역시"]):
-        offices_to_assign = DAEGU_OFFICES
-    # 🔁 이전: elif "포항" in name:
-    elif _contains_token(name, ["포항", "포항시"]):
-        offices_to_assign = ["포항지사", "북포항지사"]
-
-    if offices_to_assign:
-        offices_str = "/".join(offices_to_assign)
-        n = dict(base_notice)
-        n["assigned_office"] = offices_str
-        n["address"] = addr or ""
-        upsert_notice(n)
-        session.commit()
-        print(f"  [⚠️ 저장 (복수 관할)] {offices_str} / {n.get('client')}")
-        return True
-
-    # 나머지 광역 키워드는 행정구역 단어 경계로 판단
-    for keyword, office in BROAD_KEYWORD_OFFICE_MAP.items():
-        if _contains_token(name, [keyword]):
-            n = dict(base_notice)
-            n["assigned_office"] = office
-            n["address"] = addr or ""
-            upsert_notice(n)
-            session.commit()
-            print(f"  [✅ 저장 완료] {n.get('assigned_office')} / {n.get('client')}")
-            return True
-
-    return False
-
 # === K-APT 키워드 필터: config → ENV → 기본값 ===
 import os, json, re
 
@@ -925,7 +1175,7 @@ def http_get_json(url: str, params: dict, *, retries: int = 3, timeout: int = 12
     last_err = None
     for attempt in range(1, retries + 1):
         try:
-            r = SESSION.get(url, params=params, timeout=timeout)
+            r = _limited_get(url, params=params, timeout=timeout)
 
             # 재시도 대상 상태코드
             if r.status_code in (429, 500, 502, 503, 504):
@@ -970,6 +1220,7 @@ def http_get_json(url: str, params: dict, *, retries: int = 3, timeout: int = 12
                 time.sleep(backoff ** attempt)
                 continue
             # 마지막 시도 실패
+            emit_event("error", message=f"  [API] 요청 실패 ({urlsplit(url).path}): {type(e).__name__}: {e}")
             return None
     # 논리적으로 여기 오지 않지만, 안전망
     return None
@@ -1034,7 +1285,7 @@ def kea_has_model(model: str) -> bool | None:
     }
 
     try:
-        response = SESSION.get(KEA_API_URL, params=params, timeout=12)
+        response = _limited_get(KEA_API_URL, params=params, timeout=12)
         response.raise_for_status()
         data = response.json()
         total_count = data.get('totalCount')
@@ -1084,7 +1335,7 @@ def kea_cert_with_similarity(model: str) -> str:
             "apiType": "json",
             "q2": model_q
         }
-        r = SESSION.get(KEA_API_URL, params=params, timeout=10)
+        r = _limited_get(KEA_API_URL, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
 
@@ -1118,34 +1369,79 @@ def kea_cert_with_similarity(model: str) -> str:
 
 
 # =========================
-# DB
+# KEA 인증 일괄 판정 (DB 캐시 + 병렬 조회)
 # =========================
-Session = sessionmaker(bind=engine)
-session = Session()
-
-def _upsert_with_target(n: dict, conflict_cols: List[str]):
-    """지정한 conflict 타겟으로 upsert 시도"""
-    stmt = sqlite_insert(Notice).values(**n)
-    update_columns = {c.name: c for c in stmt.excluded
-                      if c.name not in ("id", "detail_link", "model_name")}
-    stmt = stmt.on_conflict_do_update(
-        index_elements=conflict_cols,
-        set_=update_columns
-    )
-    session.execute(stmt)
+# 한 번의 수집에서 나온 모델명을 모아 캐시를 한 번에 읽고, 캐시에 없는 모델만 KEA에 조회합니다.
+KEA_CACHE_TTL_DAYS  = float(_cfg("KEA_CACHE_TTL_DAYS", 30) or 0)    # 캐시 유효기간(일), 0=만료 없음
+KEA_MAX_CONCURRENCY = int(_cfg("KEA_MAX_CONCURRENCY", 6) or 6)      # 미스 모델 동시 조회 수
+
+# KEA 조회 스킵 대상(무의미 모델명)
+KEA_SKIP_MODELS = {
+    "모델명 없음", "세부내역 미확인", "N/A",
+    "계획 단계 확인", "공고 확인 필요", "입찰 확인 필요", "계약 확인 필요",
+}
+
 
-# [수정] DB 저장 로직: source_system을 포함하도록 upsert_notice 수정
-def upsert_notice(n: dict):
+def _kea_resolve_one(model: str) -> str:
+    """단일 모델 판정: 유사도 판정 → 불확실하면 존재 여부로 재확인 ("O"/"X"/"확인필요")"""
+    status = kea_cert_with_similarity(model)
+    if status == "확인필요":
+        tmp = kea_check_certification(model)
+        if tmp != "확인필요":
+            status = tmp
+    return status
+
+
+def resolve_certifications(models, *, use_cache: bool = True) -> Dict[str, str]:
     """
-    - source_system을 포함한 복합키로 upsert 시도
+    모델명 목록 → {모델명: "O"/"X"/"확인필요"}
+    1) 중복 제거 후 kea_model_cache 일괄 조회 (TTL 지난 항목은 미스 처리, use_cache=False면 생략)
+    2) 미스만 KEA_MAX_CONCURRENCY 개씩 병렬 조회 (호스트 제한기 공유)
+    3) 판정된(O/X) 결과만 일괄 저장
     """
-    try:
-        # `database.py`에서 UniqueConstraint가 변경되었으므로, 그에 맞는 컬럼 사용
-        _upsert_with_target(n, ["source_system", "detail_link", "model_name", "assigned_office"])
-    except IntegrityError:
-        session.rollback()
-        # IntegrityError가 발생하면 로그를 남기거나 다른 처리를 할 수 있습니다.
-        print(f"  [Warn] Upsert failed, possibly due to constraint violation: {n.get('detail_link')}")
+    models = list(models or [])
+    distinct = sorted({
+        _normalize_model(m) for m in models
+        if _normalize_model(m) and _normalize_model(m) not in KEA_SKIP_MODELS
+    })
+    resolved: Dict[str, str] = {}
+
+    if distinct:
+        cached = {}
+        if use_cache:
+            try:
+                with Session() as s:
+                    cached = _kea_cache_get_many(s, distinct, KEA_CACHE_TTL_DAYS or None)
+                    s.commit()
+            except Exception as e:
+                print(f"  [KEA] 캐시 조회 실패: {e}")
+        resolved.update({m: ("O" if f else "X") for m, f in cached.items()})
+
+        misses = [m for m in distinct if m not in resolved]
+        if misses:
+            with ThreadPoolExecutor(max_workers=max(KEA_MAX_CONCURRENCY, 1), thread_name_prefix="eers-kea") as ex:
+                resolved.update(zip(misses, ex.map(_in_stage_ctx(_kea_resolve_one), misses)))
+
+            decided = {m: int(resolved[m] == "O") for m in misses if resolved[m] in ("O", "X")}
+            try:
+                with Session() as s:
+                    _kea_cache_set_many(s, decided)
+                    s.commit()
+            except Exception as e:
+                print(f"  [KEA] 캐시 저장 실패: {e}")
+
+        _debug(f"· [KEA] 모델 {len(distinct)}종 / 캐시 {len(cached)} / 조회 {len(misses)}")
+
+    return {m: resolved.get(_normalize_model(m), "확인필요") for m in models}
+
+
+# =========================
+# DB
+# =========================
+# 수집기는 UI와 분리된 collector 풀 사용
+Session = CollectorSession
+# 여러 수집 단계가 스레드로 동시에 실행되므로 스레드별 세션을 쓰도록 scoped_session 사용
+session = scoped_session(Session)
 
 
 # =========================
@@ -1247,6 +1543,24 @@ OTHER_REGION_KEYWORDS = [
 ]
 
 
+# 관심도/권역 키워드 전체를 오토마타 1개로 컴파일 (키워드 → 분류)
+_KEYWORD_GROUPS = {
+    "deny": HARD_DENY_KEYWORDS,
+    "other": OTHER_REGION_KEYWORDS,
+    "target": TARGET_REGION_KEYWORDS,
+    "device": DEVICE_KEYWORDS,
+    "energy": ENERGY_PROGRAM_KEYWORDS,
+    "improve": IMPROVEMENT_KEYWORDS,
+}
+_KEYWORD_GROUP_OF = [g for g, kws in _KEYWORD_GROUPS.items() for _ in kws]
+_KEYWORD_AC = AhoCorasick(kw.lower() for kws in _KEYWORD_GROUPS.values() for kw in kws)
+
+
+def _keyword_groups(s: str) -> set:
+    """정규화(소문자) 텍스트에 걸리는 키워드 분류 집합 (텍스트 1회 순회)"""
+    return {_KEYWORD_GROUP_OF[i] for i in _KEYWORD_AC.search(s)}
+
+
 def is_relevant_text(*texts: str) -> bool:
     """
     강화된 관심 공고 필터:
@@ -1256,29 +1570,120 @@ def is_relevant_text(*texts: str) -> bool:
          - 장비 키워드 1개만 있어도 통과 (2점)
          - 개선(1)+에너지(1) 조합도 통과 (2점)
     """
-    s = _norm_text(*texts)
+    groups = _keyword_groups(_norm_text(*texts))
 
     # 1) 최우선 제외
-    if any(k in s for k in (kw.lower() for kw in HARD_DENY_KEYWORDS)):
+    if "deny" in groups:
         return False
 
     # 2) 지역 오탐 컷 (다른 권역 + 우리 권역 부재)
-    has_other = any(k in s for k in (kw.lower() for kw in OTHER_REGION_KEYWORDS))
-    has_target = any(k in s for k in (kw.lower() for kw in TARGET_REGION_KEYWORDS))
-    if has_other and not has_target:
+    if "other" in groups and "target" not in groups:
         return False
 
     # 3) 가중치 스코어
     score = 0
-    if any(k in s for k in (kw.lower() for kw in DEVICE_KEYWORDS)):
+    if "device" in groups:
         score += 2
-    if any(k in s for k in (kw.lower() for kw in ENERGY_PROGRAM_KEYWORDS)):
+    if "energy" in groups:
         score += 1
-    if any(k in s for k in (kw.lower() for kw in IMPROVEMENT_KEYWORDS)):
+    if "improve" in groups:
         score += 1
 
     return score >= 2
 
+# =========================
+# 페이지 단위 일괄 필터 (pandas 벡터 연산)
+# =========================
+# 수집 항목 대부분(95%+)이 관심도 필터에서 탈락하므로, 페이지(또는 하루치) 전체를
+# DataFrame 한 번으로 판정해 통과 행만 관할 판정 단계로 넘깁니다.
+# 판정 기준은 is_relevant_text / _pass_keyword_filter와 동일합니다.
+def _regex_union(words) -> str:
+    return "|".join(re.escape(w.lower()) for w in sorted(set(words), key=len, reverse=True) if w)
+
+_KEYWORD_GROUP_RE = {g: _regex_union(kws) for g, kws in _KEYWORD_GROUPS.items()}
+
+
+def _items_frame(items) -> Tuple[list, "pd.DataFrame"]:
+    if isinstance(items, dict):
+        items = [items]
+    items = [it for it in (items or []) if isinstance(it, dict)]
+    return items, pd.DataFrame(items, dtype=object)
+
+
+def _item_field_series(df: "pd.DataFrame", spec) -> "pd.Series":
+    """spec: 키 이름 또는 (키1, 키2, ...) — `_as_text(it.get(키1) or it.get(키2))`와 동일"""
+    keys = (spec,) if isinstance(spec, str) else tuple(spec)
+    out = None
+    for k in keys:
+        col = df[k] if k in df.columns else pd.Series(None, index=df.index, dtype=object)
+        col = col.astype(object).where(col.notna(), None)
+        out = col if out is None else out.where(out.map(bool), col)
+    return out.map(_as_text).astype(object)
+
+
+def _norm_text_series(cols: List["pd.Series"]) -> "pd.Series":
+    """_norm_text의 벡터 버전"""
+    s = cols[0].str.cat(cols[1:], sep=" ") if len(cols) > 1 else cols[0]
+    s = s.str.lower().str.replace(r"[\(\)\[\]{}<>]", " ", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def relevance_mask(df: "pd.DataFrame", *fields) -> "pd.Series":
+    """is_relevant_text(각 필드...)의 벡터 버전 → 통과 여부(bool Series)"""
+    s = _norm_text_series([_item_field_series(df, f) for f in fields])
+    has = {
+        g: (s.str.contains(pat, regex=True) if pat else pd.Series(False, index=df.index))
+        for g, pat in _KEYWORD_GROUP_RE.items()
+    }
+    score = has["device"].astype(int) * 2 + has["energy"].astype(int) + has["improve"].astype(int)
+    return ~has["deny"] & ~(has["other"] & ~has["target"]) & (score >= 2)
+
+
+def filter_relevant_items(items, *fields) -> list:
+    """
+    원본 항목 목록(페이지/하루치) → 관심 공고만 반환
+    fields: 판정에 쓸 필드 (키 이름 또는 폴백 튜플), 순서는 is_relevant_text 인자 순서와 동일
+    """
+    items, df = _items_frame(items)
+    if not items:
+        return []
+    mask = relevance_mask(df, *fields)
+    kept = [it for it, ok in zip(items, mask.tolist()) if ok]
+    emit_event("filtered", len(kept))
+    return kept
+
+
+def _patterns_regex(pats) -> str:
+    return "|".join(
+        re.escape(obj) if kind == "text" else f"(?:{obj.pattern})"
+        for kind, obj in (pats or [])
+    )
+
+_INC_RE = _patterns_regex(_INC_PAT)
+_EXC_RE = _patterns_regex(_EXC_PAT)
+
+
+def filter_keyword_items(items, title_field, *extra_fields) -> list:
+    """_pass_keyword_filter(제목, *추가필드)의 벡터 버전 (K-APT 포함/제외 키워드)"""
+    items, df = _items_frame(items)
+    if not items:
+        return []
+    cat = _item_field_series(df, title_field).str.strip()
+    for f in extra_fields:
+        e = _item_field_series(df, f)
+        cat = cat + e.where(e == "", " " + e)
+    cat = cat.str.strip().str.lower()
+
+    mask = pd.Series(True, index=df.index)
+    if _EXC_RE:
+        mask &= ~cat.str.contains(_EXC_RE, flags=re.IGNORECASE, regex=True)
+    if _INC_RE:
+        mask &= cat.str.contains(_INC_RE, flags=re.IGNORECASE, regex=True)
+    kept = [it for it, ok in zip(items, mask.tolist()) if ok]
+    emit_event("filtered", len(kept))
+    return kept
+
+
 def _safe_hint_match(text: str, hint_key: str) -> bool:
     """
     CLIENT_HINTS 키워드가 텍스트에 있을 때, 불필요한 전국 오탐을 줄이기 위한 가드.
@@ -1437,50 +1842,56 @@ def assign_offices_by_address(addr: str) -> List[str]:
 # =========================
 # UsrInfo(상세주소) & Mall(시군구) 우선순위 선택
 # =========================
-def get_full_address_from_usr_info(dminstt_code: str) -> Optional[str]:
-    """
-    UsrInfoService.getDminsttInfo (코드 기준)
-    - inqryDiv=2(변경일 기준) + 12개월 기간 필수
-    - adrs + dtlAdrs → 상세주소, 없으면 rgnNm fallback
-    - 내부 스로틀(120ms) + 단순 캐시 적용
-    """
-    if not dminstt_code:
-        return None
+# =========================
+# 수요기관 주소 (UsrInfo) 일괄 선조회 + DB 캐시
+# =========================
+# 공고마다 기관코드를 하나씩 조회하지 않고, 수집 단위로 고유 기관코드를 모아 한 번에 해결합니다.
+# (institution_addresses 테이블 → 미스만 병렬 조회, 호스트 제한기 공유)
+USRINFO_CACHE_TTL_DAYS  = float(_cfg("USRINFO_CACHE_TTL_DAYS", 90) or 0)   # 주소 재조회 주기(일), 0=만료 없음
+USRINFO_MAX_CONCURRENCY = int(_cfg("USRINFO_MAX_CONCURRENCY", 8) or 8)     # 미스 기관 동시 조회 수
 
-    # --- 간단 캐시 & 스로틀(함수 속성 사용, 외부 코드 수정 불필요) ---
-    import time
-    from datetime import datetime, timedelta
+from datetime import datetime, timedelta
+
+_INSTT_ADDR_MEMO: Dict[str, tuple] = {}   # 프로세스 내 캐시: 기관코드 -> (만료시각 또는 None, 주소)
+_INSTT_ADDR_LOCK = threading.Lock()
+_INSTT_ADDR_MISS = object()
 
-    if not hasattr(get_full_address_from_usr_info, "_cache"):
-        get_full_address_from_usr_info._cache = {}  # type: ignore[attr-defined]
-    if not hasattr(get_full_address_from_usr_info, "_last_call"):
-        get_full_address_from_usr_info._last_call = 0.0  # type: ignore[attr-defined]
 
-    _cache: dict = get_full_address_from_usr_info._cache  # type: ignore[attr-defined]
-    _last_call: float = get_full_address_from_usr_info._last_call  # type: ignore[attr-defined]
+def _instt_addr_expires(fetched_at: Optional[datetime]) -> Optional[datetime]:
+    """조회 시각 + USRINFO_CACHE_TTL_DAYS (TTL 0이면 만료 없음)"""
+    if not USRINFO_CACHE_TTL_DAYS:
+        return None
+    return (fetched_at or datetime.utcnow()) + timedelta(days=USRINFO_CACHE_TTL_DAYS)
 
-    # 캐시 조회(프로세스 생존 동안 유지)
-    if dminstt_code in _cache:
-        return _cache[dminstt_code]
 
-    # 스로틀: 최소 120ms 간격
-    wait = 0.12 - (time.time() - _last_call)
-    if wait > 0:
-        time.sleep(wait)
+def _instt_addr_memo_get(code: str):
+    """프로세스 캐시 조회 (호출측이 _INSTT_ADDR_LOCK 보유). 없거나 만료면 _INSTT_ADDR_MISS"""
+    ent = _INSTT_ADDR_MEMO.get(code)
+    if ent is None or (ent[0] is not None and ent[0] <= datetime.utcnow()):
+        return _INSTT_ADDR_MISS
+    return ent[1]
+
+
+def _load_usr_info_address(dminstt_code: str) -> Tuple[Optional[str], bool]:
+    """
+    UsrInfoService.getDminsttInfo (코드 기준) 단건 조회 → (주소, 확정여부)
+    - inqryDiv=2(변경일 기준) + 12개월 기간 필수
+    - adrs + dtlAdrs → 상세주소, 없으면 rgnNm fallback
+    - API 오류는 확정여부 False (캐시에 저장하지 않음)
+    """
+    from datetime import datetime, timedelta
 
     # 12개월 기간(문서 제한 고려)
     end = datetime.now()
     start = end - timedelta(days=365)
-    inqryBgnDt = start.strftime("%Y%m%d") + "0000"
-    inqryEndDt = end.strftime("%Y%m%d") + "2359"
 
     params = {
         "ServiceKey": _cfg("NARA_SERVICE_KEY"),
         "type": "json",
-        "inqryDiv": "2",                 # ✅ 변경: 기간(변경일) 기준
-        "inqryBgnDt": inqryBgnDt,        # ✅ 12개월 범위 시작
-        "inqryEndDt": inqryEndDt,        # ✅ 12개월 범위 끝
-        "dminsttCd": dminstt_code,       # 코드 기준 조회
+        "inqryDiv": "2",                              # 기간(변경일) 기준
+        "inqryBgnDt": start.strftime("%Y%m%d") + "0000",
+        "inqryEndDt": end.strftime("%Y%m%d") + "2359",
+        "dminsttCd": dminstt_code,                    # 코드 기준 조회
         "numOfRows": "1",
         "pageNo": "1",
     }
@@ -1489,21 +1900,73 @@ def get_full_address_from_usr_info(dminstt_code: str) -> Optional[str]:
         data = http_get_json(api_url(USR_INFO_PATH), params)
         body = _as_dict(data.get("response", {}).get("body"))
         items = _as_items_list(body)
-        if items:
-            it = items[0]
-            full = f"{it.get('adrs','')}".strip()
-            dtl  = f"{it.get('dtlAdrs','')}".strip()
-            text = (full + " " + dtl).strip() or it.get("rgnNm")
-            # 캐시에 적재
-            _cache[dminstt_code] = text
-            return text
+        if not items:
+            return None, True
+        it = items[0]
+        full = f"{it.get('adrs','')}".strip()
+        dtl  = f"{it.get('dtlAdrs','')}".strip()
+        return ((full + " " + dtl).strip() or it.get("rgnNm") or None), True
     except Exception as e:
         print(f"  [Warn] 사용자정보 API 실패: {dminstt_code} ({e})")
-    finally:
-        # 마지막 호출시각 갱신
-        get_full_address_from_usr_info._last_call = time.time()  # type: ignore[attr-defined]
+        return None, False
 
-    return None
+
+def prefetch_institution_addresses(codes) -> Dict[str, Optional[str]]:
+    """
+    기관코드 목록 → {기관코드: 주소 또는 None}
+    1) 중복 제거 후 프로세스 캐시에 없거나 만료된 코드만 institution_addresses 일괄 조회 (TTL 지난 항목은 미스)
+    2) 미스만 USRINFO_MAX_CONCURRENCY 개씩 병렬 조회
+    3) 확정된 결과(주소 없음 포함)만 일괄 저장
+    """
+    distinct = sorted({str(c).strip() for c in (codes or []) if c and str(c).strip()})
+    if not distinct:
+        return {}
+    with _INSTT_ADDR_LOCK:
+        todo = [c for c in distinct if _instt_addr_memo_get(c) is _INSTT_ADDR_MISS]
+
+    if todo:
+        cached = {}
+        try:
+            with Session() as s:
+                cached = _instt_addr_get_many(s, todo, USRINFO_CACHE_TTL_DAYS or None, with_fetched_at=True)
+                s.commit()
+        except Exception as e:
+            print(f"  [UsrInfo] 캐시 조회 실패: {e}")
+
+        misses = [c for c in todo if c not in cached]
+        decided: Dict[str, Optional[str]] = {}
+        if misses:
+            with ThreadPoolExecutor(max_workers=max(USRINFO_MAX_CONCURRENCY, 1), thread_name_prefix="eers-usr") as ex:
+                for code, (addr, ok) in zip(misses, ex.map(_in_stage_ctx(_load_usr_info_address), misses)):
+                    if ok:
+                        decided[code] = addr
+            try:
+                with Session() as s:
+                    _instt_addr_set_many(s, decided)
+                    s.commit()
+            except Exception as e:
+                print(f"  [UsrInfo] 캐시 저장 실패: {e}")
+
+        with _INSTT_ADDR_LOCK:
+            _INSTT_ADDR_MEMO.update({c: (_instt_addr_expires(ts), a) for c, (a, ts) in cached.items()})
+            _INSTT_ADDR_MEMO.update({c: (_instt_addr_expires(None), a) for c, a in decided.items()})
+        _debug(f"· [UsrInfo] 기관 {len(distinct)}곳 / 캐시 {len(cached)} / 조회 {len(misses)}")
+
+    with _INSTT_ADDR_LOCK:
+        found = {c: _instt_addr_memo_get(c) for c in distinct}
+    return {c: (None if v is _INSTT_ADDR_MISS else v) for c, v in found.items()}
+
+
+def get_full_address_from_usr_info(dminstt_code: str) -> Optional[str]:
+    """기관코드 1건 주소 (선조회된 값이 있으면 그대로, 없으면 단건 선조회)"""
+    if not dminstt_code:
+        return None
+    code = str(dminstt_code).strip()
+    with _INSTT_ADDR_LOCK:
+        addr = _instt_addr_memo_get(code)
+    if addr is not _INSTT_ADDR_MISS:
+        return addr
+    return prefetch_institution_addresses([code]).get(code)
 
 
 def parse_dminstt_code_from_complex(s: str) -> Tuple[Optional[str], Optional[str]]:
@@ -1691,6 +2154,43 @@ BROAD_KEYWORD_OFFICE_MAP = {
 
 
 
+# CLIENT_HINTS / BROAD_KEYWORD_OFFICE_MAP 컴파일본
+_CLIENT_HINT_AC: tuple | None = None   # (CLIENT_HINTS 크기, 오토마타)
+
+def _best_client_hint(text: str) -> Optional[str]:
+    """텍스트에 포함된 CLIENT_HINTS 키 중 가장 긴 키 (같은 길이면 사전 순서 앞쪽)"""
+    global _CLIENT_HINT_AC
+    if _CLIENT_HINT_AC is None or _CLIENT_HINT_AC[0] != len(CLIENT_HINTS):
+        _CLIENT_HINT_AC = (len(CLIENT_HINTS), AhoCorasick(CLIENT_HINTS.keys()))
+    ac = _CLIENT_HINT_AC[1]
+    hits = ac.search(text or "")
+    if not hits:
+        return None
+    return ac.keys[min(hits, key=lambda i: (-len(ac.keys[i]), i))]
+
+
+_BROAD_KEYS = list(BROAD_KEYWORD_OFFICE_MAP)
+_BROAD_AC = AhoCorasick(_BROAD_KEYS)
+_TOKEN_CHAR = re.compile(_HANGUL_ALNUM)
+
+def _broad_keyword_office(text: str) -> Optional[str]:
+    """
+    단어 경계로 걸리는 광역 키워드의 지사 (여러 개면 BROAD_KEYWORD_OFFICE_MAP 순서 앞쪽).
+    _contains_token(text, [keyword])를 키워드마다 돌리던 것과 같은 결과.
+    """
+    s = _norm_text(text)
+    best = None
+    for start, i in _BROAD_AC.iter(s):
+        end = start + len(_BROAD_KEYS[i])
+        if start > 0 and _TOKEN_CHAR.match(s[start - 1]):
+            continue
+        if end < len(s) and _TOKEN_CHAR.match(s[end]):
+            continue
+        if best is None or i < best:
+            best = i
+    return BROAD_KEYWORD_OFFICE_MAP[_BROAD_KEYS[best]] if best is not None else None
+
+
 def assign_offices_by_keywords(client_name: str, project_name: str) -> List[str]:
     """주소로 못 정하면, 수요기관명 + 사업명(제목)에서 힌트 추론"""
     text = f"{client_name or ''} {project_name or ''}"
@@ -1700,16 +2200,16 @@ def assign_offices_by_keywords(client_name: str, project_name: str) -> List[str]
     # 구체 키워드 우선 매칭
     # 1순위: 가장 구체적인 전체 기관명으로 검색 (예: "대구 동구청")
     # sorted를 통해 긴 이름(더 구체적인 이름)을 먼저 비교
-    for k, office in sorted(CLIENT_HINTS.items(), key=lambda x: len(x[0]), reverse=True):
-        if k and k in text:
-            # office가 "A/B" 형태일 수 있으므로 split 후 리스트로 반환
-            return office.split('/')
+    k = _best_client_hint(text)
+    if k:
+        # office가 "A/B" 형태일 수 있으므로 split 후 리스트로 반환
+        return CLIENT_HINTS[k].split('/')
 
     # 2순위: 관할 시/군 키워드로 단일 사업소 검색 (예: "성주", "경주")
-    # _contains_token을 사용하여 '성주산' 같은 단어의 일부가 일치하는 오류 방지
-    for keyword, office in BROAD_KEYWORD_OFFICE_MAP.items():
-        if _contains_token(text, [keyword]):
-            return [office]
+    # 단어 경계 확인으로 '성주산' 같은 단어의 일부가 일치하는 오류 방지
+    office = _broad_keyword_office(text)
+    if office:
+        return [office]
             
     # 대구/경북 대역 키워드로 '관할불명(분배) 후보' 반환
     if any(t in text for t in ["대구광역시", " 대구", "대구 ", "대구"]):
@@ -1722,34 +2222,12 @@ def _assign_office_by_client_name(client_name: str) -> Optional[str]:
     """CLIENT_HINTS를 기반으로 기관명에서 직접 관할 지사를 찾습니다."""
     if not client_name:
         return None
-    for kw in sorted(CLIENT_HINTS.keys(), key=len, reverse=True):
-        if kw in client_name:
-            return CLIENT_HINTS[kw]
-    return None
+    kw = _best_client_hint(client_name)
+    return CLIENT_HINTS[kw] if kw else None
 
 # =========================
 # 저장 로직
 # =========================
-def _save_dual_office_rows(base_notice: dict, addr: str, offices: List[str]):
-    """
-    A/B 특수권역은 이제 단일 행으로 저장합니다.
-    - assigned_office: "A/B" (GUI에서 줄바꿈 처리)
-    - address: API 원본 주소만 저장 (장식/주석 금지)
-    - status: 원본 유지 (보조행 저장 없음)
-    """
-    n = dict(base_notice)
-    n["assigned_office"] = f"{offices[0]}/{offices[1]}"
-    n["address"] = addr or ""
-    n["status"] = n.get("status", "")
-    try:
-        upsert_notice(n)
-        session.commit()
-        print(f"  [✅ 저장 완료 (A/B-단일행)] {n.get('assigned_office')} / {n.get('client')}")
-    except Exception as e:
-        session.rollback()
-        print(f"  [Error] A/B 단일행 저장 실패: {e}")
-
-
 import unicodedata
 
 def _is_exact_lh_dgrb(name: Optional[str]) -> bool:
@@ -1761,9 +2239,12 @@ def expand_and_store_with_priority(
     client_code: Optional[str],
     mall_addr: Optional[str],
     client_name: Optional[str],
-    save: bool = True
 ):
-    
+    """
+    관할 사업소/주소를 결정한 notice dict 반환 (제외 대상이면 None)
+    - DB에 쓰지 않음: 호출측이 모아서 bulk_upsert_notices로 청크 단위 저장
+    """
+
     def _fill_kea_if_needed(n: dict):
         # 타지역 컷을 모두 통과한 후에만 호출됨
         if not USE_KEA_CHECK:
@@ -1772,11 +2253,7 @@ def expand_and_store_with_priority(
             return
         m = (n.get("model_name") or "").strip()
     # ✅ KEA 조회 스킵 대상(무의미 모델명)
-        SKIP_MODELS = {
-            "모델명 없음", "세부내역 미확인", "N/A",
-            "계획 단계 확인", "공고 확인 필요", "입찰 확인 필요", "계약 확인 필요",
-        }
-        if not m or m in SKIP_MODELS:
+        if not m or m in KEA_SKIP_MODELS:
             return
 
         try:
@@ -1787,25 +2264,21 @@ def expand_and_store_with_priority(
             print(f"  [KEA] 조회 스킵/오류: {e}")
 
     def _save(n):
-        _fill_kea_if_needed(n) 
-        if save:
-            upsert_notice(n); session.commit()
-            print(f"  [✅ 저장 완료] {n.get('assigned_office','')} / {n.get('client')}")
-            return None
-        else:
-            print(f"  [🧺 저장 대기] {n.get('assigned_office','')} / {n.get('client')}")
-            return n
+        _fill_kea_if_needed(n)
+        _debug(f"  [🧺 저장 대기] {n.get('assigned_office','')} / {n.get('client')}")
+        return n
     # 타권역만 명시 & 목표권역 부재 시 컷 (기관명까지 포함해 재확인)
     _alltxt_norm = _norm_text(base_notice.get("project_name",""), client_name or "", mall_addr or "")
    
     # [FIX] Add a hard-deny check on the combined text at the very beginning.
     
-    if any(k in _alltxt_norm for k in (kw.lower() for kw in HARD_DENY_KEYWORDS)):
+    _alltxt_groups = _keyword_groups(_alltxt_norm)
+    if "deny" in _alltxt_groups:
         print_exclude_once(base_notice, client_name, mall_addr or "")
         return
 
     # The existing region check can remain as a secondary filter
-    if any(k in _alltxt_norm for k in (kw.lower() for kw in OTHER_REGION_KEYWORDS)) and not any(k in _alltxt_norm for k in (kw.lower() for kw in TARGET_REGION_KEYWORDS)):
+    if "other" in _alltxt_groups and "target" not in _alltxt_groups:
         print_exclude_once(base_notice, client_name, mall_addr or "")
         return
     
@@ -2016,7 +2489,7 @@ def expand_and_store_with_priority(
 
 def finalize_notice_dict(base_notice, client_code, mall_addr, client_name):
     # 저장하지 말고 dict를 돌려줘서 벌크 업서트 경로에서 사용
-    return expand_and_store_with_priority(base_notice, client_code, mall_addr, client_name, save=False)
+    return expand_and_store_with_priority(base_notice, client_code, mall_addr, client_name)
 
 
 
@@ -2045,6 +2518,87 @@ def _build_base_notice(stage: str, biz_type: str, project_name: str, client: str
         "kapt_code": kapt_code, # 반환 딕셔셔리에 kapt_code 추가
     }
 
+# =========================
+# K-APT 응답 캐시 (DB + 프로세스 메모리)
+# =========================
+# 단지 기본정보/유지관리 이력은 거의 바뀌지 않으므로 (엔드포인트, kaptCode) 단위로 캐시합니다.
+# - TTL: KAPT_CACHE_TTL_HOURS (기본 30일, 0이면 캐시 끔)
+# - 빈 응답(totalCount=0): KAPT_CACHE_NEG_TTL_HOURS (기본 24시간)
+# - 네트워크/서버 오류는 캐시하지 않음
+from collections import Counter
+from datetime import datetime, timedelta
+
+KAPT_CACHE_TTL_HOURS     = float(_cfg("KAPT_CACHE_TTL_HOURS", 24 * 30) or 0)
+KAPT_CACHE_NEG_TTL_HOURS = float(_cfg("KAPT_CACHE_NEG_TTL_HOURS", 24) or 0)
+
+CACHE_STATS = Counter()   # "<endpoint>.hit" / ".neg_hit" / ".miss" / ".store"
+_KAPT_MEMO: Dict[tuple, tuple] = {}   # (endpoint, key) -> (만료시각, 값)
+_KAPT_MEMO_LOCK = threading.Lock()
+_CACHE_MISS = object()
+
+
+def _kapt_cache_lookup(endpoint: str, key: str):
+    now = datetime.utcnow()
+    with _KAPT_MEMO_LOCK:
+        ent = _KAPT_MEMO.get((endpoint, key))
+    if ent and ent[0] > now:
+        return ent[1]
+
+    try:
+        with engine.connect() as conn:
+            row = _api_cache_get(conn, endpoint, key)
+    except Exception as e:
+        _debug(f"· [캐시] 조회 실패({endpoint}/{key}): {e}")
+        return _CACHE_MISS
+    if not row:
+        return _CACHE_MISS
+
+    payload, is_empty, fetched_at = row
+    ttl = KAPT_CACHE_NEG_TTL_HOURS if is_empty else KAPT_CACHE_TTL_HOURS
+    expires = fetched_at + timedelta(hours=ttl)
+    if expires <= now:
+        return _CACHE_MISS
+
+    value = None if is_empty else json.loads(payload)
+    with _KAPT_MEMO_LOCK:
+        _KAPT_MEMO[(endpoint, key)] = (expires, value)
+    return value
+
+
+def _kapt_cache_store(endpoint: str, key: str, value):
+    is_empty = not value
+    ttl = KAPT_CACHE_NEG_TTL_HOURS if is_empty else KAPT_CACHE_TTL_HOURS
+    with _KAPT_MEMO_LOCK:
+        _KAPT_MEMO[(endpoint, key)] = (datetime.utcnow() + timedelta(hours=ttl), value)
+    try:
+        with engine.begin() as conn:
+            _api_cache_set(conn, endpoint, key,
+                           None if is_empty else json.dumps(value, ensure_ascii=False), is_empty)
+        CACHE_STATS[f"{endpoint}.store"] += 1
+    except Exception as e:
+        _debug(f"· [캐시] 저장 실패({endpoint}/{key}): {e}")
+
+
+def _kapt_cached(endpoint: str, key: str, loader: Callable[[], tuple]):
+    """
+    캐시 우선 조회. loader() → (값, 확정여부)
+    - 확정여부 False(오류)면 캐시에 남기지 않음
+    """
+    if KAPT_CACHE_TTL_HOURS <= 0 or not key:
+        return loader()[0]
+
+    value = _kapt_cache_lookup(endpoint, key)
+    if value is not _CACHE_MISS:
+        CACHE_STATS[f"{endpoint}.{'hit' if value else 'neg_hit'}"] += 1
+        return value
+
+    CACHE_STATS[f"{endpoint}.miss"] += 1
+    value, decisive = loader()
+    if decisive:
+        _kapt_cache_store(endpoint, key, value)
+    return value
+
+
 def fetch_kapt_basic_info(
     kapt_code: str,
     *,
@@ -2052,7 +2606,7 @@ def fetch_kapt_basic_info(
     max_retries: int = 2,
     backoff_sec: float = 0.25
 ) -> Optional[Dict[str, Any]]:
-    """단지 코드로 K-APT 기본 정보를 조회합니다. (안전가드/재시도 포함)"""
+    """단지 코드로 K-APT 기본 정보를 조회합니다. (안전가드/재시도 + 응답 캐시)"""
     if not kapt_code:
         return None
 
@@ -2060,6 +2614,14 @@ def fetch_kapt_basic_info(
     if (not allow_non_standard) and (not re.match(r"^A\d{8}$", kapt_code)):
         return None
 
+    return _kapt_cached(
+        "kapt_basic", kapt_code,
+        lambda: _load_kapt_basic_info(kapt_code, max_retries, backoff_sec),
+    )
+
+
+def _load_kapt_basic_info(kapt_code: str, max_retries: int, backoff_sec: float) -> Tuple[Optional[dict], bool]:
+    """K-APT 기본정보 API 호출 → (item, 확정여부)"""
     params = {
         "serviceKey": _cfg("KAPT_SERVICE_KEY"),
         "kaptCode": kapt_code,
@@ -2085,12 +2647,12 @@ def fetch_kapt_basic_info(
 
             # 정상 dict면 반환
             if isinstance(item, dict) and item:
-                return item
+                return item, True
 
-            # 명시적으로 '없음'인 경우 조용히 None
+            # 명시적으로 '없음'인 경우 조용히 None (빈 응답도 캐시)
             total = body.get("totalCount")
             if isinstance(total, (int, str)) and int(total or 0) == 0:
-                return None
+                return None, True
 
             raise ValueError("no item in response")
 
@@ -2099,7 +2661,8 @@ def fetch_kapt_basic_info(
                 time.sleep(backoff_sec * (attempt + 1))
                 continue
             print(f"  [Error] K-APT 기본정보 조회 실패 ({kapt_code}): {e}")
-            return None
+            return None, False
+    return None, False
     
 def _compose_display_addr(item: dict) -> str:
     """
@@ -2177,18 +2740,29 @@ def _extract_kapt_phone(basic: dict | None) -> str:
 
 def fetch_kapt_maintenance_history(kapt_code: str) -> list[dict]:
     """
-    K-APT 유지관리 이력 조회 (안전 정규화)
+    K-APT 유지관리 이력 조회 (안전 정규화 + 응답 캐시)
     - 'list has no attribute get' 예외를 원천 차단
     """
+    kapt_code = (kapt_code or "").strip()
+    return _kapt_cached(
+        "kapt_maintenance", kapt_code,
+        lambda: _load_kapt_maintenance_history(kapt_code),
+    ) or []
+
+
+def _load_kapt_maintenance_history(kapt_code: str) -> Tuple[list, bool]:
+    """K-APT 유지관리 이력 API 호출 → (rows, 확정여부)"""
     url = api_url(KAPT_MAINTENANCE_PATH)
     params = {
         "serviceKey": _cfg("KAPT_SERVICE_KEY"),
         "pageNo": "1",
         "numOfRows": "100",
-        "kaptCode": (kapt_code or "").strip(),
+        "kaptCode": kapt_code,
         "type": "json"
     }
     data = http_get_json(url, params)
+    if not isinstance(data, dict):
+        return [], False   # 오류 응답은 캐시하지 않음
     rows = _kapt_items_safely(data)  # ← 안전 정규화
 
     out = []
@@ -2200,25 +2774,36 @@ def fetch_kapt_maintenance_history(kapt_code: str) -> list[dict]:
             "year": _as_text(r.get("year")),
             "useYear": _as_text(r.get("useYear")),
         })
-    return out
+    return out, True
+
 
+def log_cache_stats():
+    """K-APT 응답 캐시 적중률 요약 (VERBOSE)"""
+    for ep in ("kapt_basic", "kapt_maintenance"):
+        hit = CACHE_STATS[f"{ep}.hit"] + CACHE_STATS[f"{ep}.neg_hit"]
+        miss = CACHE_STATS[f"{ep}.miss"]
+        if hit or miss:
+            _debug(f"· [캐시:{ep}] hit={hit} (빈응답 {CACHE_STATS[f'{ep}.neg_hit']}) / miss={miss} "
+                   f"/ 적중률 {hit * 100 // (hit + miss)}%")
 
 
-def fetch_and_process_kapt_bids(search_ymd: str):
+
+def fetch_and_process_kapt_bids(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
     """K-APT 입찰공고 수집 — 로그는 '제외/저장 대기/일괄 저장'만 출력 (주소는 로그 끝에 표시)."""
-    print(f"\n--- [{to_ymd(search_ymd)}] 공동주택(K-APT) 입찰공고 수집 ---")
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 공동주택(K-APT) 입찰공고 수집 ---")
 
     try:
         params_first = {
             "serviceKey": _cfg("KAPT_SERVICE_KEY"), "pageNo": "1", "numOfRows": "1",
-            "startDate": search_ymd, "endDate": search_ymd, "_type": "json"
+            "startDate": search_ymd, "endDate": end_ymd, "_type": "json"
         }
         first = http_get_json(api_url(KAPT_BID_LIST_PATH), params_first)
         total = int(first.get("response", {}).get("body", {}).get("totalCount", 0))
         if total == 0:
-            print("- 데이터 없음"); return
+            print("- 데이터 없음"); return []
     except Exception as e:
-        print(f"[Error] K-apt 총 건수 조회 실패: {e}"); return
+        emit_event("error", message=f"[Error] K-apt 총 건수 조회 실패: {e}"); return []
 
     page_size = 100
     total_pages = (total + page_size - 1) // page_size
@@ -2227,7 +2812,7 @@ def fetch_and_process_kapt_bids(search_ymd: str):
 
     params_list = [{
         "serviceKey": _cfg("KAPT_SERVICE_KEY"), "pageNo": str(p), "numOfRows": str(page_size),
-        "startDate": search_ymd, "endDate": search_ymd, "_type": "json"
+        "startDate": search_ymd, "endDate": end_ymd, "_type": "json"
     } for p in range(1, total_pages + 1)]
 
     pages = fetch_pages_parallel(api_url(KAPT_BID_LIST_PATH), params_list)
@@ -2238,15 +2823,12 @@ def fetch_and_process_kapt_bids(search_ymd: str):
         if not items:
             continue
 
+        _note_seen(items, "bidRegDate")
+        # 관심도 필터는 페이지 단위 일괄 판정
+        items = filter_relevant_items(items, "bidTitle", "codeClassifyType1", "codeClassifyType2",
+                                      "codeClassifyType3", "bidMethod", "bidKaptname")
         for it in items:
             title = (it.get("bidTitle") or "").strip()
-            if not is_relevant_text(title,
-                                    _as_text(it.get("codeClassifyType1")),
-                                    _as_text(it.get("codeClassifyType2")),
-                                    _as_text(it.get("codeClassifyType3")),
-                                    _as_text(it.get("bidMethod")),
-                                    _as_text(it.get("bidKaptname"))):
-                continue
 
 
             kapt_code   = (it.get("aptCode") or "").strip()
@@ -2297,8 +2879,9 @@ def fetch_and_process_kapt_bids(search_ymd: str):
                 log_kapt_pending(assigned_office, client_name, addr_txt or bjd_code)
 
     if buffer:
-        bulk_upsert_notices(buffer)
-        log_kapt_bulk_saved(len(buffer))
+        log_kapt_bulk_saved(bulk_upsert_notices(buffer))
+    log_cache_stats()
+    return buffer
 
 
 # [추가] K-APT 입찰 결과 API 엔드포인트
@@ -2496,7 +3079,7 @@ def _resolve_office_by_apt_or_bidarea(kapt_code: str, bid_area: str):
 
 
 
-def fetch_and_process_kapt_bid_results(search_ymd: str):
+def fetch_and_process_kapt_bid_results(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
     """
     K-APT 입찰결과 수집
       - 1순위: 당일(마감/공고)
@@ -2504,7 +3087,8 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
       - 키워드(가변 인자) + 관할 + 중복 제거
       - 사용자 표시 로그: 나라장터 톤(총 N건 / Pp, 일괄 저장 N건 / 데이터 없음)
     """
-    print(f"\n--- [{to_ymd(search_ymd)}] 공동주택(K-APT) 입찰결과 수집 ---")
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 공동주택(K-APT) 입찰결과 수집 ---")
     svc_key = getattr(_local_config, "KAPT_SERVICE_KEY_DECODING", None) or _cfg("KAPT_SERVICE_KEY")
 
     def _first_page(url_path, tag):
@@ -2512,7 +3096,7 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
             r = http_get_json(api_url(url_path), {
                 "serviceKey": svc_key, "_type": "json",
                 "pageNo": "1", "numOfRows": "1",
-                "startDate": search_ymd, "endDate": search_ymd,
+                "startDate": search_ymd, "endDate": end_ymd,
             })
             resp = (r or {}).get("response") or {}
             header = resp.get("header") or {}
@@ -2541,7 +3125,7 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
         plist = [{
             "serviceKey": svc_key, "_type": "json",
             "pageNo": str(p), "numOfRows": str(PAGE_SIZE),
-            "startDate": search_ymd, "endDate": search_ymd,
+            "startDate": search_ymd, "endDate": end_ymd,
         } for p in range(1, total_pages + 1)]
         try:
             return fetch_pages_parallel(api_url(url_path), plist)
@@ -2563,11 +3147,11 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
     if not pages_all:
         _debug("· [상태+연도] 보정 수집 시도 (4=유찰, 5=낙찰)")
 
-        def _collect_state(state):
+        def _collect_state(state, year):
             r = http_get_json(api_url(PATH_STTS), {
                 "serviceKey": svc_key, "_type": "json",
                 "pageNo": "1", "numOfRows": "1",
-                "bidState": state, "searchYear": search_ymd[:4],
+                "bidState": state, "searchYear": year,
             })
             resp = (r or {}).get("response") or {}
             header = resp.get("header") or {}
@@ -2583,13 +3167,14 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
             plist = [{
                 "serviceKey": svc_key, "_type": "json",
                 "pageNo": str(p), "numOfRows": str(PAGE_SIZE),
-                "bidState": state, "searchYear": search_ymd[:4],
+                "bidState": state, "searchYear": year,
             } for p in range(1, total_pages + 1)]
             return fetch_pages_parallel(api_url(PATH_STTS), plist)
 
         st_pages = []
-        st_pages.extend(_collect_state("5"))
-        st_pages.extend(_collect_state("4"))
+        for year in sorted({search_ymd[:4], end_ymd[:4]}):
+            st_pages.extend(_collect_state("5", year))
+            st_pages.extend(_collect_state("4", year))
 
         raw_items = []
         for pg in st_pages:
@@ -2600,7 +3185,9 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
         pbl_ctr  = Counter(_date8(it.get("bidRegdate"))  for it in raw_items if _date8(it.get("bidRegdate")))
         _debug(f"· [상태+연도 전체] 총 {len(raw_items)}건 | 빈 마감일:{len(raw_items)-sum(clos_ctr.values())}, 빈 공고일:{len(raw_items)-sum(pbl_ctr.values())}")
 
-        alt_days = {search_ymd, prev_business_day(search_ymd), next_business_day(search_ymd)}
+        # 조회 구간 전체 + 앞뒤 1영업일 보정
+        alt_days = set(_days_between(search_ymd, end_ymd))
+        alt_days |= {prev_business_day(search_ymd), next_business_day(end_ymd)}
         filtered = [it for it in raw_items
                     if _date8(it.get("bidDeadline")) in alt_days
                     or _date8(it.get("bidRegdate"))  in alt_days]
@@ -2609,7 +3196,7 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
 
         if not filtered:
             _print_data_none()
-            return
+            return []
 
         pages_all = [{"response": {"body": {"items": filtered}}}]
 
@@ -2623,6 +3210,10 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
     for data in pages_all:
         items = (((data or {}).get("response") or {}).get("body") or {}).get("items") or []
         stats["total_items"] += len(items)
+        # 키워드 필터(다필드) — 페이지 단위 일괄 판정
+        items = filter_keyword_items(items, "bidTitle", "codeClassifyType1", "codeClassifyType2",
+                                     "codeClassifyType3", "bidMethod", "bidKaptname")
+        stats["after_kw"] += len(items)
         for it in items:
             title = (it.get("bidTitle") or "").strip()
             state = (it.get("bidState") or "").strip()
@@ -2632,16 +3223,6 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
             client_name = (it.get("bidKaptname") or "").strip() or "단지명 없음"
             bid_no = (it.get("bidNum") or "").strip()
 
-            # 키워드 필터(다필드)
-            biz1 = _as_text(it.get("codeClassifyType1"))
-            biz2 = _as_text(it.get("codeClassifyType2"))
-            biz3 = _as_text(it.get("codeClassifyType3"))
-            bid_method = _as_text(it.get("bidMethod"))
-            kapt_name  = _as_text(it.get("bidKaptname"))
-            if not _pass_keyword_filter(title, biz1, biz2, biz3, bid_method, kapt_name):
-                continue
-            stats["after_kw"] += 1
-
             # --- [FIX] 관할/주소/법정동코드 초기 세팅 ---
             # 1) apt_list.csv 우선 조회
             addr_txt, pre_office, bjd_code = lookup_apt_by_code(kapt_code)
@@ -2701,13 +3282,14 @@ def fetch_and_process_kapt_bid_results(search_ymd: str):
                f"관할후:{stats['after_region']}, 중복제외:{stats['dedup_skip']}, "
                f"타지역제외:{stats['excluded_region']})")
         _print_data_none()
-        return
+        return []
 
     try:
-        bulk_upsert_notices(buffer)
-        _print_bulk_saved(len(buffer))  # "  [✅ 일괄 저장] N건"
+        _log_bulk_saved(bulk_upsert_notices(buffer))  # "  [✅ 일괄 저장] N건"
     except Exception as e:
-        print(f"  [Error] 저장 실패: {type(e).__name__}: {e} (후보:{len(buffer)})")
+        emit_event("error", message=f"  [Error] 저장 실패: {type(e).__name__}: {e} (후보:{len(buffer)})")
+        return []
+    return buffer
 
 
 def _collect_by_state_year(bid_state: str, year: str):
@@ -2763,6 +3345,65 @@ def _month_chunks(start_ymd: str, end_ymd: str):
         else:
             cur = datetime(cur.year, cur.month + 1, 1)
 
+def _days_between(start_ymd: str, end_ymd: str) -> List[str]:
+    """start~end(포함) 일자 목록 (YYYYMMDD)"""
+    s = datetime.strptime(start_ymd, "%Y%m%d")
+    e = datetime.strptime(end_ymd, "%Y%m%d")
+    return [(s + timedelta(days=i)).strftime("%Y%m%d") for i in range((e - s).days + 1)]
+
+def _range_chunks(start_ymd: str, end_ymd: str, max_days: Optional[int] = 31):
+    """
+    API 1회 호출 허용 구간으로 분할.
+    - 기본은 월 단위(_month_chunks), max_days가 더 작으면 월 구간을 다시 max_days씩 분할
+    - max_days=None → 분할 없이 전체 1구간
+    """
+    if not max_days:
+        yield start_ymd, end_ymd
+        return
+    for ms, me in _month_chunks(start_ymd, end_ymd):
+        days = _days_between(ms, me)
+        for i in range(0, len(days), max_days):
+            part = days[i:i + max_days]
+            yield part[0], part[-1]
+
+def _range_label(start_ymd: str, end_ymd: str) -> str:
+    def _fmt(v):
+        return to_ymd(v) + (f" {v[8:10]}:{v[10:12]}" if len(v) == 12 else "")
+    return _fmt(start_ymd) if start_ymd == end_ymd else f"{_fmt(start_ymd)}~{_fmt(end_ymd)}"
+
+def _api_dt_range(start: str, end: str) -> Tuple[str, str]:
+    """
+    'YYYYMMDD' 또는 'YYYYMMDDHHMM' → 나라장터 12자리 조회 구간
+    - 날짜만 있으면 하루 전체(0000~2359), 시각이 있으면 그대로 (증분 수집)
+    """
+    return (
+        start if len(start) == 12 else f"{start[:8]}0000",
+        end if len(end) == 12 else f"{end[:8]}2359",
+    )
+
+# 단계 실행 중 본 항목의 최신 등록 시각 (스레드별, sync_state.last_item_at용)
+_STAGE_SEEN = threading.local()
+
+def _parse_api_dt(v) -> Optional[datetime]:
+    s = re.sub(r"\D", "", str(v or ""))
+    try:
+        if len(s) >= 12:
+            return datetime.strptime(s[:12], "%Y%m%d%H%M")
+        if len(s) >= 8:
+            return datetime.strptime(s[:8], "%Y%m%d")
+    except ValueError:
+        pass
+    return None
+
+def _note_seen(items, *keys):
+    """항목들의 등록 시각(첫 번째로 값이 있는 키) 중 최댓값을 현재 단계 기록에 반영"""
+    latest = getattr(_STAGE_SEEN, "latest", None)
+    for it in items:
+        dt = _parse_api_dt(next((it.get(k) for k in keys if it.get(k)), None))
+        if dt and (latest is None or dt > latest):
+            latest = dt
+    _STAGE_SEEN.latest = latest
+
 def _count_private_contracts(svc_key, start_ymd, end_ymd):
     q = {"serviceKey": svc_key, "_type": "json", "pageNo": "1", "numOfRows": "1",
          "startDate": start_ymd, "endDate": end_ymd}
@@ -2772,11 +3413,12 @@ def _count_private_contracts(svc_key, start_ymd, end_ymd):
 
 from datetime import datetime
 
-def fetch_and_process_kapt_private_contracts(search_ymd: str):
+def fetch_and_process_kapt_private_contracts(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
     """K-APT 수의계약 공지 수집 (시스템 표준: regDate 기준 정렬/신규/저장)."""
     # === 날짜 범위 계산 ===
-    endDate = search_ymd  # 조회 종료일 = 입력일 (YYYYMMDD)
-    end_dt = datetime.strptime(search_ymd, "%Y%m%d")
+    # 원래부터 '직전년도 1/1 ~ 조회일' 전체를 한 번에 조회하므로 구간 요청도 종료일 기준 1회만 호출
+    endDate = end_ymd or search_ymd  # 조회 종료일 (YYYYMMDD)
+    end_dt = datetime.strptime(endDate, "%Y%m%d")
     startDate = f"{end_dt.year - 1}0101"  # 직전년도 1/1 ~ 조회일까지
 
     print(f"\n--- [K-APT 수의계약] 조회기간: {startDate} ~ {endDate} ---")
@@ -2812,7 +3454,7 @@ def fetch_and_process_kapt_private_contracts(search_ymd: str):
 
     if total == 0:
         print("  - 데이터 없음")
-        return
+        return []
 
     # === 페이징 ===
     total_pages = (total + PAGE - 1) // PAGE
@@ -2846,6 +3488,10 @@ def fetch_and_process_kapt_private_contracts(search_ymd: str):
             items = [items]
         stats["total_items"] += len(items)
 
+        # 텍스트 필터 — 페이지 단위 일괄 판정
+        items = filter_relevant_items(items, "pcTitle", "pcReason", "codeClassifyType1")
+        stats["after_kw"] += len(items)
+
         for it in items:
             title         = (it.get("pcTitle") or "").strip()
             pc_date_raw   = (it.get("pcDate") or "").strip()    # 계약일자 (참고)
@@ -2857,15 +3503,6 @@ def fetch_and_process_kapt_private_contracts(search_ymd: str):
             mall_addr     = (it.get("area") or "").strip()
             contract_no   = (it.get("pcNum") or "").strip()
 
-            # 텍스트 필터
-            if not is_relevant_text(
-                title,
-                _as_text(it.get("pcReason", "")),
-                _as_text(it.get("codeClassifyType1", "")),
-            ):
-                continue
-            stats["after_kw"] += 1
-
             detail_link = _make_detail_link(contract_no, kapt_code)
 
             # ★ 시스템 얼라인: 저장 기준일 = regDate
@@ -2907,29 +3544,32 @@ def fetch_and_process_kapt_private_contracts(search_ymd: str):
     if not buffer:
         _debug(f"(수집:{stats['total_items']}, 키워드후:{stats['after_kw']}, 관할후:{stats['after_region']})")
         print("  - 데이터 없음")
-        return
+        return []
 
     try:
-        bulk_upsert_notices(buffer)
-        print(f"  [✅ 일괄 저장] {len(buffer)}건")
+        _log_bulk_saved(bulk_upsert_notices(buffer))
         _debug(f"(수집:{stats['total_items']}, 키워드후:{stats['after_kw']}, 관할후:{stats['after_region']})")
     except Exception as e:
-        print(f"  [Error] 저장 실패: {type(e).__name__}: {e} (후보:{len(buffer)})")
+        emit_event("error", message=f"  [Error] 저장 실패: {type(e).__name__}: {e} (후보:{len(buffer)})")
+        return []
+    return buffer
 
 # --- 발주계획 ---
-def fetch_and_process_order_plans(search_ymd: str):
-    print(f"\n--- [{to_ymd(search_ymd)}] 발주계획(나라장터) 수집 ---")
+def fetch_and_process_order_plans(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 발주계획(나라장터) 수집 ---")
+    bgn_dt, end_dt = _api_dt_range(search_ymd, end_ymd)
 
     # 1) 총건수 1회 조회
     first = http_get_json(api_url(ORDER_PLAN_LIST_PATH), {
         "ServiceKey": _cfg("NARA_SERVICE_KEY"), "type": "json",
         "pageNo": "1", "numOfRows": "1",
-        "inqryDiv": "1", "inqryBgnDt": f"{search_ymd}0000", "inqryEndDt": f"{search_ymd}2359"
+        "inqryDiv": "1", "inqryBgnDt": bgn_dt, "inqryEndDt": end_dt
     })
     body = _as_dict(first.get("response", {}).get("body"))
     total = int(body.get("totalCount", 0))
     if total == 0:
-        print("  - 데이터 없음"); return
+        print("  - 데이터 없음"); return []
 
     page_size   = 100
     total_pages = (total + page_size - 1) // page_size
@@ -2940,49 +3580,57 @@ def fetch_and_process_order_plans(search_ymd: str):
     params_list = [{
         "ServiceKey": _cfg("NARA_SERVICE_KEY"), "type": "json",
         "pageNo": str(p), "numOfRows": str(page_size),
-        "inqryDiv": "1", "inqryBgnDt": f"{search_ymd}0000", "inqryEndDt": f"{search_ymd}2359"
+        "inqryDiv": "1", "inqryBgnDt": bgn_dt, "inqryEndDt": end_dt
     } for p in range(1, total_pages + 1)]
 
     pages = fetch_pages_parallel(api_url(ORDER_PLAN_LIST_PATH), params_list)
 
-    # 3) 페이지 결과 처리 (메인 스레드에서만 DB 저장)
+    # 3) 페이지 결과 선별 → 수요기관 주소 일괄 선조회 → 후보 dict 모아 일괄 저장
+    items = []
     for data in pages:
-        items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
-        for it in items:
-            if it.get("bsnsDivNm") != "물품":
-                continue
-            title = it.get("bizNm", "")
-            if not is_relevant_text(title,
-                                    _as_text(it.get("bsnsDivNm")),
-                                    _as_text(it.get("itemNm") or it.get("prdctNm")),
-                                    _as_text(it.get("dminsttNm") or it.get("dmndInsttNm"))):
-                continue
+        page_items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
+        _note_seen(page_items, "nticeDt")
+        page_items = [it for it in page_items if it.get("bsnsDivNm") == "물품"]
+        items += filter_relevant_items(page_items, "bizNm", "bsnsDivNm", ("itemNm", "prdctNm"), ("dminsttNm", "dmndInsttNm"))
+    prefetch_institution_addresses(it.get("orderInsttCd") or it.get("dminsttCd") for it in items)
 
+    buffer = []
+    for it in items:
+        title = it.get("bizNm", "")
 
-            client_code = it.get("orderInsttCd") or it.get("dminsttCd")
-            client_name = it.get("orderInsttNm") or it.get("dminsttNm") or "기관명 없음"
-            mall_addr   = guess_mall_addr(it)
 
-            plan_no = it.get('orderPlanUntyNo') or ''
-            detail_link = f"https://www.g2b.go.kr/pt/menu/selectSubFrame.do?framesrc=/pt/orderplan/orderPlanDetail.do?orderPlanNo={plan_no}" if plan_no else ""
+        client_code = it.get("orderInsttCd") or it.get("dminsttCd")
+        client_name = it.get("orderInsttNm") or it.get("dminsttNm") or "기관명 없음"
+        mall_addr   = guess_mall_addr(it)
 
-            base = _build_base_notice(
-                "발주계획", "물품", title, client_name, it.get("telNo", ""),
-                "계획 단계 확인", 0, it.get("sumOrderAmt") or "", "확인필요",
-                to_ymd(it.get("nticeDt")), detail_link
-            )
-            expand_and_store_with_priority(base, client_code, mall_addr, client_name)
+        plan_no = it.get('orderPlanUntyNo') or ''
+        detail_link = f"https://www.g2b.go.kr/pt/menu/selectSubFrame.do?framesrc=/pt/orderplan/orderPlanDetail.do?orderPlanNo={plan_no}" if plan_no else ""
+
+        base = _build_base_notice(
+            "발주계획", "물품", title, client_name, it.get("telNo", ""),
+            "계획 단계 확인", 0, it.get("sumOrderAmt") or "", "확인필요",
+            to_ymd(it.get("nticeDt")), detail_link
+        )
+        n = finalize_notice_dict(base, client_code, mall_addr, client_name)
+        if n: buffer.append(n)
+
+    if buffer:
+        _log_bulk_saved(bulk_upsert_notices(buffer))
+    return buffer
 
 
 # --- 입찰공고 ---
-def fetch_and_process_bid_notices(search_ymd: str):
-    print(f"\n--- [{to_ymd(search_ymd)}] 입찰공고(나라장터)) 수집 ---")
+def fetch_and_process_bid_notices(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 입찰공고(나라장터)) 수집 ---")
+    bgn_dt, end_dt = _api_dt_range(search_ymd, end_ymd)
+    buffer, relevant = [], []
     page, page_size, total_pages = 1, 100, 1
     while page <= total_pages:
         params = {
             "ServiceKey": _cfg("NARA_SERVICE_KEY"), "type": "json",
             "pageNo": str(page), "numOfRows": str(page_size),
-            "bidNtceBgnDt": f"{search_ymd}0000", "bidNtceEndDt": f"{search_ymd}2359"
+            "bidNtceBgnDt": bgn_dt, "bidNtceEndDt": end_dt
         }
         try:
             data = http_get_json(api_url(BID_LIST_PATH), params)
@@ -3004,55 +3652,60 @@ def fetch_and_process_bid_notices(search_ymd: str):
                 print(f"  - 총 {total}건")
 
             items = _as_items_list(body)
+            emit_event("page", len(items))
             if not items:
                 page += 1
                 time.sleep(0.35)
                 continue
 
-            for it in items:
-                if it.get("bsnsDivNm") and it.get("bsnsDivNm") != "물품":
-                    continue
-                title = it.get("bidNtceNm", "") or it.get("bidNm", "")
-                if not is_relevant_text(title,
-                                        _as_text(it.get("bsnsDivNm")),
-                                        _as_text(it.get("itemNm") or it.get("prdctNm")),
-                                        _as_text(it.get("dminsttNm") or it.get("dmndInsttNm"))):
-                    continue
-
-
-                client_code = it.get("dmndInsttCd") or it.get("dminsttCd")
-                client_name = it.get("dmndInsttNm") or it.get("dminsttNm") or "기관명 없음"
-                mall_addr = guess_mall_addr(it)
-
-                # 상세 URL
-                detail_link = it.get("bidNtceUrl")
-                if not detail_link:
-                    bid_no = it.get('bidNtceNo') or ''
-                    if bid_no:
-                        detail_link = f"http://www.g2b.go.kr/pt/menu/selectSubFrame.do?framesrc=/pt/bid/bidInfoList.do?taskClCd=1&bidno={bid_no}"
-
-                base = _build_base_notice(
-                    "입찰공고", "물품", title, client_name, it.get("dmndInsttOfclTel", "") or it.get("telNo",""),
-                    "공고 확인 필요", 0, it.get("asignBdgtAmt") or "", "확인필요",
-                    to_ymd(it.get("bidNtceDate") or it.get("ntceDt")), detail_link or ""
-                )
-                expand_and_store_with_priority(base, client_code, mall_addr, client_name)
-
+            _note_seen(items, "bidNtceDt", "bidNtceDate")
+            items = [it for it in items if not it.get("bsnsDivNm") or it.get("bsnsDivNm") == "물품"]
+            relevant += filter_relevant_items(items, ("bidNtceNm", "bidNm"), "bsnsDivNm",
+                                              ("itemNm", "prdctNm"), ("dminsttNm", "dmndInsttNm"))
             page += 1
             time.sleep(0.35)
         except Exception as e:
             session.rollback()
-            print(f"  [Error] 입찰공고 처리 오류: {e}")
+            emit_event("error", message=f"  [Error] 입찰공고 처리 오류: {e}")
             break
 
+    # 선별된 공고의 수요기관 주소를 한 번에 선조회한 뒤 후보 dict 생성
+    prefetch_institution_addresses(it.get("dmndInsttCd") or it.get("dminsttCd") for it in relevant)
+    for it in relevant:
+        title = it.get("bidNtceNm", "") or it.get("bidNm", "")
+
+
+        client_code = it.get("dmndInsttCd") or it.get("dminsttCd")
+        client_name = it.get("dmndInsttNm") or it.get("dminsttNm") or "기관명 없음"
+        mall_addr = guess_mall_addr(it)
+
+        # 상세 URL
+        detail_link = it.get("bidNtceUrl")
+        if not detail_link:
+            bid_no = it.get('bidNtceNo') or ''
+            if bid_no:
+                detail_link = f"http://www.g2b.go.kr/pt/menu/selectSubFrame.do?framesrc=/pt/bid/bidInfoList.do?taskClCd=1&bidno={bid_no}"
+
+        base = _build_base_notice(
+            "입찰공고", "물품", title, client_name, it.get("dmndInsttOfclTel", "") or it.get("telNo",""),
+            "공고 확인 필요", 0, it.get("asignBdgtAmt") or "", "확인필요",
+            to_ymd(it.get("bidNtceDate") or it.get("ntceDt")), detail_link or ""
+        )
+        n = finalize_notice_dict(base, client_code, mall_addr, client_name)
+        if n: buffer.append(n)
+
+    if buffer:
+        _log_bulk_saved(bulk_upsert_notices(buffer))
+    return buffer
+
 
 # --- 계약완료 ---
-def fetch_and_process_contracts(search_ymd: str):
+def fetch_and_process_contracts(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
     from datetime import datetime, timedelta
-    print(f"\n--- [{to_ymd(search_ymd)}] 계약완료(나라장터) 수집 ---")
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 계약완료(나라장터) 수집 ---")
 
-    start_dt = f"{search_ymd}0000"
-    end_dt = f"{search_ymd}2359"
+    start_dt, end_dt = _api_dt_range(search_ymd, end_ymd)
 
     # 1) 총건수 1회 조회
     first = http_get_json(api_url(CNTRCT_LIST_PATH), {
@@ -3063,7 +3716,7 @@ def fetch_and_process_contracts(search_ymd: str):
     body = _as_dict(first.get("response", {}).get("body"))
     total = int(body.get("totalCount", 0))
     if total == 0:
-        print("  - 데이터 없음"); return
+        print("  - 데이터 없음"); return []
 
     page_size   = 100
     total_pages = (total + page_size - 1) // page_size
@@ -3079,50 +3732,52 @@ def fetch_and_process_contracts(search_ymd: str):
 
     pages = fetch_pages_parallel(api_url(CNTRCT_LIST_PATH), params_list)
 
-    # 3) 페이지 결과 처리 (벌크업서트용 버퍼)
-    buffer = []
+    # 3) 페이지 결과 선별 → 수요기관 주소 일괄 선조회 → 처리 (벌크업서트용 버퍼)
+    items = []
     for data in pages:
-        items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
-        for it in items:
-            title = it.get("cntrctNm", "") or it.get("contNm","")
-            if not is_relevant_text(title,
-                                    _as_text(it.get("bsnsDivNm")),
-                                    _as_text(it.get("itemNm") or it.get("prdctNm")),
-                                    _as_text(it.get("dminsttNm") or it.get("dmndInsttNm"))):
-                continue
-
-            dm_cd = it.get("dminsttCd") or it.get("dmndInsttCd")
-            cn_cd = it.get("cntrctInsttCd") or it.get("insttCd")
-            client_code = dm_cd or cn_cd
-            client_name = it.get("dminsttNm") or it.get("dmndInsttNm") or it.get("cntrctInsttNm") or it.get("insttNm") or "기관명 없음"
-            mall_addr = guess_mall_addr(it)
-
-            detail_link = it.get("cntrctDtlInfoUrl") or ""
-            if not detail_link:
-                unty_cntrct_no = it.get('untyCntrctNo')
-                if unty_cntrct_no:
-                    detail_link = f"https://www.g2b.go.kr:8067/contract/contDetail.jsp?Union_number={unty_cntrct_no}"
+        page_items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
+        _note_seen(page_items, "cntrctCnclsDate", "cntrctDate")
+        items += filter_relevant_items(page_items, ("cntrctNm", "contNm"), "bsnsDivNm",
+                                       ("itemNm", "prdctNm"), ("dminsttNm", "dmndInsttNm"))
+    prefetch_institution_addresses(
+        it.get("dminsttCd") or it.get("dmndInsttCd") or it.get("cntrctInsttCd") or it.get("insttCd")
+        for it in items
+    )
 
-            base = _build_base_notice(
-                "계약완료", "물품", title, client_name,
-                it.get("cntrctInsttOfclTelNo", "") or it.get("telNo", ""),
-                "계약 확인 필요", 0,
-                it.get("cntrctAmt") or it.get("totAmt") or "",
-                "확인필요",
-                to_ymd(it.get("cntrctCnclsDate") or it.get("cntrctDate") or it.get("contDate")),
-                detail_link
-            )
-            # 주소/관할 결정은 expand_and_store_with_priority에서 진행
-            # → 벌크업서트를 위해 즉시 DB쓰지 말고 notice dict 자체를 모읍니다.
-            # expand_and_store_with_priority 내부가 즉시 upsert/commit 구조라면,
-            # '저장' 대신 '확정된 n dict'를 반환하도록 얇게 래핑해 버퍼에 추가하는 방식 권장
-            n = finalize_notice_dict(base, client_code, mall_addr, client_name)  # 아래 B에서 제공
-            if n: buffer.append(n)
+    buffer = []
+    for it in items:
+        title = it.get("cntrctNm", "") or it.get("contNm","")
+
+        dm_cd = it.get("dminsttCd") or it.get("dmndInsttCd")
+        cn_cd = it.get("cntrctInsttCd") or it.get("insttCd")
+        client_code = dm_cd or cn_cd
+        client_name = it.get("dminsttNm") or it.get("dmndInsttNm") or it.get("cntrctInsttNm") or it.get("insttNm") or "기관명 없음"
+        mall_addr = guess_mall_addr(it)
+
+        detail_link = it.get("cntrctDtlInfoUrl") or ""
+        if not detail_link:
+            unty_cntrct_no = it.get('untyCntrctNo')
+            if unty_cntrct_no:
+                detail_link = f"https://www.g2b.go.kr:8067/contract/contDetail.jsp?Union_number={unty_cntrct_no}"
+
+        base = _build_base_notice(
+            "계약완료", "물품", title, client_name,
+            it.get("cntrctInsttOfclTelNo", "") or it.get("telNo", ""),
+            "계약 확인 필요", 0,
+            it.get("cntrctAmt") or it.get("totAmt") or "",
+            "확인필요",
+            to_ymd(it.get("cntrctCnclsDate") or it.get("cntrctDate") or it.get("contDate")),
+            detail_link
+        )
+        # 주소/관할 결정은 expand_and_store_with_priority에서 진행
+        # → 벌크업서트를 위해 즉시 DB쓰지 말고 notice dict 자체를 모읍니다.
+        n = finalize_notice_dict(base, client_code, mall_addr, client_name)  # 아래 B에서 제공
+        if n: buffer.append(n)
 
     # 4) 벌크 업서트
     if buffer:
-        bulk_upsert_notices(buffer)
-        print(f"  [✅ 일괄 저장] {len(buffer)}건")
+        _log_bulk_saved(bulk_upsert_notices(buffer))
+    return buffer
 
 
 
@@ -3142,27 +3797,37 @@ def _fetch_dlvr_detail(req_no: str):
         body = _as_dict(data.get("response", {}).get("body"))
         return _as_items_list(body)
     except Exception as e:
-        print(f"  [Error] 납품요구 상세 실패({req_no}): {e}")
+        emit_event("error", message=f"  [Error] 납품요구 상세 실패({req_no}): {e}")
         return []
 
 def _fetch_dlvr_detail_with_key(req_no: str):
     return req_no, _fetch_dlvr_detail(req_no)
 
-def fetch_and_process_delivery_requests(search_ymd: str):
-    print(f"\n--- [{to_ymd(search_ymd)}] 납품요구(나라장터) 수집 ---")
+def _dlvr_model_name(product: dict) -> str:
+    """납품요구 상세 품목에서 모델명 추출"""
+    model_name = product.get("modelNm")
+    if not model_name:
+        name_all = product.get("prdctIdntNoNm", "")
+        if name_all:
+            parts = [p.strip() for p in name_all.split(",")]
+            model_name = parts[2] if len(parts) >= 3 else name_all
+    return model_name or "모델명 없음"
+
+def fetch_and_process_delivery_requests(search_ymd: str, end_ymd: Optional[str] = None) -> List[dict]:
+    end_ymd = end_ymd or search_ymd
+    print(f"\n--- [{_range_label(search_ymd, end_ymd)}] 납품요구(나라장터) 수집 ---")
     buffer = []
-    CHUNK = 200  # 벌크 단위
 
     # 1) 총건수 1회
     first = http_get_json(api_url(DLVR_LIST_PATH), {
         "ServiceKey": _cfg("NARA_SERVICE_KEY"), "type": "json",
         "pageNo": "1", "numOfRows": "1",
-        "inqryDiv": "1", "inqryBgnDate": search_ymd, "inqryEndDate": search_ymd
+        "inqryDiv": "1", "inqryBgnDate": search_ymd, "inqryEndDate": end_ymd
     })
     body = _as_dict(first.get("response", {}).get("body"))
     total = int(body.get("totalCount", 0))
     if total == 0:
-        print("  - 데이터 없음"); return
+        print("  - 데이터 없음"); return []
 
     page_size   = 100
     total_pages = (total + page_size - 1) // page_size
@@ -3173,69 +3838,58 @@ def fetch_and_process_delivery_requests(search_ymd: str):
     params_list = [{
         "ServiceKey": _cfg("NARA_SERVICE_KEY"), "type": "json",
         "pageNo": str(p), "numOfRows": str(page_size),
-        "inqryDiv": "1", "inqryBgnDate": search_ymd, "inqryEndDate": search_ymd
+        "inqryDiv": "1", "inqryBgnDate": search_ymd, "inqryEndDate": end_ymd
     } for p in range(1, total_pages + 1)]
     pages = fetch_pages_parallel(api_url(DLVR_LIST_PATH), params_list)
 
     # 3) 각 페이지에서 req_no 수집 + 상세 병렬
     meta_by_req: Dict[str, Dict] = {}
     tasks = []
-    with ThreadPoolExecutor(max_workers=12) as ex:
-        for data in pages:
-            items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
-            for it in items:
-                req_nm = it.get("reqstNm") or it.get("dlvrReqNm") or ""
-                if not is_relevant_text(req_nm):
-                    continue
-                req_no = it.get("dlvrReqNo") or it.get("reqstNo") or ""
-                if not req_no:
-                    continue
+    for data in pages:
+        items = _as_items_list(_as_dict(data.get("response", {}).get("body")))
+        _note_seen(items, "rcptDate", "dlvrReqRcptDate")
+        for it in filter_relevant_items(items, ("reqstNm", "dlvrReqNm")):
+            req_nm = it.get("reqstNm") or it.get("dlvrReqNm") or ""
+            req_no = it.get("dlvrReqNo") or it.get("reqstNo") or ""
+            if not req_no:
+                continue
 
-                dminstt_raw = it.get("dminsttInfo") or it.get("dmndInsttInfo") or ""
-                dm_cd, dm_nm = parse_dminstt_code_from_complex(dminstt_raw)
-                meta_by_req[req_no] = {
-                    "req_nm": req_nm,
-                    "client_code": dm_cd,
-                    "client_name": dm_nm or it.get("dmndInsttNm") or it.get("dminsttNm") or "기관명 없음",
-                    "mall_addr": guess_mall_addr(it),
-                    "tel": it.get("cntrctDeptTelNo") or it.get("telNo") or "",
-                    "rcpt": to_ymd(it.get("rcptDate") or it.get("dlvrReqRcptDate")),
-                    "hdr_qty": _to_int(it.get("dlvrReqQty") or it.get("reqQty") or it.get("totQty")),
-                    "hdr_amt": _to_int(it.get("dlvrReqAmt")),
-                }
-                tasks.append(ex.submit(_fetch_dlvr_detail_with_key, req_no))
+            dminstt_raw = it.get("dminsttInfo") or it.get("dmndInsttInfo") or ""
+            dm_cd, dm_nm = parse_dminstt_code_from_complex(dminstt_raw)
+            meta_by_req[req_no] = {
+                "req_nm": req_nm,
+                "client_code": dm_cd,
+                "client_name": dm_nm or it.get("dmndInsttNm") or it.get("dminsttNm") or "기관명 없음",
+                "mall_addr": guess_mall_addr(it),
+                "tel": it.get("cntrctDeptTelNo") or it.get("telNo") or "",
+                "rcpt": to_ymd(it.get("rcptDate") or it.get("dlvrReqRcptDate")),
+                "hdr_qty": _to_int(it.get("dlvrReqQty") or it.get("reqQty") or it.get("totQty")),
+                "hdr_amt": _to_int(it.get("dlvrReqAmt")),
+            }
+            # 상세 조회도 공용 풀/호스트 제한기를 사용
+            tasks.append(_IO_POOL.submit(_in_stage_ctx(_fetch_dlvr_detail_with_key), req_no))
 
-    # 4) 상세 결과 받아서 저장(아니고: 후보 dict 수집)
+    # 4) 상세 결과 수집 → 대상 품목의 모델명을 모아 KEA 인증 일괄 판정
+    details = []
     for fut in as_completed(tasks):
         req_no, products = fut.result()
         meta = meta_by_req.get(req_no)
         if not meta:
             continue
+        rows = [(p, _dlvr_model_name(p)) for p in (products or [])
+                if is_relevant_text(meta["req_nm"], p.get("prdctNm") or "")]
+        details.append((req_no, meta, products, rows))
 
+    cert_by_model = resolve_certifications(m for *_, rows in details for _, m in rows)
+    prefetch_institution_addresses(meta["client_code"] for _, meta, *_ in details)
+
+    # 5) 후보 dict 수집
+    for req_no, meta, products, rows in details:
         if products:
             num_items = len(products)
-            for product in products:
-                prdct_nm = product.get("prdctNm") or ""
-                if not is_relevant_text(meta["req_nm"], prdct_nm):
-                    continue
-
-                # 모델명 추출
-                model_name = product.get("modelNm")
-                if not model_name:
-                    name_all = product.get("prdctIdntNoNm", "")
-                    if name_all:
-                        parts = [p.strip() for p in name_all.split(",")]
-                        model_name = parts[2] if len(parts) >= 3 else name_all
-                model_name = model_name or "모델명 없음"
-
-                # 1) KEA API + 유사도 기반 인증 판정
-                certification_status = kea_cert_with_similarity(model_name)
-
-                # 2) 기본적으로 API 응답이 불확실하면 보수적으로 다시 체크
-                if certification_status == "확인필요":
-                    tmp = kea_check_certification(model_name)
-                    if tmp != "확인필요":
-                        certification_status = tmp
+            for product, model_name in rows:
+                # KEA API + 유사도 기반 인증 판정 (캐시/일괄 조회 결과)
+                certification_status = cert_by_model.get(model_name, "확인필요")
 
                 # 수량/금액
                 qty = (
@@ -3261,7 +3915,7 @@ def fetch_and_process_delivery_requests(search_ymd: str):
                     certification_status, meta["rcpt"], f"dlvrreq:{req_no}"
                 )
                 n = expand_and_store_with_priority(
-                    base, meta["client_code"], meta["mall_addr"], meta["client_name"], save=False
+                    base, meta["client_code"], meta["mall_addr"], meta["client_name"]
                 )
                 if n: buffer.append(n)
         else:
@@ -3273,18 +3927,14 @@ def fetch_and_process_delivery_requests(search_ymd: str):
                 "확인필요", meta["rcpt"], f"dlvrreq:{req_no}"
             )
             n = expand_and_store_with_priority(
-                base, meta["client_code"], meta["mall_addr"], meta["client_name"], save=False
+                base, meta["client_code"], meta["mall_addr"], meta["client_name"]
             )
             if n: buffer.append(n)
 
-        # 주기적 벌크 저장
-        if len(buffer) >= CHUNK:
-            bulk_upsert_notices(buffer); buffer.clear()
-
-    # 남은 것 마무리
+    # 일괄 저장 (UPSERT_CHUNK_SIZE 단위 커밋)
     if buffer:
-        print(f"  [✅ 일괄 저장] {len(buffer)}건")
-        bulk_upsert_notices(buffer)
+        _log_bulk_saved(bulk_upsert_notices(buffer))
+    return buffer
 
 
 def resolve_address_from_bjd(addr_text, bjd_code) -> str:
@@ -3346,69 +3996,466 @@ def resolve_address_from_bjd(addr_text, bjd_code) -> str:
 # =========================
 # [GUI 연동] 구성
 # =========================
-# === 맨 위/설정 영역 어딘가에 추가 ===
-SKIP_STAGES = {
-    "order_plan": True,     # 나라장터 발주계획 스킵
-    "kapt_private": True,   # K-APT 수의계약 스킵
+# 수집 단계 실행 계획 (선언형)
+# max_days: API 1회 호출로 조회할 최대 일수 (월 경계에서도 분할, None=분할 없음)
+# hourly: 조회 구간을 시·분(YYYYMMDDHHMM)까지 받는 API → 증분 수집 시 마지막 수집 시각 이후만 조회
+# enabled: 기본 실행 여부 (SYNC_ENABLED_STAGES / SYNC_DISABLED_STAGES 설정이 우선)
+# deps: 같은 실행 안에서 먼저 끝나야 하는 단계 (실행 대상이 아닌 단계는 무시)
+#   - contract ← bid_notice: 수요기관 주소(UsrInfo) 캐시를 입찰공고가 먼저 채움 → 같은 기관 중복 조회 방지
+#   - kapt_result/kapt_private ← kapt_bid: 단지 기본정보(kapt_basic) 캐시 공유
+#   - 납품요구의 KEA 인증 판정은 단계 안에서 상세 조회 후 일괄 실행 (별도 단계 아님)
+# max_concurrency: 이 단계의 구간(chunk) 동시 실행 수 (전체 상한은 STAGE_MAX_PARALLEL)
+# api_budget: 이 단계가 동시에 보낼 수 있는 API 요청 수 (호스트 제한기 안에서 단계 간 몫을 나눔)
+STAGE_PLAN = {
+    "order_plan": {"name": "발주계획(나라장터)", "func": fetch_and_process_order_plans, "max_days": 31, "hourly": True,
+                   "enabled": False, "deps": [], "max_concurrency": 2, "api_budget": 4},
+    "bid_notice": {"name": "입찰공고(나라장터)", "func": fetch_and_process_bid_notices, "max_days": 31, "hourly": True,
+                   "enabled": True, "deps": [], "max_concurrency": 2, "api_budget": 4},
+    "contract":   {"name": "계약완료(나라장터)", "func": fetch_and_process_contracts, "max_days": 31, "hourly": True,
+                   "enabled": True, "deps": ["bid_notice"], "max_concurrency": 2, "api_budget": 4},
+    "delivery":   {"name": "납품요구(나라장터)", "func": fetch_and_process_delivery_requests, "max_days": 31,
+                   "enabled": True, "deps": [], "max_concurrency": 2, "api_budget": 6},
+    "kapt_bid":   {"name": "입찰공고(K-APT)", "func": fetch_and_process_kapt_bids, "max_days": 31,
+                   "enabled": True, "deps": [], "max_concurrency": 1, "api_budget": 3},
+    "kapt_result":{"name": "입찰결과(K-APT)", "func": fetch_and_process_kapt_bid_results, "max_days": 31,
+                   "enabled": True, "deps": ["kapt_bid"], "max_concurrency": 1, "api_budget": 3},
+    "kapt_private":{"name":"수의계약(K-APT)", "func": fetch_and_process_kapt_private_contracts, "max_days": None,
+                   "enabled": False, "deps": ["kapt_bid"], "max_concurrency": 1, "api_budget": 2},
 }
 
-# === STAGES_CONFIG 정의 바로 아래를 이처럼 바꿔주세요 ===
-STAGES_CONFIG = {
-    "order_plan": {"name": "발주계획(나라장터)", "func": fetch_and_process_order_plans},
-    "bid_notice": {"name": "입찰공고(나라장터)", "func": fetch_and_process_bid_notices},
-    "contract":   {"name": "계약완료(나라장터)", "func": fetch_and_process_contracts},
-    "delivery":   {"name": "납품요구(나라장터)", "func": fetch_and_process_delivery_requests},
-    "kapt_bid":   {"name": "입찰공고(K-APT)", "func": fetch_and_process_kapt_bids},
-    "kapt_result":{"name": "입찰결과(K-APT)", "func": fetch_and_process_kapt_bid_results},
-    "kapt_private":{"name":"수의계약(K-APT)", "func": fetch_and_process_kapt_private_contracts},
-}
 
-# ↓↓↓ 추가: 실행 대상에서 스킵값(True)인 키 제거
-STAGES_CONFIG = {
-    k: v for k, v in STAGES_CONFIG.items()
-    if not SKIP_STAGES.get(k, False)
-}
+def _cfg_stage_keys(key: str) -> Optional[set]:
+    """설정값(쉼표 구분 문자열 또는 목록) → 단계 키 집합, 미설정이면 None"""
+    v = _cfg(key)
+    if not v:
+        return None
+    if isinstance(v, str):
+        v = v.split(",")
+    return {str(k).strip() for k in v if str(k).strip()}
 
 
-def fetch_data_for_stage(search_date: str, stage_config: dict):
+def _check_stage_deps(plan: Dict[str, dict]):
+    """의존 단계 이름/순환 검사 (순환이 있으면 실행 시 서로 기다리며 멈춤)"""
+    state = {}
+
+    def _visit(key, path):
+        if state.get(key) == "done":
+            return
+        if state.get(key) == "visiting":
+            raise ValueError(f"STAGE_PLAN 의존 순환: {' → '.join(path + [key])}")
+        state[key] = "visiting"
+        for dep in plan[key].get("deps") or ():
+            if dep not in plan:
+                raise ValueError(f"STAGE_PLAN[{key}]: 알 수 없는 의존 단계 {dep}")
+            _visit(dep, path + [key])
+        state[key] = "done"
+
+    for key in plan:
+        _visit(key, [])
+
+
+def _build_stages_config(plan: Dict[str, dict]) -> Dict[str, dict]:
     """
-    gui_app.py의 SyncWorker에서 호출할 진입점.
+    실행 계획 + 설정 → 실행 대상 단계
+    - SYNC_ENABLED_STAGES가 있으면 그 단계만, 없으면 enabled 기본값에서 SYNC_DISABLED_STAGES 제외
+    - STAGE_OVERRIDES = {단계: {max_concurrency/api_budget/deps/max_days: 값}} 으로 단계별 조정
     """
-    if "func" in stage_config and isinstance(stage_config["func"], Callable):
-        stage_func = stage_config["func"]
-        stage_func(search_date)
-    else:
+    overrides = dict(_cfg("STAGE_OVERRIDES", {}) or {})
+    plan = {k: {**v, **dict(overrides.get(k) or {})} for k, v in plan.items()}
+    _check_stage_deps(plan)
+    only, off = _cfg_stage_keys("SYNC_ENABLED_STAGES"), _cfg_stage_keys("SYNC_DISABLED_STAGES") or set()
+    return {
+        k: v for k, v in plan.items()
+        if (k in only if only is not None else v.get("enabled", True)) and k not in off
+    }
+
+
+STAGES_CONFIG = _build_stages_config(STAGE_PLAN)
+
+
+def fetch_data_for_range(start_ymd: str, end_ymd: str, stage_config: dict) -> Counter:
+    """
+    기간 단위 수집 진입점.
+    - 단계별 max_days 구간으로 나눠 수집 함수를 (start, end)로 호출
+    - 반환: 저장된 공고의 notice_date(YYYY-MM-DD)별 건수 → 일자별 진행 표시용
+    """
+    if not ("func" in stage_config and isinstance(stage_config["func"], Callable)):
         raise ValueError(f"Invalid stage_config: 'func' not found or not callable for {stage_config.get('name')}")
+    stage_func = stage_config["func"]
+
+    by_day = Counter()
+    max_days = stage_config.get("max_days", 31)
+    # 시각이 붙은 구간(증분 수집)은 plan_range_tasks에서 이미 분할된 1구간
+    chunks = [(start_ymd, end_ymd)] if max(len(start_ymd), len(end_ymd)) > 8 else _range_chunks(start_ymd, end_ymd, max_days)
+    for s, e in chunks:
+        for n in (stage_func(s, e) or []):
+            by_day[n.get("notice_date") or ""] += 1
+    return by_day
+
+
+def fetch_data_for_stage(search_date: str, stage_config: dict):
+    """
+    gui_app.py의 SyncWorker에서 호출할 진입점. (하루 단위)
+    """
+    return fetch_data_for_range(search_date, search_date, stage_config)
+
+
+# =========================
+# 비동기 수집 엔진 (단계 × 날짜 동시 실행)
+# =========================
+def _run_stage_in_thread(start_ymd: str, end_ymd: str, key: str, stage_config: dict,
+                         budget=None, meter: Optional[_StageMeter] = None,
+                         on_event: Optional[Callable] = None) -> Tuple[Counter, Optional[datetime]]:
+    """
+    작업 스레드에서 단계 1개(구간 1개) 실행 후 해당 스레드의 DB 세션 정리 → (일자별 건수, 본 항목 최신 시각)
+    - budget/meter: 이 구간의 API 요청에 적용할 단계 예산 / 호출 계측
+    - on_event: 수집 이벤트 sink(stage, kind, count, message) — 여러 스레드에서 호출됨
+    """
+    _STAGE_SEEN.latest = None
+    tokens = [(v, v.set(x)) for v, x in (
+        (_STAGE_BUDGET, budget), (_STAGE_METER, meter), (_EVENT_SINK, on_event), (_EVENT_STAGE, key),
+    )]
+    label = f"[{_range_label(start_ymd, end_ymd)}] {stage_config.get('name', key)}"
+    t0 = time.perf_counter()
+    try:
+        emit_event("stage_start", message=f"▶ {label} 시작")
+        by_day = fetch_data_for_range(start_ymd, end_ymd, stage_config)
+        saved = sum(by_day.values())
+        emit_event("stage_done", saved, f"✔ {label} 완료 ({saved}건, {time.perf_counter() - t0:.1f}초)")
+        return by_day, _STAGE_SEEN.latest
+    except Exception as e:
+        emit_event("stage_error", message=f"❌ {label} 오류 : {type(e).__name__}: {e}")
+        raise
+    finally:
+        for v, tok in reversed(tokens):
+            v.reset(tok)
+        session.remove()
+
+
+async def _run_stage_async(start_ymd: str, end_ymd: str, key: str, stage_config: dict, sem: asyncio.Semaphore,
+                           budget=None, on_event=None) -> dict:
+    async with sem:
+        t0 = time.perf_counter()
+        error, by_day, last_seen, meter = None, Counter(), None, _StageMeter()
+        try:
+            by_day, last_seen = await asyncio.to_thread(
+                _run_stage_in_thread, start_ymd, end_ymd, key, stage_config, budget, meter, on_event
+            )
+        except Exception as e:
+            error = e
+        t1 = time.perf_counter()
+        return {
+            "date": start_ymd,
+            "end": end_ymd,
+            "by_day": by_day,
+            "last_seen": last_seen,
+            "stage": key,
+            "name": stage_config.get("name", key),
+            "ok": error is None,
+            "error": f"{type(error).__name__}: {error}" if error else None,
+            "elapsed": t1 - t0,
+            "t_start": t0,
+            "t_end": t1,
+            "api_calls": meter.calls,
+            "api_sec": meter.api_sec,
+        }
+
+
+def plan_range_tasks(start_ymd: str, end_ymd: str, stages: Optional[Dict[str, dict]] = None) -> List[tuple]:
+    """
+    기간 수집 작업 목록: 단계별 max_days 구간 × 단계 → [(start, end, key, cfg), ...]
+    - start/end는 YYYYMMDD 또는 YYYYMMDDHHMM. 시각은 hourly 단계의 첫/마지막 구간 경계에만 적용
+    """
+    stages = STAGES_CONFIG if stages is None else stages
+    tasks = []
+    for key, cfg in stages.items():
+        chunks = list(_range_chunks(start_ymd[:8], end_ymd[:8], cfg.get("max_days", 31)))
+        if cfg.get("hourly") and chunks:
+            if len(start_ymd) == 12:
+                chunks[0] = (start_ymd, chunks[0][1])
+            if len(end_ymd) == 12:
+                chunks[-1] = (chunks[-1][0], end_ymd)
+        tasks += [(s, e, key, cfg) for s, e in chunks]
+    return tasks
+
+
+def plan_window_tasks(windows: Dict[str, Tuple[str, str]], stages: Optional[Dict[str, dict]] = None) -> List[tuple]:
+    """단계별로 다른 구간 {key: (start, end)} → 작업 목록 (증분 수집용)"""
+    stages = STAGES_CONFIG if stages is None else stages
+    return [
+        t for key, (s, e) in windows.items() if key in stages
+        for t in plan_range_tasks(s, e, {key: stages[key]})
+    ]
+
+
+async def _run_tasks_async(tasks_spec, max_parallel: int, on_done, on_event=None) -> List[dict]:
+    """
+    실행 계획(STAGE_PLAN) 기반 실행기
+    - 의존 단계(deps)가 있는 단계는 같은 실행 안의 의존 단계 구간이 모두 끝난 뒤 시작 (실패해도 순서만 보장)
+    - 의존 관계가 없는 단계끼리는 STAGE_MAX_PARALLEL 안에서 동시에 실행
+    - 단계별 max_concurrency(구간 동시 실행 수) / api_budget(동시 API 요청 수) 적용
+    - on_event가 있으면 수집 이벤트(단계 시작/페이지/선별/저장/오류)를 전달 (emit_event 참고)
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max(max_parallel, 1), thread_name_prefix="eers-stage"))
+
+    sem = asyncio.Semaphore(max(max_parallel, 1))
+    stage_cfg = {key: cfg for _, _, key, cfg in tasks_spec}
+    remaining = Counter(key for _, _, key, _ in tasks_spec)
+    finished = {key: asyncio.Event() for key in stage_cfg}
+    stage_sem = {
+        key: asyncio.Semaphore(max(int(cfg.get("max_concurrency") or max_parallel), 1))
+        for key, cfg in stage_cfg.items()
+    }
+    budgets = {
+        key: threading.BoundedSemaphore(int(cfg["api_budget"])) if cfg.get("api_budget") else None
+        for key, cfg in stage_cfg.items()
+    }
+
+    async def _task(s, e, key, cfg):
+        try:
+            for dep in cfg.get("deps") or ():
+                if dep in finished and dep != key:
+                    await finished[dep].wait()
+            async with stage_sem[key]:
+                return await _run_stage_async(s, e, key, cfg, sem, budgets[key], on_event)
+        finally:
+            remaining[key] -= 1
+            if remaining[key] <= 0:
+                finished[key].set()
+
+    days = set()
+    token = _STAT_DAYS.set(days)
+    try:
+        tasks = [asyncio.create_task(_task(s, e, key, cfg)) for s, e, key, cfg in tasks_spec]
+        results = []
+        for fut in asyncio.as_completed(tasks):
+            res = await fut
+            results.append(res)
+            if on_done:
+                on_done(res)
+    finally:
+        _STAT_DAYS.reset(token)
+        await asyncio.to_thread(_refresh_run_days, days)
+    return results
+
+
+def _refresh_run_days(days: set):
+    """실행 중 저장된 일자의 집계를 한 번에 재계산 (실패해도 수집 결과는 유지, --rebuild-stats로 복구)"""
+    if not days:
+        return
+    t0 = time.perf_counter()
+    try:
+        with engine.begin() as conn:
+            refresh_days(conn, days)
+        _debug(f"[집계] {len(days)}일 재계산 ({time.perf_counter() - t0:.1f}초)")
+    except Exception as e:
+        emit_event("error", message=f"[집계] 일별 집계 재계산 실패 ({len(days)}일): {e}")
+
+
+def stage_timing_report(results: List[dict]) -> List[dict]:
+    """
+    실행 결과 → 단계별 소요 요약 (시작 순)
+    - start_sec: 실행 시작 후 첫 구간 시작까지 (의존 단계/동시 실행 대기 포함)
+    - wall_sec: 첫 구간 시작 ~ 마지막 구간 종료 / busy_sec: 구간 실행 시간 합
+    - api_sec: API 응답 대기 누적 (busy_sec 대비 비중이 낮으면 DB 저장/가공이 병목)
+    """
+    if not results:
+        return []
+    t0 = min(r["t_start"] for r in results)
+    out: Dict[str, dict] = {}
+    for r in results:
+        d = out.setdefault(r["stage"], {
+            "stage": r["stage"], "name": r["name"], "chunks": 0, "failed": 0, "saved": 0,
+            "start_sec": r["t_start"] - t0, "end_sec": 0.0, "busy_sec": 0.0, "api_calls": 0, "api_sec": 0.0,
+        })
+        d["chunks"] += 1
+        d["failed"] += 0 if r["ok"] else 1
+        d["saved"] += sum(r["by_day"].values())
+        d["start_sec"] = min(d["start_sec"], r["t_start"] - t0)
+        d["end_sec"] = max(d["end_sec"], r["t_end"] - t0)
+        d["busy_sec"] += r["elapsed"]
+        d["api_calls"] += r.get("api_calls", 0)
+        d["api_sec"] += r.get("api_sec", 0.0)
+    report = sorted(out.values(), key=lambda d: d["start_sec"])
+    for d in report:
+        d["wall_sec"] = d["end_sec"] - d["start_sec"]
+        for k in ("start_sec", "end_sec", "busy_sec", "api_sec", "wall_sec"):
+            d[k] = round(d[k], 2)
+    return report
+
+
+def format_stage_report(report: List[dict]) -> List[str]:
+    """stage_timing_report → 로그용 문자열"""
+    lines = []
+    for d in report:
+        fail = f", 오류 {d['failed']}" if d["failed"] else ""
+        lines.append(
+            f"⏱ {d['name']}: +{d['start_sec']:.1f}s 시작 · {d['wall_sec']:.1f}s 소요 "
+            f"(구간 {d['chunks']}{fail} · 저장 {d['saved']}건 · API {d['api_calls']}회/{d['api_sec']:.1f}s)"
+        )
+    return lines
+
+
+async def run_stages_async(
+    dates: List[str],
+    stages: Optional[Dict[str, dict]] = None,
+    *,
+    max_parallel: int = STAGE_MAX_PARALLEL,
+    on_done: Optional[Callable[[dict], None]] = None,
+) -> List[dict]:
+    """
+    (날짜 × 단계) 작업을 하나의 이벤트 루프에서 동시에 실행합니다.
+    - 동시 실행 단계 수는 max_parallel로 제한
+    - HTTP는 모두 공용 SESSION + 호스트 제한기(_limited_get)를 거치므로 쿼터 초과 없음
+    - on_done(result)는 이벤트 루프 스레드(호출 스레드)에서 호출됨 → UI 갱신 가능
+    """
+    stages = STAGES_CONFIG if stages is None else stages
+    spec = [(d, d, key, cfg) for d in dates for key, cfg in stages.items()]
+    return await _run_tasks_async(spec, max_parallel, on_done)
+
+
+async def run_range_async(
+    start_ymd: str,
+    end_ymd: str,
+    stages: Optional[Dict[str, dict]] = None,
+    *,
+    max_parallel: int = STAGE_MAX_PARALLEL,
+    on_done: Optional[Callable[[dict], None]] = None,
+    bulk_load: bool = False,
+) -> List[dict]:
+    """
+    기간 전체를 단계별 허용 구간으로 묶어 동시 실행 (결과의 by_day로 일자별 집계)
+    - bulk_load=True: 저장을 COPY 스테이징 경로로 (장기간 백필용)
+    """
+    BULK_LOAD_MODE.set(bulk_load)
+    spec = plan_range_tasks(start_ymd, end_ymd, stages)
+    return await _run_tasks_async(spec, max_parallel, on_done)
+
+
+async def run_tasks_async(
+    spec: List[tuple],
+    *,
+    max_parallel: int = STAGE_MAX_PARALLEL,
+    on_done: Optional[Callable[[dict], None]] = None,
+    on_event: Optional[Callable[[Optional[str], str, int, Optional[str]], None]] = None,
+    bulk_load: bool = False,
+) -> List[dict]:
+    """plan_range_tasks/plan_window_tasks로 만든 작업 목록 실행"""
+    BULK_LOAD_MODE.set(bulk_load)
+    return await _run_tasks_async(spec, max_parallel, on_done, on_event)
+
+
+def run_tasks(spec: List[tuple], **kwargs) -> List[dict]:
+    """run_tasks_async 동기 진입점 (워커에서 호출)"""
+    return asyncio.run(run_tasks_async(spec, **kwargs))
+
+
+def run_stages(dates: List[str], stages: Optional[Dict[str, dict]] = None, **kwargs) -> List[dict]:
+    """run_stages_async 동기 진입점 (Streamlit/스케줄러에서 호출)"""
+    return asyncio.run(run_stages_async(dates, stages, **kwargs))
+
+
+def run_range(start_ymd: str, end_ymd: str, stages: Optional[Dict[str, dict]] = None, **kwargs) -> List[dict]:
+    """run_range_async 동기 진입점"""
+    return asyncio.run(run_range_async(start_ymd, end_ymd, stages, **kwargs))
 
 def get_db_session():
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    return Session()
 
 
-def recheck_all_certifications():
-    session = get_db_session()
-    notices = session.query(Notice).all()
+RECHECK_BATCH_SIZE = int(_cfg("RECHECK_BATCH_SIZE", 2000) or 2000)
 
-    for n in notices:
-        model = n.model or n.model_name or ""
-        if not model:
-            n.is_certified = "확인필요"
-            continue
-        
-        # 유사도 + KEA API 인증 확인
-        cert = kea_cert_with_similarity(model)
 
-        # 보수적 2차 체크
-        if cert == "확인필요":
-            tmp = kea_check_certification(model)
-            if tmp != "확인필요":
-                cert = tmp
+def recheck_all_certifications(
+    *,
+    batch_size: int = RECHECK_BATCH_SIZE,
+    resume: bool = True,
+    use_cache: bool = True,
+    job_name: str = "recheck_certifications",
+):
+    """
+    전체 공고 인증여부 재검사 (배치/재개 가능)
+    - id 기준 keyset 페이지로 batch_size씩 읽음 (전체 테이블을 메모리에 올리지 않음)
+    - 정규화 모델명 단위로 중복 제거 → resolve_certifications로 병렬 판정
+    - 변경분만 UPDATE ... FROM (VALUES ...) 로 일괄 반영, 배치마다 체크포인트 커밋
+    - 중단 후 다시 실행하면 마지막 체크포인트 다음 id부터 이어서 진행
+    - use_cache=False면 KEA 캐시를 무시하고 모두 재조회 (결과는 캐시에 갱신)
+    """
+    from sqlalchemy import select, func
+
+    s = Session()
+    try:
+        last_id, processed = _checkpoint_get(s, job_name) if resume else (0, 0)
+        remaining = s.execute(select(func.count(Notice.id)).where(Notice.id > last_id)).scalar() or 0
+        total = processed + remaining
+        if last_id:
+            print(f"[인증 재검사] 체크포인트에서 재개: id>{last_id} (처리 {processed}/{total})")
+        else:
+            print(f"[인증 재검사] 시작: 총 {total}건")
+
+        known: Dict[str, str] = {}   # 정규화 모델명 → 판정 (작업 내 중복 조회 방지)
+        updated, t0, done = 0, time.perf_counter(), 0
+        while True:
+            rows = s.execute(
+                select(Notice.id, Notice.model_name, Notice.is_certified)
+                .where(Notice.id > last_id)
+                .order_by(Notice.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            new_models = {_normalize_model(r.model_name) for r in rows} - known.keys()
+            known.update(resolve_certifications(new_models, use_cache=use_cache))
+
+            changes = []
+            for r in rows:
+                m = _normalize_model(r.model_name)
+                cert = known.get(m, "확인필요")
+                # 실제 모델명인데 판정 실패(API 오류)면 기존 값을 덮어쓰지 않음
+                if cert == "확인필요" and m and m not in KEA_SKIP_MODELS:
+                    continue
+                if cert != r.is_certified:
+                    changes.append({"id": r.id, "is_certified": cert})
+
+            updated += bulk_update_from_values(s, Notice.__tablename__, "id", ["is_certified"], changes)
+            if changes:
+                # 같은 트랜잭션으로 무효화 이벤트 발행 → 모든 프로세스의 조회 캐시에서 해당 공고 제거
+                publish_cache_event(s.connection(), "notices", ids=[c["id"] for c in changes])
+            last_id = rows[-1].id
+            processed += len(rows)
+            done += len(rows)
+            _checkpoint_set(s, job_name, last_id, processed)
+            s.commit()
+
+            elapsed = time.perf_counter() - t0
+            pct = processed * 100 // total if total else 100
+            print(f"  [인증 재검사] {processed}/{total} ({pct}%) · 변경 {updated}건 · "
+                  f"모델 {len(known)}종 · {done / elapsed if elapsed else 0:.0f}건/초")
+
+        _checkpoint_clear(s, job_name)
+        s.commit()
+        print(f"모든 기존 데이터의 인증 여부 업데이트 완료! (변경 {updated}건, {time.perf_counter() - t0:.1f}초)")
+    except Exception:
+        s.rollback()
+        raise
+    finally:
+        s.close()
+
 
-        n.is_certified = cert
+def rebuild_daily_stats():
+    """notice_daily_stats 전체 재생성 (관리 명령: python collect_data.py --rebuild-stats)"""
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        refresh_daily_stats(conn)
+    print(f"[집계] notice_daily_stats 재생성 완료 ({time.perf_counter() - t0:.1f}초)")
 
-    session.commit()
-    print("모든 기존 데이터의 인증 여부 업데이트 완료!")
 
+if __name__ == "__main__" and "--rebuild-stats" in sys.argv:
+    init_db()
+    rebuild_daily_stats()
+    sys.exit(0)
 
 if __name__ == "__main__":
     print("="*50)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 import os
 import re
-from datetime import datetime
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
 from contextlib import contextmanager
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Boolean, UniqueConstraint,
-    DateTime, text
+    create_engine, event, Column, Integer, BigInteger, String, Boolean, UniqueConstraint,
+    Date, DateTime, Text, ForeignKey, Index, PrimaryKeyConstraint, text
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 
@@ -36,18 +40,66 @@ class Notice(Base):
     amount          = Column(String)
     is_certified    = Column(String)
     notice_date     = Column(String)
+    notice_day      = Column(Date)        # notice_date의 DATE 형 (기간 조회/정렬/인덱스용)
     detail_link     = Column(String, nullable=False)
     assigned_office = Column(String, default="관할지사확인요망")
     status          = Column(String, default="")
     memo            = Column(String, default="")
     source_system   = Column(String, default="G2B", nullable=False)
     kapt_code       = Column(String)
+    # 키워드 검색용 (사업명+기관명+모델명 소문자, 저장 시 build_search_text()로 계산, pg_trgm GIN 인덱스)
+    search_text     = Column(Text)
+    # 관할불명/복수관할 여부 (저장 시 is_unknown_office()로 계산 → 조회 시 LIKE 대신 사용)
+    is_unknown_office = Column(Boolean, default=False, nullable=False, server_default=text("false"))
 
     __table_args__ = (
         UniqueConstraint(
             "source_system", "detail_link", "model_name", "assigned_office",
             name="uq_notice_unique"
         ),
+        Index("ix_notices_day_source", "notice_day", "source_system"),
+        Index("ix_notices_day_id", "notice_day", "id"),   # 키셋 페이징 (notice_day DESC, id DESC)
+        Index("ix_notices_search_trgm", "search_text",
+              postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}),
+    )
+
+
+class NoticeOffice(Base):
+    """
+    공고 ↔ 사업소 (assigned_office를 '/'로 나눈 정규화 테이블)
+    - 사업소 필터를 LIKE 4종 대신 (office, notice_day) 인덱스 범위 검색으로 처리
+    - 공고 저장(upsert) 시 sync_notice_offices()로 함께 갱신
+    """
+    __tablename__ = "notice_offices"
+
+    notice_id   = Column(Integer, ForeignKey("notices.id", ondelete="CASCADE"), nullable=False)
+    office      = Column(String, nullable=False)
+    notice_day  = Column(Date)                      # notices.notice_day 복사본 (인덱스용)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("notice_id", "office", name="pk_notice_offices"),
+        Index("ix_notice_offices_office_day", "office", "notice_day"),
+    )
+
+
+class NoticeDailyStat(Base):
+    """
+    일자 × 사업소 × 출처 × 단계별 공고 건수 (신규 배지/현황 달력용 집계)
+    - 사업소별 행은 notice_offices 기준 (복수관할 공고는 각 사업소에 1건씩)
+    - office='전체' 행은 공고 기준 건수
+    - 수집 upsert 시 해당 일자만 refresh_daily_stats()로 재계산 (수집 실행 중에는 실행이 끝날 때 한 번)
+    """
+    __tablename__ = "notice_daily_stats"
+
+    notice_day    = Column(Date, nullable=False)
+    office        = Column(String, nullable=False)
+    source_system = Column(String, nullable=False)
+    stage         = Column(String, nullable=False, default="")
+    count         = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("notice_day", "office", "source_system", "stage", name="pk_notice_daily_stats"),
+        Index("ix_notice_daily_stats_office_day", "office", "notice_day"),
     )
 
 
@@ -81,6 +133,119 @@ class MailHistory(Base):
     preview_html = Column(String, default="")
 
 
+class ApiResponseCache(Base):
+    """외부 API 응답 캐시 (엔드포인트 + 키 단위, 빈 응답도 저장)"""
+    __tablename__ = "api_response_cache"
+
+    endpoint   = Column(String, primary_key=True)
+    cache_key  = Column(String, primary_key=True)
+    payload    = Column(Text)                       # JSON 문자열 (빈 응답이면 NULL)
+    is_empty   = Column(Boolean, default=False, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class InstitutionAddress(Base):
+    """수요기관 코드 → 주소 (UsrInfo 조회 결과, 갱신 주기는 fetched_at 기준)"""
+    __tablename__ = "institution_addresses"
+
+    dminstt_code = Column(String, primary_key=True)
+    address      = Column(Text)                       # 조회됐지만 주소가 없으면 NULL
+    fetched_at   = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CacheEvent(Base):
+    """
+    조회 캐시 무효화 이벤트 (모든 Streamlit 프로세스/워커가 id 순으로 읽어 반영)
+    - kind: 'notices'(notice_ids 포함 항목), 'days'(day_from~day_to와 겹치는 항목), 'all'
+    """
+    __tablename__ = "cache_events"
+
+    id         = Column(Integer, primary_key=True)
+    kind       = Column(String, nullable=False)
+    notice_ids = Column(ARRAY(Integer))
+    day_from   = Column(Date)
+    day_to     = Column(Date)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SyncJob(Base):
+    """
+    수집 작업 큐 (worker.py가 FOR UPDATE SKIP LOCKED로 1건씩 가져가 실행)
+    - status: queued → running → done / failed
+    - progress: {"by_day": {일자: 건수}, "live": {단계: 누적 건수/속도}, "stage_report": [...]}
+      — UI가 주기적으로 읽어 진행률 표시 (로그는 sync_events)
+    - heartbeat_at이 오래된 running 작업은 워커가 죽은 것으로 보고 다시 queued
+    """
+    __tablename__ = "sync_jobs"
+
+    id           = Column(Integer, primary_key=True)
+    kind         = Column(String, nullable=False, default="range")
+    params       = Column(JSONB)
+    status       = Column(String, nullable=False, default="queued")
+    requested_by = Column(String)
+    total_steps  = Column(Integer, default=0, nullable=False)
+    done_steps   = Column(Integer, default=0, nullable=False)
+    progress     = Column(JSONB)
+    error        = Column(Text)
+    worker       = Column(String)
+    attempts     = Column(Integer, default=0, nullable=False)
+    created_at   = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at   = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at  = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_sync_jobs_status_id", "status", "id"),
+    )
+
+
+class SyncEvent(Base):
+    """
+    수집 진행 이벤트 (워커가 몇 초마다 묶어서 기록 → 화면은 마지막으로 본 id 이후만 읽음)
+    - kind: stage_start / stage_done / stage_error / saved / throughput / error / report
+    - 페이지 조회·선별 같은 고빈도 이벤트는 기록하지 않고 sync_jobs.progress의 누적 건수로만 반영
+    """
+    __tablename__ = "sync_events"
+
+    id         = Column(BigInteger, primary_key=True)
+    job_id     = Column(Integer, nullable=False)
+    stage      = Column(String)
+    kind       = Column(String, nullable=False)
+    count      = Column(Integer, default=0, nullable=False)
+    message    = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_sync_events_job_id_id", "job_id", "id"),
+    )
+
+
+class SyncState(Base):
+    """
+    수집 단계별 동기화 상태 (시각은 KST 기준 naive datetime)
+    - stage: STAGES_CONFIG 키 / SCHEDULER_STATE_KEY는 스케줄러 자체(마지막으로 처리한 정기 실행 시각)
+    """
+    __tablename__ = "sync_state"
+
+    stage           = Column(String, primary_key=True)
+    last_success_at = Column(DateTime)      # 마지막으로 오류 없이 끝난 수집의 시작 시각
+    last_window_at  = Column(DateTime)      # (스케줄러) 마지막으로 작업을 등록한 정기 실행 시각
+    hwm_at          = Column(DateTime)      # 빈틈 없이 조회를 마친 구간의 끝 (증분 수집은 여기부터)
+    last_item_at    = Column(DateTime)      # 조회된 항목의 최신 등록 시각 (bidNtceDt/rcptDate/bidRegDate 등)
+    last_error      = Column(Text)
+    updated_at      = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class JobCheckpoint(Base):
+    """장시간 배치 작업 재개 지점 (작업명 단위)"""
+    __tablename__ = "job_checkpoints"
+
+    job_name   = Column(String, primary_key=True)
+    last_id    = Column(Integer, default=0, nullable=False)   # 마지막으로 처리한 PK
+    processed  = Column(Integer, default=0, nullable=False)   # 누적 처리 건수
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 # =========================================================
 # DB URL 로딩
 # =========================================================
@@ -88,24 +253,684 @@ DATABASE_URL = os.getenv("SUPABASE_DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("SUPABASE_DATABASE_URL 환경변수 누락됨")
 
+# Supabase 트랜잭션 풀러(pgbouncer, 기본 포트 6543) 사용 여부
+#  - URL의 pgbouncer=true는 드라이버가 모르는 옵션이라 제거하고 플래그로만 사용
+PGBOUNCER_MODE = (
+    bool(re.search(r"[?&]pgbouncer=true", DATABASE_URL))
+    or bool(re.search(r":6543(/|$)", DATABASE_URL))
+    or os.getenv("DB_PGBOUNCER", "").lower() in ("1", "true", "yes")
+)
 DATABASE_URL = re.sub(r"[?&]pgbouncer=true", "", DATABASE_URL)
 
+# 세션 단위 기능(스케줄러 리더 advisory lock)용 직결 URL — 트랜잭션 풀러로는 세션 락이 유지되지 않음
+DIRECT_DATABASE_URL = os.getenv("SUPABASE_DIRECT_URL") or DATABASE_URL
+
 
 # =========================================================
 # Engine & Session 생성
 # =========================================================
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"sslmode": "require"},
-    pool_size=5,
-    max_overflow=0,
-)
+# 역할별 풀 기본값 (UI: Streamlit 세션 공용 / collector: 수집기·스케줄러)
+#  - 환경변수 DB_<ROLE>_POOL_SIZE 등이 있으면 역할별 값, 없으면 DB_POOL_SIZE 등 공통 값 사용
+POOL_DEFAULTS = {
+    "ui":        {"pool_size": 5, "max_overflow": 5},
+    "collector": {"pool_size": 3, "max_overflow": 2},
+}
+
+
+def _env(role: str, key: str, default, cast=int):
+    raw = os.getenv(f"DB_{role.upper()}_{key.upper()}", os.getenv(f"DB_{key.upper()}"))
+    if raw is None or raw == "":
+        return default
+    if cast is bool:
+        return raw.lower() in ("1", "true", "yes")
+    return cast(raw)
+
+
+# 풀 체크아웃 지표 (역할별)
+POOL_METRICS: dict = {}
+
+
+def _attach_pool_metrics(eng, role: str):
+    m = POOL_METRICS.setdefault(role, {
+        "connects": 0, "checkouts": 0, "checkins": 0, "invalidated": 0,
+        "max_checked_out": 0, "checkout_ms_total": 0.0, "checkout_ms_max": 0.0,
+    })
+    lock = threading.Lock()
+
+    # 체크아웃 대기 시간 = pool.connect() 진입 ~ checkout 이벤트
+    orig_connect = eng.pool.connect
+
+    def _timed_connect():
+        t0 = time.perf_counter()
+        conn = orig_connect()
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            m["checkout_ms_total"] += ms
+            m["checkout_ms_max"] = max(m["checkout_ms_max"], ms)
+        return conn
+
+    eng.pool.connect = _timed_connect
+
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_conn, rec):
+        with lock:
+            m["connects"] += 1
+
+    @event.listens_for(eng, "checkout")
+    def _on_checkout(dbapi_conn, rec, proxy):
+        with lock:
+            m["checkouts"] += 1
+            m["max_checked_out"] = max(m["max_checked_out"], eng.pool.checkedout())
+
+    @event.listens_for(eng, "checkin")
+    def _on_checkin(dbapi_conn, rec):
+        with lock:
+            m["checkins"] += 1
+
+    @event.listens_for(eng, "invalidate")
+    def _on_invalidate(dbapi_conn, rec, exc):
+        with lock:
+            m["invalidated"] += 1
+
+
+def make_engine(role: str = "ui", url: str | None = None):
+    """
+    역할별 독립 풀을 가진 엔진 생성
+    - pool_size / max_overflow / pool_recycle(초) / pool_timeout(초) / pool_pre_ping 설정 가능
+    - PGBOUNCER_MODE: 트랜잭션 풀링 호환 (서버측 prepared statement·세션 상태에 의존하지 않음)
+    """
+    d = POOL_DEFAULTS.get(role, POOL_DEFAULTS["ui"])
+    url = url or DATABASE_URL
+    kw = dict(
+        connect_args={"sslmode": "require"},
+        pool_size=_env(role, "pool_size", d["pool_size"]),
+        max_overflow=_env(role, "max_overflow", d["max_overflow"]),
+        pool_recycle=_env(role, "pool_recycle", 1800),
+        pool_timeout=_env(role, "pool_timeout", 30),
+        pool_pre_ping=_env(role, "pool_pre_ping", True, cast=bool),
+    )
+    if PGBOUNCER_MODE:
+        # 연결을 다른 클라이언트와 공유하므로 세션 단위 설정/준비문은 사용 불가
+        #  - psycopg2: 서버측 prepared statement를 쓰지 않음 (그대로 사용)
+        #  - pg8000: 이름 있는 prepared statement를 캐시 → 트랜잭션 풀러와 충돌
+        if url.startswith("postgresql+pg8000"):
+            print("[DB] ⚠ pgbouncer 트랜잭션 모드에서는 psycopg2 드라이버를 사용하세요 (pg8000은 prepared statement 사용)")
+        #  - startup 파라미터(options=-c ...)도 pgbouncer가 거부하므로 connect_args에 넣지 않음
+    eng = create_engine(url, **kw)
+    _attach_pool_metrics(eng, role)
+    return eng
+
+
+def pool_metrics() -> dict:
+    """역할별 풀 현황 + 누적 체크아웃 지표"""
+    out = {}
+    for role, eng in (("ui", engine), ("collector", collector_engine)):
+        p = eng.pool
+        m = dict(POOL_METRICS.get(role, {}))
+        if m.get("checkouts"):
+            m["checkout_ms_avg"] = round(m["checkout_ms_total"] / m["checkouts"], 2)
+        m.update({
+            "size": p.size(), "checked_out": p.checkedout(),
+            "checked_in": p.checkedin(), "overflow": p.overflow(),
+        })
+        out[role] = m
+    return out
+
+
+engine = make_engine("ui")
+collector_engine = make_engine("collector")
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+CollectorSession = sessionmaker(bind=collector_engine)
 
 
-# 테이블 생성
-Base.metadata.create_all(bind=engine)
+# =========================================================
+# 공고일자 DATE 컬럼 (notice_day)
+# =========================================================
+def parse_notice_day(val) -> date | None:
+    """'YYYY-MM-DD...' / 'YYYYMMDD...' / date → date (해석 불가면 None)"""
+    if isinstance(val, datetime):
+        return val.date()
+    if isinstance(val, date):
+        return val
+    s = str(val or "").strip()
+    try:
+        if len(s) >= 10 and s[4] == "-" and s[7] == "-":
+            return date.fromisoformat(s[:10])
+        if len(s) >= 8 and s[:8].isdigit():
+            return datetime.strptime(s[:8], "%Y%m%d").date()
+    except ValueError:
+        pass
+    return None
+
+
+def _migrate_notice_day(bind):
+    """
+    notices.notice_day 추가 시 1회 백필 + 인덱스
+    - 고유 notice_date 문자열만 Python에서 해석해 한 문장으로 반영 (잘못된 값은 NULL 유지)
+    - 이전 구조(notice_date 문자열 복사본)의 notice_offices는 파생 테이블이므로 재생성
+    """
+    with bind.begin() as conn:
+        cols = {
+            (r[0], r[1]) for r in conn.execute(text("""
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_name IN ('notices', 'notice_offices')
+            """))
+        }
+        if ("notices", "notice_day") not in cols:
+            conn.execute(text("ALTER TABLE notices ADD COLUMN IF NOT EXISTS notice_day DATE"))
+            raw = [r[0] for r in conn.execute(text(
+                "SELECT DISTINCT notice_date FROM notices WHERE notice_date IS NOT NULL AND notice_date <> ''"
+            ))]
+            parsed = {k: parse_notice_day(k) for k in raw}
+            parsed = {k: d for k, d in parsed.items() if d}
+            if parsed:
+                conn.execute(
+                    text("""
+                    UPDATE notices n SET notice_day = v.d
+                    FROM (SELECT unnest(CAST(:ks AS TEXT[])) AS k, unnest(CAST(:ds AS DATE[])) AS d) v
+                    WHERE n.notice_date = v.k
+                    """),
+                    {"ks": list(parsed.keys()), "ds": list(parsed.values())}
+                )
+        conn.execute(text("DROP INDEX IF EXISTS ix_notices_date_source"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notices_day_source ON notices (notice_day, source_system)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notices_day_id ON notices (notice_day, id)"
+        ))
+
+        if ("notice_offices", "notice_date") in cols:
+            conn.execute(text("DROP TABLE notice_offices"))
+            NoticeOffice.__table__.create(conn)
+
+
+# =========================================================
+# 키워드 검색 (search_text + pg_trgm)
+# =========================================================
+SEARCH_TEXT_COLS = ("project_name", "client", "model_name")
+
+
+def build_search_text(*parts) -> str:
+    """검색 대상 컬럼을 이어 붙인 소문자 문자열 (SQL 백필과 같은 규칙)"""
+    return " ".join(str(p) for p in parts if p).lower()
+
+
+def _ensure_extensions(bind):
+    # ix_notices_search_trgm(gin_trgm_ops)이 create_all보다 먼저 필요
+    with bind.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+def _migrate_search_text(bind):
+    """notices.search_text 추가 시 1회 백필 + 트라이그램 GIN 인덱스"""
+    with bind.begin() as conn:
+        added = conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'notices' AND column_name = 'search_text'
+        """)).first() is None
+        if added:
+            conn.execute(text("ALTER TABLE notices ADD COLUMN IF NOT EXISTS search_text TEXT"))
+            conn.execute(text(
+                f"UPDATE notices SET search_text = lower(concat_ws(' ', {', '.join(SEARCH_TEXT_COLS)}))"
+            ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_notices_search_trgm ON notices USING gin (search_text gin_trgm_ops)"
+        ))
+
+
+# =========================================================
+# 사업소 정규화 (notice_offices / is_unknown_office)
+# =========================================================
+# 관할 미확정으로 보는 표기 (조회 화면/메일의 '관할불명 제외'와 동일 기준)
+UNKNOWN_OFFICE_MARKERS = ("불명", "미확인", "확인", "미정", "unknown")
+
+
+def is_unknown_office(office) -> bool:
+    """복수관할('/') 또는 미확정 표기면 True"""
+    s = (office or "").strip().lower()
+    return not s or "/" in s or any(m in s for m in UNKNOWN_OFFICE_MARKERS)
+
+
+def sync_notice_offices(conn, ids=None, defer_days: set | None = None):
+    """
+    notices.assigned_office → notice_offices 재작성 + 관련 일자의 notice_daily_stats 재계산 (커밋은 호출측)
+    - ids가 있으면 해당 공고만, 없으면 전체 (초기 백필)
+    - defer_days가 있으면 집계 재계산/캐시 이벤트 대신 관련 일자만 모음 → 호출측이 refresh_days()로 한 번에
+      (동시 실행 단계들이 청크마다 같은 일자 집계 행을 잠그고 기다리는 것 방지)
+    """
+    cond, params = "", {}
+    if ids is not None:
+        params["ids"] = [int(i) for i in ids]
+        if not params["ids"]:
+            return
+        cond = "AND n.id = ANY(:ids)"
+
+    # 삭제/삽입 양쪽의 일자를 모아 집계 갱신 (공고일자가 바뀐 경우 이전 일자도 포함)
+    old_days = conn.execute(
+        text("DELETE FROM notice_offices" + (" WHERE notice_id = ANY(:ids)" if cond else "")
+             + " RETURNING notice_day"),
+        params
+    ).scalars().all()
+    new_days = conn.execute(
+        text(f"""
+        INSERT INTO notice_offices(notice_id, office, notice_day)
+        SELECT DISTINCT n.id, btrim(o.office), n.notice_day
+        FROM notices n
+        CROSS JOIN LATERAL unnest(string_to_array(n.assigned_office, '/')) AS o(office)
+        WHERE btrim(o.office) <> '' {cond}
+        RETURNING notice_day
+        """),
+        params
+    ).scalars().all()
+
+    if cond:
+        new_days += conn.execute(
+            text("SELECT DISTINCT notice_day FROM notices WHERE id = ANY(:ids)"), params
+        ).scalars().all()
+        days = {d for d in set(old_days) | set(new_days) if d}
+        if defer_days is not None:
+            defer_days.update(days)     # set.update 1회 호출 → 여러 스레드에서 불러도 안전 (GIL)
+        else:
+            refresh_days(conn, days)
+    else:
+        refresh_daily_stats(conn)
+        publish_cache_event(conn, "all")
+
+
+# =========================================================
+# 조회 캐시 무효화 이벤트 (cache_events)
+# =========================================================
+CACHE_EVENT_KEEP_HOURS = 24     # 이보다 오래된 이벤트는 발행 시 정리
+
+
+def publish_cache_event(conn, kind: str, *, ids=None, day_from=None, day_to=None):
+    """
+    무효화 이벤트 기록 (커밋은 호출측 — 데이터 변경과 같은 트랜잭션이면 커밋 시점에 함께 보임)
+    - kind='notices': ids / 'days': day_from~day_to / 'all'
+    """
+    new_id = conn.execute(
+        text("""
+        INSERT INTO cache_events(kind, notice_ids, day_from, day_to, created_at)
+        VALUES (:k, :ids, :df, :dt, :ts) RETURNING id
+        """),
+        {
+            "k": kind,
+            "ids": [int(i) for i in ids] if ids else None,
+            "df": day_from,
+            "dt": day_to,
+            "ts": datetime.utcnow(),
+        }
+    ).scalar()
+    if new_id and new_id % 200 == 0:
+        conn.execute(
+            text("DELETE FROM cache_events WHERE created_at < :cutoff"),
+            {"cutoff": datetime.utcnow() - timedelta(hours=CACHE_EVENT_KEEP_HOURS)}
+        )
+
+
+def read_cache_events(conn, after_id: int):
+    """after_id 이후 이벤트 [(id, kind, notice_ids, day_from, day_to)]"""
+    return conn.execute(
+        text("""
+        SELECT id, kind, notice_ids, day_from, day_to FROM cache_events
+        WHERE id > :a ORDER BY id
+        """),
+        {"a": int(after_id)}
+    ).fetchall()
+
+
+# =========================================================
+# 수집 작업 큐 (sync_jobs)
+# =========================================================
+SYNC_JOB_STALE_MINUTES = 10     # 하트비트가 이보다 오래된 running 작업은 재대기
+SYNC_JOB_MAX_ATTEMPTS = 3       # 재대기 횟수 한도 (넘으면 failed)
+SYNC_JOB_ACTIVE = ("queued", "running")
+
+
+def enqueue_sync_job(conn, kind: str, params: dict, requested_by: str | None = None) -> int:
+    """
+    작업 등록 (커밋은 호출측). 같은 작업이 이미 대기/실행 중이면 그 id 반환 (중복 클릭 방지)
+    """
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    existing = conn.execute(
+        text("""
+        SELECT id FROM sync_jobs
+        WHERE kind = :k AND params = CAST(:p AS JSONB) AND status IN ('queued', 'running')
+        ORDER BY id LIMIT 1
+        """),
+        {"k": kind, "p": payload}
+    ).scalar()
+    if existing:
+        return existing
+    return conn.execute(
+        text("""
+        INSERT INTO sync_jobs(kind, params, status, requested_by, total_steps, done_steps, attempts, created_at)
+        VALUES (:k, CAST(:p AS JSONB), 'queued', :by, 0, 0, 0, :ts) RETURNING id
+        """),
+        {"k": kind, "p": payload, "by": requested_by, "ts": datetime.utcnow()}
+    ).scalar()
+
+
+def claim_sync_job(conn, worker: str):
+    """
+    가장 오래된 queued 작업 1건을 running으로 바꿔 반환 (없으면 None)
+    - SKIP LOCKED: 여러 워커가 동시에 가져가도 같은 작업을 두 번 잡지 않음
+    """
+    now = datetime.utcnow()
+    return conn.execute(
+        text("""
+        UPDATE sync_jobs SET status = 'running', worker = :w, attempts = attempts + 1,
+               started_at = :ts, heartbeat_at = :ts, error = NULL
+        WHERE id = (
+            SELECT id FROM sync_jobs WHERE status = 'queued'
+            ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, kind, params, attempts
+        """),
+        {"w": worker, "ts": now}
+    ).mappings().first()
+
+
+def save_sync_job_progress(conn, job_id: int, done_steps: int, total_steps: int, progress: dict):
+    """진행 상황 기록 (하트비트 겸용)"""
+    conn.execute(
+        text("""
+        UPDATE sync_jobs SET done_steps = :d, total_steps = :t,
+               progress = CAST(:p AS JSONB), heartbeat_at = :ts
+        WHERE id = :id
+        """),
+        {"id": job_id, "d": done_steps, "t": total_steps,
+         "p": json.dumps(progress, ensure_ascii=False), "ts": datetime.utcnow()}
+    )
+
+
+def sync_job_heartbeat(conn, job_id: int):
+    conn.execute(
+        text("UPDATE sync_jobs SET heartbeat_at = :ts WHERE id = :id"),
+        {"id": job_id, "ts": datetime.utcnow()}
+    )
+
+
+def finish_sync_job(conn, job_id: int, ok: bool, error: str | None = None):
+    conn.execute(
+        text("""
+        UPDATE sync_jobs SET status = :s, error = :e, finished_at = :ts, heartbeat_at = :ts
+        WHERE id = :id
+        """),
+        {"id": job_id, "s": "done" if ok else "failed", "e": error, "ts": datetime.utcnow()}
+    )
+
+
+def requeue_stale_sync_jobs(conn) -> int:
+    """하트비트가 끊긴 running 작업 → queued (시도 한도 초과 시 failed). 반환: 처리 건수"""
+    return conn.execute(
+        text("""
+        UPDATE sync_jobs SET
+            status = CASE WHEN attempts >= :max THEN 'failed' ELSE 'queued' END,
+            error = '워커 응답 없음 (하트비트 중단)',
+            finished_at = CASE WHEN attempts >= :max THEN :now ELSE NULL END
+        WHERE id IN (
+            SELECT id FROM sync_jobs
+            WHERE status = 'running' AND heartbeat_at < :cutoff
+            FOR UPDATE SKIP LOCKED
+        )
+        """),
+        {
+            "max": SYNC_JOB_MAX_ATTEMPTS,
+            "now": datetime.utcnow(),
+            "cutoff": datetime.utcnow() - timedelta(minutes=SYNC_JOB_STALE_MINUTES),
+        }
+    ).rowcount or 0
+
+
+def recent_sync_jobs(conn, limit: int = 10):
+    """최근 작업 목록 (최신순, dict 리스트)"""
+    return [
+        dict(r) for r in conn.execute(
+            text("""
+            SELECT id, kind, params, status, requested_by, total_steps, done_steps, progress,
+                   error, worker, attempts, created_at, started_at, heartbeat_at, finished_at
+            FROM sync_jobs ORDER BY id DESC LIMIT :n
+            """),
+            {"n": int(limit)}
+        ).mappings()
+    ]
+
+
+# =========================================================
+# 수집 진행 이벤트 (sync_events)
+# =========================================================
+SYNC_EVENT_KEEP_DAYS = 7        # 작업 종료 시 이보다 오래된 이벤트 정리
+
+
+def write_sync_events(conn, job_id: int, events) -> None:
+    """
+    이벤트 일괄 기록 (커밋은 호출측). events: [(stage, kind, count, message, at), ...]
+    - 작업당 기록 스레드가 1개라 같은 작업 안에서는 id 순서 = 커밋 순서
+    """
+    if not events:
+        return
+    conn.execute(
+        text("""
+        INSERT INTO sync_events(job_id, stage, kind, count, message, created_at)
+        VALUES (:j, :s, :k, :c, :m, :ts)
+        """),
+        [{"j": job_id, "s": st, "k": kind, "c": int(cnt or 0), "m": msg, "ts": at}
+         for st, kind, cnt, msg, at in events]
+    )
+
+
+def read_sync_events(conn, job_id: int, after_id: int = 0, limit: int = 500):
+    """after_id 이후 이벤트 (id 순, dict 리스트) — 화면은 마지막 id만 기억해 이어서 조회"""
+    return [
+        dict(r) for r in conn.execute(
+            text("""
+            SELECT id, stage, kind, count, message, created_at FROM sync_events
+            WHERE job_id = :j AND id > :a ORDER BY id LIMIT :n
+            """),
+            {"j": job_id, "a": int(after_id), "n": int(limit)}
+        ).mappings()
+    ]
+
+
+def prune_sync_events(conn) -> int:
+    return conn.execute(
+        text("DELETE FROM sync_events WHERE created_at < :cutoff"),
+        {"cutoff": datetime.utcnow() - timedelta(days=SYNC_EVENT_KEEP_DAYS)}
+    ).rowcount or 0
+
+
+# =========================================================
+# 동기화 상태 (sync_state)
+# =========================================================
+SCHEDULER_STATE_KEY = "__scheduler__"
+SCHEDULER_LOCK_KEY = 0x45455253     # pg_advisory_lock 키 ('EERS')
+
+
+def get_sync_state(conn) -> dict:
+    """{stage: {last_success_at, last_window_at, last_error, updated_at}}"""
+    return {
+        r["stage"]: dict(r) for r in conn.execute(
+            text("""
+            SELECT stage, last_success_at, last_window_at, hwm_at, last_item_at, last_error, updated_at
+            FROM sync_state
+            """)
+        ).mappings()
+    }
+
+
+def mark_stages_success(conn, stages, at: datetime):
+    """단계별 마지막 성공 시각 기록 (더 이른 시각으로 되돌리지 않음)"""
+    stages = list(stages)
+    if not stages:
+        return
+    conn.execute(
+        text("""
+        INSERT INTO sync_state(stage, last_success_at, updated_at)
+        SELECT s, :at, :now FROM unnest(CAST(:stages AS TEXT[])) AS s
+        ON CONFLICT (stage) DO UPDATE SET
+            last_success_at = GREATEST(sync_state.last_success_at, EXCLUDED.last_success_at),
+            last_error = NULL,
+            updated_at = EXCLUDED.updated_at
+        """),
+        {"stages": stages, "at": at, "now": datetime.utcnow()}
+    )
+
+
+def mark_stage_error(conn, stage: str, error: str):
+    conn.execute(
+        text("""
+        INSERT INTO sync_state(stage, last_error, updated_at) VALUES (:s, :e, :now)
+        ON CONFLICT (stage) DO UPDATE SET last_error = EXCLUDED.last_error, updated_at = EXCLUDED.updated_at
+        """),
+        {"s": stage, "e": error, "now": datetime.utcnow()}
+    )
+
+
+def advance_stage_hwm(conn, stage: str, hwm_at: datetime, last_item_at: datetime | None = None):
+    """high-water mark 전진 (뒤로 가지 않음)"""
+    conn.execute(
+        text("""
+        INSERT INTO sync_state(stage, hwm_at, last_item_at, updated_at) VALUES (:s, :h, :li, :now)
+        ON CONFLICT (stage) DO UPDATE SET
+            hwm_at = GREATEST(sync_state.hwm_at, EXCLUDED.hwm_at),
+            last_item_at = GREATEST(sync_state.last_item_at, EXCLUDED.last_item_at),
+            updated_at = EXCLUDED.updated_at
+        """),
+        {"s": stage, "h": hwm_at, "li": last_item_at, "now": datetime.utcnow()}
+    )
+
+
+def _migrate_sync_state(bind):
+    """sync_state 증분 수집 컬럼 추가 (create_all은 기존 테이블에 컬럼을 추가하지 않음)"""
+    with bind.begin() as conn:
+        conn.execute(text("ALTER TABLE sync_state ADD COLUMN IF NOT EXISTS hwm_at TIMESTAMP"))
+        conn.execute(text("ALTER TABLE sync_state ADD COLUMN IF NOT EXISTS last_item_at TIMESTAMP"))
+
+
+def set_scheduler_window(conn, at: datetime):
+    conn.execute(
+        text("""
+        INSERT INTO sync_state(stage, last_window_at, updated_at) VALUES (:s, :at, :now)
+        ON CONFLICT (stage) DO UPDATE SET last_window_at = EXCLUDED.last_window_at, updated_at = EXCLUDED.updated_at
+        """),
+        {"s": SCHEDULER_STATE_KEY, "at": at, "now": datetime.utcnow()}
+    )
+
+
+def last_sync_at(conn):
+    """수집 단계 중 가장 최근 성공 시각 (없으면 None)"""
+    return conn.execute(
+        text("SELECT MAX(last_success_at) FROM sync_state WHERE stage <> :s"),
+        {"s": SCHEDULER_STATE_KEY}
+    ).scalar()
+
+
+# =========================================================
+# 일별 집계 (notice_daily_stats)
+# =========================================================
+ALL_OFFICES = "전체"
+
+
+def refresh_daily_stats(conn, days=None):
+    """
+    notice_daily_stats 재계산 (커밋은 호출측)
+    - days가 있으면 해당 일자만 (수집 시 증분), 없으면 전체 재생성
+    """
+    params = {"all": ALL_OFFICES}
+    o_cond = n_cond = ""
+    if days is not None:
+        params["days"] = sorted(d for d in set(days) if d)
+        if not params["days"]:
+            return
+        o_cond, n_cond = "AND o.notice_day = ANY(:days)", "AND n.notice_day = ANY(:days)"
+
+    conn.execute(
+        text("DELETE FROM notice_daily_stats" + (" WHERE notice_day = ANY(:days)" if o_cond else "")),
+        params
+    )
+    conn.execute(
+        text(f"""
+        INSERT INTO notice_daily_stats(notice_day, office, source_system, stage, count)
+        SELECT o.notice_day, o.office, n.source_system, COALESCE(n.stage, ''), count(*)
+        FROM notice_offices o JOIN notices n ON n.id = o.notice_id
+        WHERE o.notice_day IS NOT NULL {o_cond}
+        GROUP BY 1, 2, 3, 4
+        UNION ALL
+        SELECT n.notice_day, CAST(:all AS TEXT), n.source_system, COALESCE(n.stage, ''), count(*)
+        FROM notices n
+        WHERE n.notice_day IS NOT NULL {n_cond}
+        GROUP BY 1, 3, 4
+        ON CONFLICT (notice_day, office, source_system, stage) DO UPDATE SET count = EXCLUDED.count
+        """),
+        params
+    )
+
+
+def refresh_days(conn, days):
+    """해당 일자 집계 재계산 + 조회 캐시 무효화 이벤트 (커밋은 호출측)"""
+    days = sorted({d for d in days or () if d})
+    if not days:
+        return
+    refresh_daily_stats(conn, days)
+    publish_cache_event(conn, "days", day_from=days[0], day_to=days[-1])
+
+
+def _migrate_notice_offices(bind):
+    """
+    기존 DB 보강 (create_all은 기존 테이블에 컬럼/인덱스를 추가하지 않음)
+    - is_unknown_office 컬럼 추가 시 1회 백필
+    - notice_offices가 비어 있으면 1회 백필, notice_daily_stats가 비어 있으면 1회 생성
+    """
+    with bind.begin() as conn:
+        added = conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'notices' AND column_name = 'is_unknown_office'
+        """)).first() is None
+        conn.execute(text(
+            "ALTER TABLE notices ADD COLUMN IF NOT EXISTS is_unknown_office BOOLEAN NOT NULL DEFAULT FALSE"
+        ))
+        if added:
+            conn.execute(
+                text("""
+                UPDATE notices SET is_unknown_office = (
+                    COALESCE(btrim(assigned_office), '') = ''
+                    OR assigned_office LIKE '%/%'
+                    OR lower(assigned_office) LIKE ANY(:pats)
+                )
+                """),
+                {"pats": [f"%{m}%" for m in UNKNOWN_OFFICE_MARKERS]}
+            )
+        empty = conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM notice_offices)")).scalar()
+        if empty:
+            sync_notice_offices(conn)       # 일별 집계도 함께 전체 생성
+        elif conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM notice_daily_stats)")).scalar():
+            refresh_daily_stats(conn)
+
+
+# =========================================================
+# 스키마 생성/보강 (import 시 자동 실행하지 않음 → 진입점에서 init_db() 호출)
+# =========================================================
+_init_lock = threading.Lock()
+_init_done = False
+
+
+def init_db(bind=None):
+    """테이블 생성 + 마이그레이션 (프로세스당 1회, 여러 번 호출해도 안전)"""
+    global _init_done
+    with _init_lock:
+        if _init_done:
+            return
+        bind = bind or collector_engine
+        _ensure_extensions(bind)
+        Base.metadata.create_all(bind=bind)
+        _migrate_notice_day(bind)
+        _migrate_notice_offices(bind)
+        _migrate_search_text(bind)
+        _migrate_sync_state(bind)
+        _init_done = True
 
 
 # =========================================================
@@ -119,16 +944,14 @@ def get_db_session():
 # KEA 캐시 관련 함수
 # =========================================================
 def _ensure_kea_cache_table(session):
-    try:
-        session.execute(text("SELECT 1 FROM kea_model_cache LIMIT 1"))
-    except Exception:
-        session.execute(text("""
-            CREATE TABLE IF NOT EXISTS kea_model_cache (
-                model_name  TEXT PRIMARY KEY,
-                exists_flag INTEGER NOT NULL,
-                checked_at  TEXT NOT NULL
-            )
-        """))
+    # SELECT 실패로 확인하면 Postgres 트랜잭션이 abort 상태가 되므로 IF NOT EXISTS로 바로 생성
+    session.execute(text("""
+        CREATE TABLE IF NOT EXISTS kea_model_cache (
+            model_name  TEXT PRIMARY KEY,
+            exists_flag INTEGER NOT NULL,
+            checked_at  TEXT NOT NULL
+        )
+    """))
 
 
 def _kea_cache_get(session, model: str):
@@ -160,3 +983,174 @@ def _kea_cache_set(session, model: str, flag: int):
             "ts": datetime.utcnow().isoformat(timespec="seconds")
         }
     )
+
+
+def _kea_cache_get_many(session, models, max_age_days: float | None = None) -> dict:
+    """
+    여러 모델을 한 번에 조회 → {model_name: exists_flag}
+    - max_age_days가 있으면 그보다 오래된 항목은 제외(재조회 대상)
+    """
+    models = [m for m in set(models or []) if m]
+    if not models:
+        return {}
+    _ensure_kea_cache_table(session)
+
+    sql = "SELECT model_name, exists_flag FROM kea_model_cache WHERE model_name = ANY(:ms)"
+    params = {"ms": models}
+    if max_age_days:
+        # checked_at은 UTC ISO 문자열이라 문자열 비교로 기간 판정 가능
+        sql += " AND checked_at >= :cutoff"
+        params["cutoff"] = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+
+    rows = session.execute(text(sql), params).fetchall()
+    return {r[0]: int(r[1]) for r in rows}
+
+
+def _kea_cache_set_many(session, flags: dict):
+    """{model_name: exists_flag} 일괄 저장 (executemany)"""
+    if not flags:
+        return
+    _ensure_kea_cache_table(session)
+    ts = datetime.utcnow().isoformat(timespec="seconds")
+    session.execute(
+        text("""
+        INSERT INTO kea_model_cache(model_name, exists_flag, checked_at)
+        VALUES (:m, :f, :ts)
+        ON CONFLICT(model_name) DO UPDATE SET
+            exists_flag = excluded.exists_flag,
+            checked_at  = excluded.checked_at
+        """),
+        [{"m": m, "f": int(f), "ts": ts} for m, f in flags.items()]
+    )
+
+
+# =========================================================
+# API 응답 캐시 관련 함수
+# =========================================================
+def _api_cache_get(conn, endpoint: str, key: str):
+    """(payload, is_empty, fetched_at) 또는 None"""
+    if not key:
+        return None
+    row = conn.execute(
+        text("""
+        SELECT payload, is_empty, fetched_at FROM api_response_cache
+        WHERE endpoint = :e AND cache_key = :k
+        """),
+        {"e": endpoint, "k": key}
+    ).fetchone()
+    return (row[0], bool(row[1]), row[2]) if row else None
+
+
+def _api_cache_set(conn, endpoint: str, key: str, payload, is_empty: bool):
+    conn.execute(
+        text("""
+        INSERT INTO api_response_cache(endpoint, cache_key, payload, is_empty, fetched_at)
+        VALUES (:e, :k, :p, :z, :ts)
+        ON CONFLICT(endpoint, cache_key) DO UPDATE SET
+            payload    = excluded.payload,
+            is_empty   = excluded.is_empty,
+            fetched_at = excluded.fetched_at
+        """),
+        {
+            "e": endpoint,
+            "k": key,
+            "p": payload,
+            "z": bool(is_empty),
+            "ts": datetime.utcnow(),
+        }
+    )
+
+
+# =========================================================
+# 수요기관 주소 캐시 관련 함수
+# =========================================================
+def _instt_addr_get_many(session, codes, max_age_days: float | None = None, with_fetched_at: bool = False) -> dict:
+    """
+    여러 기관코드를 한 번에 조회 → {dminstt_code: address 또는 None}
+    - max_age_days가 있으면 그보다 오래된 항목은 제외(재조회 대상)
+    - with_fetched_at=True면 {dminstt_code: (address, fetched_at)} (프로세스 캐시 만료 계산용)
+    """
+    codes = [c for c in set(codes or []) if c]
+    if not codes:
+        return {}
+
+    sql = "SELECT dminstt_code, address, fetched_at FROM institution_addresses WHERE dminstt_code = ANY(:cs)"
+    params = {"cs": codes}
+    if max_age_days:
+        sql += " AND fetched_at >= :cutoff"
+        params["cutoff"] = datetime.utcnow() - timedelta(days=max_age_days)
+
+    rows = session.execute(text(sql), params).fetchall()
+    return {r[0]: ((r[1], r[2]) if with_fetched_at else r[1]) for r in rows}
+
+
+def _instt_addr_set_many(session, addrs: dict):
+    """{dminstt_code: address 또는 None} 일괄 저장 (executemany)"""
+    if not addrs:
+        return
+    ts = datetime.utcnow()
+    session.execute(
+        text("""
+        INSERT INTO institution_addresses(dminstt_code, address, fetched_at)
+        VALUES (:c, :a, :ts)
+        ON CONFLICT(dminstt_code) DO UPDATE SET
+            address    = excluded.address,
+            fetched_at = excluded.fetched_at
+        """),
+        [{"c": c, "a": a, "ts": ts} for c, a in addrs.items()]
+    )
+
+
+# =========================================================
+# 배치 작업 공용 함수
+# =========================================================
+def bulk_update_from_values(session, table: str, key_col: str, value_cols, rows, casts=None) -> int:
+    """
+    UPDATE ... FROM (VALUES ...) 한 번으로 여러 행 갱신. 반환: 실제 변경된 행 수
+    - rows: [{key_col: 1, "col": "값", ...}, ...]  (key는 정수 PK)
+    - casts: 문자열이 아닌 컬럼의 SQL 타입 (예: {"is_favorite": "BOOLEAN"})
+    - 값이 같은 행은 IS DISTINCT FROM 조건으로 건너뜀
+    """
+    if not rows:
+        return 0
+    value_cols = list(value_cols)
+    casts = casts or {}
+    params, tuples = {}, []
+    for i, r in enumerate(rows):
+        params[f"k{i}"] = r[key_col]
+        names = [f"CAST(:k{i} AS INTEGER)"]
+        for j, c in enumerate(value_cols):
+            params[f"v{i}_{j}"] = r[c]
+            names.append(f"CAST(:v{i}_{j} AS {casts[c]})" if c in casts else f":v{i}_{j}")
+        tuples.append("(" + ", ".join(names) + ")")
+
+    set_sql = ", ".join(f"{c} = v.{c}" for c in value_cols)
+    diff_sql = " OR ".join(f"t.{c} IS DISTINCT FROM v.{c}" for c in value_cols)
+    sql = f"""
+        UPDATE {table} AS t SET {set_sql}
+        FROM (VALUES {", ".join(tuples)}) AS v({key_col}, {", ".join(value_cols)})
+        WHERE t.{key_col} = v.{key_col} AND ({diff_sql})
+    """
+    return session.execute(text(sql), params).rowcount or 0
+
+
+def _checkpoint_get(session, job_name: str):
+    """(last_id, processed) — 기록이 없으면 (0, 0)"""
+    row = session.get(JobCheckpoint, job_name)
+    return (row.last_id, row.processed) if row else (0, 0)
+
+
+def _checkpoint_set(session, job_name: str, last_id: int, processed: int):
+    row = session.get(JobCheckpoint, job_name)
+    if row is None:
+        row = JobCheckpoint(job_name=job_name)
+        session.add(row)
+    row.last_id = int(last_id)
+    row.processed = int(processed)
+    row.updated_at = datetime.utcnow()
+
+
+def _checkpoint_clear(session, job_name: str):
+    row = session.get(JobCheckpoint, job_name)
+    if row is not None:
+        session.delete(row)
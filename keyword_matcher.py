@@ -0,0 +1,92 @@
+# keyword_matcher.py
+# 다중 키워드 매칭 (수집기 관심도 필터 / 관할 지사 힌트 사전 공용)
+#  - 키워드 목록을 한 번만 컴파일해 두고, 텍스트 1회 순회로 포함된 키워드를 모두 찾습니다.
+#  - 힌트 사전이 수천 건으로 늘어나도 건당 판정 비용이 사전 크기에 비례해 늘지 않도록 하기 위함.
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import deque
+from typing import Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho–Corasick 오토마타.
+    - keys: 검색할 문자열 목록 (빈 문자열은 무시, 중복 허용)
+    - iter(text) → (시작 위치, 키 인덱스)를 겹치는 매치까지 모두 반환
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys: List[str] = list(keys)
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, key in enumerate(self.keys):
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(idx)
+
+        # 실패 링크 (BFS)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        goto, fail, out, keys = self._goto, self._fail, self._out, self.keys
+        state = 0
+        for i, ch in enumerate(text or ""):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                yield i - len(keys[idx]) + 1, idx
+
+    def search(self, text: str) -> Set[int]:
+        """텍스트에 포함된 키 인덱스 집합"""
+        return {idx for _, idx in self.iter(text)}
+
+
+class ContainmentIndex:
+    """
+    역방향 포함 검색: query를 '포함하는' 키 찾기.
+    키들을 구분자로 이어 붙인 문자열 1개에서 str.find로 찾고, 위치 → 키 인덱스는 이진 탐색.
+    """
+
+    _SEP = "\x00"
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys: List[str] = list(keys)
+        self._starts: List[int] = []
+        pos = 0
+        for k in self.keys:
+            self._starts.append(pos)
+            pos += len(k) + 1
+        self._joined = self._SEP.join(self.keys)
+
+    def containing(self, query: str) -> Set[int]:
+        if not query or self._SEP in query:
+            return set()
+        hits = set()
+        i = self._joined.find(query)
+        while i >= 0:
+            hits.add(bisect_right(self._starts, i) - 1)
+            i = self._joined.find(query, i + 1)
+        return hits
@@ -107,7 +107,8 @@ def build_attachment_html(office: str, year: int, items_annual: List[Dict]) -> T
     by_month = defaultdict(list)
     for item in items_annual:
         try:
-            month = int(item.get("notice_date", "0-0").split("-")[1])
+            day = item.get("notice_day")
+            month = day.month if day else int(item.get("notice_date", "0-0").split("-")[1])
             by_month[month].append(item)
         except (ValueError, IndexError):
             by_month[0].append(item)
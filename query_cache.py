@@ -0,0 +1,189 @@
+# query_cache.py
+# 프로세스 공용 조회 결과 캐시 (모든 Streamlit 세션 공통) + cache_events 기반 세밀한 무효화
+#  - 키: 조회 이름 + 정규화된 필터 파라미터
+#  - 항목마다 '포함된 공고 id'와 '조회 기간'을 기억 → 바뀐 공고/기간과 관련된 항목만 제거
+#  - 무효화는 cache_events 테이블에 기록되고, 각 프로세스가 poll_interval마다 읽어 반영
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+from database import engine, publish_cache_event, read_cache_events
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+    days: Optional[Tuple[date, date]]     # None이면 기간 무관 → 모든 기간 이벤트에 제거
+    ids: frozenset
+
+
+def _norm(v):
+    """키 정규화: 문자열 공백 정리, 리스트 → 튜플"""
+    if isinstance(v, str):
+        return " ".join(v.split())
+    if isinstance(v, (list, tuple)):
+        return tuple(_norm(x) for x in v)
+    return v
+
+
+class QueryCache:
+    """
+    - get_or_load(): 캐시 조회, 없으면 loader 1회 실행 (같은 키 동시 미스는 1번만 조회)
+    - invalidate_*(): 로컬 즉시 제거 + cache_events 발행 (다른 프로세스는 poll에서 반영)
+    - 조회 중 무효화가 일어나면 그 결과는 저장하지 않음 (오래된 값 재적재 방지)
+    """
+
+    # 시퀀스 id는 커밋 순서와 다를 수 있어, 마지막 id보다 조금 앞부터 다시 읽고 본 이벤트는 건너뜀
+    EVENT_LOOKBACK = 100
+
+    def __init__(self, *, ttl: float = 600, max_entries: int = 512, poll_interval: float = 5.0, bind=engine):
+        self.ttl = float(ttl)
+        self.max_entries = max(int(max_entries), 1)
+        self.poll_interval = float(poll_interval)
+        self._bind = bind
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._gen = 0                       # 무효화할 때마다 증가
+        self._last_event_id: Optional[int] = None
+        self._seen_events: deque = deque(maxlen=self.EVENT_LOOKBACK * 2)
+        self._last_poll = 0.0
+        self._poll_lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    # ---------- 조회 ----------
+    @staticmethod
+    def make_key(name: str, params: dict) -> Hashable:
+        return (name, tuple(sorted((k, _norm(v)) for k, v in params.items())))
+
+    def get_or_load(self, name: str, params: dict, loader: Callable[[], Any], *,
+                    days: Optional[Tuple[date, date]] = None,
+                    ids_of: Optional[Callable[[Any], Iterable[int]]] = None):
+        self.poll()
+        key = self.make_key(name, params)
+
+        value = self._get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            # 대기하는 동안 다른 세션이 채웠으면 그대로 사용
+            value = self._get(key)
+            if value is not None:
+                return value
+
+            with self._lock:
+                gen = self._gen
+                self.misses += 1
+            try:
+                value = loader()
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            ids = frozenset(int(i) for i in (ids_of(value) if ids_of else ()))
+
+            with self._lock:
+                if gen == self._gen:
+                    self._entries[key] = _Entry(value, time.monotonic() + self.ttl, days, ids)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return value
+
+    def _get(self, key):
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None:
+                return None
+            if e.expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return e.value
+
+    # ---------- 무효화 ----------
+    def invalidate_notices(self, ids: Iterable[int], *, broadcast: bool = True):
+        ids = sorted({int(i) for i in ids or []})
+        if not ids:
+            return
+        self._apply("notices", ids, None, None)
+        if broadcast:
+            self._publish("notices", ids=ids)
+
+    def invalidate_days(self, day_from: date, day_to: date, *, broadcast: bool = True):
+        self._apply("days", None, day_from, day_to)
+        if broadcast:
+            self._publish("days", day_from=day_from, day_to=day_to)
+
+    def invalidate_all(self, *, broadcast: bool = True):
+        self._apply("all", None, None, None)
+        if broadcast:
+            self._publish("all")
+
+    def _publish(self, kind: str, **kw):
+        try:
+            with self._bind.begin() as conn:
+                publish_cache_event(conn, kind, **kw)
+        except Exception as e:
+            print(f"[QueryCache] 무효화 이벤트 발행 실패: {e}")
+
+    def _apply(self, kind: str, ids, day_from, day_to):
+        with self._lock:
+            self._gen += 1
+            if kind == "all":
+                self._entries.clear()
+                return
+            if kind == "notices":
+                ids = set(ids or ())
+                drop = [k for k, e in self._entries.items() if e.ids & ids]
+            else:
+                drop = [
+                    k for k, e in self._entries.items()
+                    if e.days is None or day_from is None or day_to is None
+                    or (e.days[0] <= day_to and day_from <= e.days[1])
+                ]
+            for k in drop:
+                del self._entries[k]
+
+    # ---------- 다른 프로세스 이벤트 반영 ----------
+    def poll(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return
+        if not self._poll_lock.acquire(blocking=force):
+            return
+        try:
+            self._last_poll = now
+            with self._bind.connect() as conn:
+                if self._last_event_id is None:
+                    # 시작 시점 이전 이벤트는 볼 필요 없음 (캐시가 비어 있음)
+                    self._last_event_id = conn.execute(
+                        text("SELECT COALESCE(MAX(id), 0) FROM cache_events")
+                    ).scalar() or 0
+                    return
+                events = read_cache_events(conn, max(self._last_event_id - self.EVENT_LOOKBACK, 0))
+            for ev_id, kind, ids, day_from, day_to in events:
+                if ev_id in self._seen_events:
+                    continue
+                self._seen_events.append(ev_id)
+                self._apply(kind, ids, day_from, day_to)
+                self._last_event_id = max(self._last_event_id, ev_id)
+        except Exception as e:
+            print(f"[QueryCache] 이벤트 조회 실패: {e}")
+        finally:
+            self._poll_lock.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,175 @@
+# scheduler.py
+# 정기 자동 업데이트 스케줄러 (worker.py가 함께 실행, SYNC_WORKER_IN_APP이면 앱 프로세스에서 실행)
+#  - Postgres advisory lock을 잡은 인스턴스 1개만 리더로 동작 (머신/프로세스가 여러 개여도 중복 실행 없음)
+#  - 정기 실행 시각(기본 8/12/19시, KST)마다 sync_jobs에 수집 작업을 등록 → 실제 수집은 워커가 실행
+#  - 마지막으로 처리한 실행 시각을 sync_state에 저장 → 재시작/장애 후 놓친 실행을 감지해 한 번에 따라잡음
+#  - 등록되는 작업은 증분 수집: 단계별 high-water mark 이후만 조회 (하루 중 재실행은 몇 페이지만)
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, time as dtime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from database import (
+    collector_engine, DATABASE_URL, DIRECT_DATABASE_URL, PGBOUNCER_MODE, SCHEDULER_LOCK_KEY,
+    SCHEDULER_STATE_KEY, enqueue_sync_job, get_sync_state, set_scheduler_window,
+)
+from collect_data import STAGES_CONFIG
+
+
+KST = timezone(timedelta(hours=9))
+AUTO_SYNC_HOURS = sorted(int(h) for h in os.getenv("AUTO_SYNC_HOURS", "8,12,19").split(",") if h.strip())
+TICK_SEC = float(os.getenv("SCHEDULER_TICK_SEC", "30"))
+CATCHUP_MAX_DAYS = int(os.getenv("SCHEDULER_CATCHUP_MAX_DAYS", "7"))   # 따라잡기 최대 기간
+HWM_OVERLAP_MIN = int(os.getenv("SYNC_HWM_OVERLAP_MIN", "30"))          # 늦게 등록되는 공고 대비 겹쳐 조회할 분
+
+
+def now_kst() -> datetime:
+    """KST 현재 시각 (naive) — 서버 시간대(fly.io는 UTC)와 무관"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def scheduled_windows(after: datetime, until: datetime, hours=None) -> list:
+    """(after, until] 구간에 속한 정기 실행 시각 목록 (오래된 순)"""
+    hours = hours or AUTO_SYNC_HOURS
+    out = []
+    d = after.date()
+    while d <= until.date():
+        for h in hours:
+            w = datetime.combine(d, dtime(hour=h))
+            if after < w <= until:
+                out.append(w)
+        d += timedelta(days=1)
+    return out
+
+
+def incremental_windows(state: dict, now: datetime, stages: dict | None = None) -> dict:
+    """
+    단계별 증분 조회 구간 {key: ('YYYYMMDDHHMM', 'YYYYMMDDHHMM')}
+    - 시작: high-water mark(없으면 마지막 성공 시각) - HWM_OVERLAP_MIN, 기록이 없으면 오늘 0시
+    - 장기간 중단 후에도 CATCHUP_MAX_DAYS를 넘겨 거슬러 올라가지 않음 (그 이상은 수동 백필)
+    - 시각 단위 API(hourly)가 아닌 단계는 plan_range_tasks에서 날짜 단위로 조회됨
+    """
+    stages = STAGES_CONFIG if stages is None else stages
+    floor = datetime.combine(now.date() - timedelta(days=CATCHUP_MAX_DAYS - 1), dtime())
+    out = {}
+    for key in stages:
+        st = state.get(key) or {}
+        mark = st.get("hwm_at") or st.get("last_success_at")
+        if mark is None:
+            start = datetime.combine(now.date(), dtime())
+        else:
+            start = max(mark - timedelta(minutes=HWM_OVERLAP_MIN), floor)
+        out[key] = (start.strftime("%Y%m%d%H%M"), now.strftime("%Y%m%d%H%M"))
+    return out
+
+
+def tick(now: datetime | None = None) -> int | None:
+    """
+    리더가 주기적으로 호출: 지난 실행 시각이 있으면 작업 1건 등록 (여러 번 놓쳤어도 1건으로 합침)
+    반환: 등록한 작업 id (없으면 None)
+    """
+    now = now or now_kst()
+    with collector_engine.begin() as conn:
+        state = get_sync_state(conn)
+        last_window = (state.get(SCHEDULER_STATE_KEY) or {}).get("last_window_at")
+        if last_window is None:
+            # 첫 실행: 기준점만 기록 (설치 이전 시각은 따라잡지 않음)
+            set_scheduler_window(conn, now)
+            print(f"[Scheduler] 기준 시각 기록: {now:%Y-%m-%d %H:%M}")
+            return None
+
+        due = scheduled_windows(last_window, now)
+        if not due:
+            return None
+        if len(due) > 1:
+            print(f"[Scheduler] 놓친 실행 {len(due) - 1}회 감지 ({due[0]:%m-%d %H:%M} ~) → 한 번에 따라잡기")
+
+        # 실제 단계별 구간은 워커가 실행 시점의 sync_state로 다시 계산 (start/end는 표시용)
+        start = min(s for s, _ in incremental_windows(state, now).values())[:8]
+        params = {"incremental": True, "start": start, "end": now.strftime("%Y%m%d"), "bulk_load": False}
+        # 작업 등록과 실행 시각 기록을 같은 트랜잭션으로 → 중간에 죽어도 중복/누락 없음
+        job_id = enqueue_sync_job(conn, "scheduled", params, requested_by="scheduler")
+        set_scheduler_window(conn, due[-1])
+    print(f"[Scheduler] {due[-1]:%Y-%m-%d %H:%M} 정기 실행 → 작업 #{job_id} ({params['start']}~{params['end']})")
+    return job_id
+
+
+class LeaderLock:
+    """
+    pg_try_advisory_lock 기반 리더 선출
+    - 락은 세션(연결)에 묶이므로 전용 연결 1개를 계속 유지, 연결이 끊기면 락도 자동 해제
+    - pgbouncer 트랜잭션 모드 URL로는 세션 락이 유지되지 않음 → SUPABASE_DIRECT_URL(직결) 사용
+    """
+
+    def __init__(self, key: int = SCHEDULER_LOCK_KEY, url: str = DIRECT_DATABASE_URL):
+        if PGBOUNCER_MODE and url == DATABASE_URL:
+            print("[Scheduler] ⚠ pgbouncer 트랜잭션 모드 — SUPABASE_DIRECT_URL 없이는 리더 락이 보장되지 않습니다.")
+        self.key = key
+        self._engine = create_engine(url, poolclass=NullPool, connect_args={"sslmode": "require"})
+        self._conn = None
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None
+
+    def try_acquire(self) -> bool:
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))        # 연결이 살아 있으면 락도 유지 중
+                return True
+            except Exception as e:
+                print(f"[Scheduler] 리더 연결 끊김 → 락 재획득 시도: {e}")
+                self._close()
+        conn = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            if conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": self.key}).scalar():
+                self._conn = conn
+                return True
+        except Exception:
+            conn.close()
+            raise
+        conn.close()
+        return False
+
+    def release(self):
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": self.key})
+            except Exception:
+                pass
+            self._close()
+
+    def _close(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+def run_forever(stop_event: threading.Event | None = None):
+    stop_event = stop_event or threading.Event()
+    lock = LeaderLock()
+    try:
+        while not stop_event.is_set():
+            try:
+                was_leader = lock.held
+                if lock.try_acquire():
+                    if not was_leader:
+                        print(f"[Scheduler] 리더 획득 (정기 실행 {AUTO_SYNC_HOURS}시, KST)")
+                    tick()
+            except Exception as e:
+                print(f"[Scheduler] 오류: {e}")
+            stop_event.wait(TICK_SEC)
+    finally:
+        lock.release()
+
+
+def start_in_thread() -> threading.Thread:
+    t = threading.Thread(target=run_forever, name="eers-scheduler", daemon=True)
+    t.start()
+    return t
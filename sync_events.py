@@ -0,0 +1,111 @@
+# sync_events.py
+# 수집 이벤트 버퍼 (collect_data.emit_event → 워커 → sync_events 테이블 / sync_jobs.progress)
+#  - 수집 스레드는 emit()으로 메모리에만 쌓고, 워커의 기록 스레드가 몇 초마다 한 번에 DB로 보냄
+#  - 페이지 조회/선별처럼 잦은 이벤트는 단계별 누적 건수만 올림 → 화면에는 건수와 초당 처리량으로 표시
+#  - 최근 이벤트는 링 버퍼에도 남겨 같은 프로세스에서 바로 볼 수 있음 (tail)
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from database import write_sync_events
+
+
+# 누적 건수로만 반영하는 이벤트 (sync_events에 행으로 남기지 않음)
+COUNTER_KINDS = frozenset({"page", "filtered"})
+
+
+class SyncEventStream:
+    """
+    - emit(stage, kind, count, message): 여러 스레드에서 호출 (collect_data 실행기의 on_event)
+    - flush(conn): 아직 기록하지 않은 이벤트를 한 번에 INSERT (커밋은 호출측)
+    - live(): 단계별 누적 건수와 처리 속도 (progress에 넣어 화면에 표시)
+    """
+
+    def __init__(self, job_id: int, ring_size: int = 500):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._pending: list = []
+        self._ring: deque = deque(maxlen=ring_size)
+        self._stats: dict = {}
+        self._dirty = False
+
+    def _stage(self, stage: Optional[str]) -> dict:
+        st = self._stats.get(stage or "")
+        if st is None:
+            st = self._stats[stage or ""] = {
+                "pages": 0, "items": 0, "kept": 0, "saved": 0, "errors": 0,
+                "running": 0, "chunks": 0, "t0": time.monotonic(), "t1": None,
+            }
+        return st
+
+    def emit(self, stage: Optional[str], kind: str, count: int = 0, message: Optional[str] = None):
+        with self._lock:
+            st = self._stage(stage)
+            self._dirty = True
+            if kind == "page":
+                st["pages"] += 1
+                st["items"] += count
+            elif kind == "filtered":
+                st["kept"] += count
+            elif kind == "saved":
+                st["saved"] += count
+            elif kind == "error":
+                st["errors"] += 1
+            elif kind == "stage_start":
+                st["running"] += 1
+                st["t1"] = None
+            elif kind in ("stage_done", "stage_error"):
+                st["running"] = max(st["running"] - 1, 0)
+                st["chunks"] += 1
+                if kind == "stage_error":
+                    st["errors"] += 1
+                if not st["running"]:
+                    st["t1"] = time.monotonic()
+            if kind in COUNTER_KINDS:
+                return
+            ev = (stage, kind, count, message, datetime.utcnow())
+            self._pending.append(ev)
+            self._ring.append(ev)
+
+    def flush(self, conn) -> int:
+        """대기 이벤트 기록 → 기록한 건수 (실패하면 다음 flush에서 다시 시도)"""
+        with self._lock:
+            events, self._pending = self._pending, []
+        try:
+            write_sync_events(conn, self.job_id, events)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = events
+            raise
+        return len(events)
+
+    def take_dirty(self) -> bool:
+        """마지막 호출 이후 새 이벤트가 있었는지 (진행 상황 저장 여부 판단)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, False
+            return dirty
+
+    def live(self) -> dict:
+        """{단계: {pages, items, kept, saved, errors, chunks, running, elapsed, items_per_sec, saved_per_sec}}"""
+        now = time.monotonic()
+        with self._lock:
+            out = {}
+            for stage, st in self._stats.items():
+                if not stage:
+                    continue
+                elapsed = max((st["t1"] or now) - st["t0"], 1e-6)
+                out[stage] = {
+                    **{k: st[k] for k in ("pages", "items", "kept", "saved", "errors", "chunks", "running")},
+                    "elapsed": round(elapsed, 1),
+                    "items_per_sec": round(st["items"] / elapsed, 1),
+                    "saved_per_sec": round(st["saved"] / elapsed, 1),
+                }
+            return out
+
+    def tail(self, n: int = 50) -> list:
+        with self._lock:
+            return list(self._ring)[-n:]
@@ -0,0 +1,202 @@
+# worker.py
+# 수집 작업 워커 (Procfile: worker: python worker.py)
+#  - sync_jobs 큐에서 FOR UPDATE SKIP LOCKED로 작업을 1건씩 가져와 실행 (여러 대를 띄워도 중복 실행 없음)
+#  - 진행 상황(완료 구간 수, 일자별 건수, 단계별 누적 건수/속도)은 sync_jobs.progress에,
+#    수집 로그(단계 시작/완료, 저장, 오류)는 sync_events에 몇 초마다 묶어서 기록 → 화면은 새 이벤트만 읽음
+#  - Streamlit 프로세스와 분리되어 있어 페이지 새로고침/다른 사용자 조회와 무관하게 계속 실행
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+
+from database import (
+    collector_engine, init_db, claim_sync_job, save_sync_job_progress,
+    finish_sync_job, requeue_stale_sync_jobs, mark_stages_success, mark_stage_error,
+    get_sync_state, advance_stage_hwm, prune_sync_events,
+)
+from collect_data import run_tasks, plan_window_tasks, stage_timing_report, format_stage_report, STAGES_CONFIG
+from sync_events import SyncEventStream
+import scheduler
+
+
+POLL_SEC = float(os.getenv("WORKER_POLL_SEC", "5"))
+HEARTBEAT_SEC = float(os.getenv("WORKER_HEARTBEAT_SEC", "30"))
+FLUSH_SEC = float(os.getenv("WORKER_EVENT_FLUSH_SEC", "2"))     # 이벤트/진행 상황 기록 주기
+WORKER_NAME = os.getenv("FLY_MACHINE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _job_stages(params: dict) -> dict:
+    """params['stages']가 있으면 해당 단계만, 없으면 전체 단계"""
+    keys = params.get("stages")
+    if not keys:
+        return STAGES_CONFIG
+    return {k: STAGES_CONFIG[k] for k in keys if k in STAGES_CONFIG}
+
+
+def _fmt_ymd(v: str) -> str:
+    """YYYYMMDD / YYYYMMDDHHMM → 표시용"""
+    return f"{v[:4]}-{v[4:6]}-{v[6:8]}" + (f" {v[8:10]}:{v[10:12]}" if len(v) == 12 else "")
+
+
+def _fmt_range(res: dict) -> str:
+    disp = _fmt_ymd(res["date"])
+    if res["end"] != res["date"]:
+        disp += "~" + _fmt_ymd(res["end"])
+    return disp
+
+
+def _window_bounds(start: str, end: str):
+    """조회 구간 문자열 → (시작, 끝) datetime (날짜만 있으면 그날 00:00 / 23:59)"""
+    s = datetime.strptime(start, "%Y%m%d%H%M") if len(start) == 12 else datetime.strptime(start[:8], "%Y%m%d")
+    e = datetime.strptime(end, "%Y%m%d%H%M") if len(end) == 12 else datetime.strptime(end[:8] + "2359", "%Y%m%d%H%M")
+    return s, e
+
+
+def _advance_hwms(conn, windows: dict, ok_stages, results, state: dict, started: datetime, incremental: bool):
+    """
+    성공한 단계의 high-water mark 전진 (끝은 실행 시작 시각을 넘지 않게)
+    - 수동 기간 작업은 기존 mark와 이어지는(빈틈 없는) 구간일 때만
+    - 증분 작업은 항상 (CATCHUP_MAX_DAYS로 잘린 앞부분은 의도된 공백 → 수동 백필 대상)
+    """
+    for key in ok_stages:
+        s, e = _window_bounds(*windows[key])
+        prev = (state.get(key) or {}).get("hwm_at")
+        if not incremental and prev is not None and s > prev:
+            continue
+        seen = [r["last_seen"] for r in results if r["stage"] == key and r.get("last_seen")]
+        advance_stage_hwm(conn, key, min(e, started), max(seen) if seen else None)
+
+
+def run_job(job) -> None:
+    """작업 1건 실행: 별도 스레드가 수집 이벤트/진행 상황을 주기적으로 기록 (하트비트 겸용)"""
+    job_id = job["id"]
+    params = job["params"] or {}
+    stages = _job_stages(params)
+    started = scheduler.now_kst()
+
+    # 증분 작업: 단계별 high-water mark 이후만 / 일반 작업: 지정 기간 전체
+    with collector_engine.connect() as conn:
+        sync_state = get_sync_state(conn)
+    if params.get("incremental"):
+        windows = scheduler.incremental_windows(sync_state, started, stages)
+    else:
+        windows = {key: (params["start"], params["end"]) for key in stages}
+    spec = plan_window_tasks(windows, stages)
+    total = len(spec)
+    state = {"done": 0, "by_day": {}, "stage_report": []}
+    events = SyncEventStream(job_id)
+    save_lock = threading.Lock()
+
+    def _save():
+        # 이벤트와 진행 상황을 같은 트랜잭션으로 (하트비트 겸용)
+        with save_lock, collector_engine.begin() as conn:
+            events.flush(conn)
+            save_sync_job_progress(conn, job_id, state["done"], total, {
+                "by_day": state["by_day"], "live": events.live(),
+                "stage_report": state["stage_report"],
+            })
+
+    def _on_done(res):
+        # 구간 완료/오류 로그는 실행기가 이벤트로 남김 → 여기서는 집계만 (저장은 _pump)
+        # 기록 스레드가 읽는 중일 수 있어 새 dict로 교체
+        by_day = dict(state["by_day"])
+        for day, cnt in res["by_day"].items():
+            by_day[day] = by_day.get(day, 0) + cnt
+        state["by_day"] = by_day
+        state["done"] += 1
+
+    # 몇 초마다 새 이벤트가 있을 때만 기록, 없어도 HEARTBEAT_SEC마다 기록 (stale 판정 방지)
+    stop = threading.Event()
+
+    def _pump():
+        last = time.monotonic()
+        while not stop.wait(FLUSH_SEC):
+            if not events.take_dirty() and time.monotonic() - last < HEARTBEAT_SEC:
+                continue
+            try:
+                _save()
+                last = time.monotonic()
+            except Exception as e:
+                print(f"[Worker] 작업 #{job_id} 진행 기록 실패: {e}")
+
+    threading.Thread(target=_pump, name=f"eers-job-{job_id}-events", daemon=True).start()
+
+    try:
+        _save()
+        results = run_tasks(spec, on_done=_on_done, on_event=events.emit, bulk_load=bool(params.get("bulk_load")))
+        failed = [r for r in results if not r["ok"]]
+        # 단계별 소요 요약 (어느 단계가 병목인지 / 의존 대기 시간 확인용)
+        state["stage_report"] = stage_timing_report(results)
+        for d, line in zip(state["stage_report"], format_stage_report(state["stage_report"])):
+            events.emit(d["stage"], "report", d["saved"], line)
+            print(f"[Worker] 작업 #{job_id} {line}")
+        stop.set()
+        _save()
+        # 일부 구간 오류는 작업 자체는 완료로 보고 건수만 남김 (로그에 상세)
+        # 단계별 성공 시각은 모든 구간이 성공한 단계만 갱신 → 다음 정기 실행이 실패 구간부터 다시 수집
+        ok_stages = {r["stage"] for r in results} - {r["stage"] for r in failed}
+        with collector_engine.begin() as conn:
+            finish_sync_job(conn, job_id, True, f"{len(failed)}개 구간 오류" if failed else None)
+            mark_stages_success(conn, ok_stages, started)
+            _advance_hwms(conn, windows, ok_stages, results, sync_state, started, bool(params.get("incremental")))
+            for r in failed:
+                mark_stage_error(conn, r["stage"], r["error"])
+            prune_sync_events(conn)
+        print(f"[Worker] 작업 #{job_id} 완료 ({state['done']}/{total}, 오류 {len(failed)})")
+    except Exception as e:
+        print(f"[Worker] 작업 #{job_id} 실패: {e}")
+        stop.set()
+        events.emit(None, "error", 0, f"❌ 작업 실패: {e}")
+        try:
+            with save_lock, collector_engine.begin() as conn:
+                events.flush(conn)
+        except Exception as fe:
+            print(f"[Worker] 작업 #{job_id} 이벤트 기록 실패: {fe}")
+        with collector_engine.begin() as conn:
+            finish_sync_job(conn, job_id, False, str(e))
+    finally:
+        stop.set()
+
+
+def work_once(worker: str = WORKER_NAME) -> bool:
+    """대기 작업 1건 처리. 처리했으면 True"""
+    with collector_engine.begin() as conn:
+        requeued = requeue_stale_sync_jobs(conn)
+        job = claim_sync_job(conn, worker)
+    if requeued:
+        print(f"[Worker] 응답 없는 작업 {requeued}건 재대기")
+    if not job:
+        return False
+    print(f"[Worker] 작업 #{job['id']} 시작 ({job['kind']}, {job['params']}, {job['attempts']}회차)")
+    run_job(job)
+    return True
+
+
+def run_forever(stop_event: threading.Event | None = None, worker: str = WORKER_NAME):
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        try:
+            if work_once(worker):
+                continue
+        except Exception as e:
+            print(f"[Worker] 큐 조회 오류: {e}")
+        stop_event.wait(POLL_SEC)
+
+
+def start_in_thread() -> threading.Thread:
+    """별도 워커 프로세스 없이 앱 프로세스 안에서 실행 (단일 머신 배포용)"""
+    t = threading.Thread(target=run_forever, name="eers-sync-worker", daemon=True)
+    t.start()
+    return t
+
+
+if __name__ == "__main__":
+    init_db()
+    # 정기 실행 스케줄러도 워커와 함께 (리더 락으로 여러 워커 중 1개만 작업 등록)
+    if os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes"):
+        scheduler.start_in_thread()
+    print(f"[Worker] {WORKER_NAME} 시작 (poll {POLL_SEC:.0f}초)")
+    run_forever()